@@ -91,17 +91,20 @@ def check_keyword_alerts(
     topics: list[HotTopicOut],
     alert_keywords: list[str],
 ) -> list[dict]:
-    """检查是否有匹配告警关键词的话题"""
+    """检查是否有匹配告警关键词的话题（每个标题单次扫描）"""
+    from app.keywords import compile_keywords
+
+    matcher = compile_keywords(tuple(alert_keywords))
+    order = {kw: i for i, kw in enumerate(matcher.keywords)}
     matches = []
     for t in topics:
-        for kw in alert_keywords:
-            if kw in t.title:
-                matches.append({
-                    "keyword": kw,
-                    "platform": t.platform,
-                    "title": t.title,
-                    "rank": t.rank,
-                })
+        for kw in sorted(matcher.found(t.title), key=order.__getitem__):
+            matches.append({
+                "keyword": kw,
+                "platform": t.platform,
+                "title": t.title,
+                "rank": t.rank,
+            })
     return matches
 
 
@@ -8,10 +8,10 @@
 
 import datetime
 import logging
-import re
 from collections import Counter
 
 from app.config import settings
+from app.features import OTHER_CATEGORY, BatchFeatures
 from app.schemas import (
     AnalysisReport,
     CategoryBreakdown,
@@ -70,77 +70,31 @@ CATEGORY_RULES: dict[str, list[str]] = {
 
 
 def _classify_topic(title: str) -> str:
-    """根据关键词规则对话题分类"""
-    for category, keywords in CATEGORY_RULES.items():
-        if any(kw in title for kw in keywords):
-            return category
-    return "📌 其他"
-
-
-def _find_cross_platform(topics: list[HotTopicOut]) -> list[dict]:
-    """找出跨平台共同热点（标题关键词相似）"""
-    # 提取每个话题的核心词（去掉标点和短词）
-    def extract_keywords(title: str) -> set[str]:
-        # 提取2字以上的中文词组
-        words = re.findall(r"[\u4e00-\u9fff]{2,4}", title)
-        return set(words)
-
-    platform_topics: dict[str, list[tuple[str, set[str]]]] = {}
-    for t in topics:
-        kws = extract_keywords(t.title)
-        platform_topics.setdefault(t.platform, []).append((t.title, kws))
-
-    cross_hot: list[dict] = []
-    seen = set()
-    platforms = list(platform_topics.keys())
-
-    for i, p1 in enumerate(platforms):
-        for t1_title, t1_kws in platform_topics[p1]:
-            if t1_title in seen or len(t1_kws) < 2:
-                continue
-            matched_platforms = {p1: t1_title}
-            for p2 in platforms[i + 1:]:
-                for t2_title, t2_kws in platform_topics[p2]:
-                    overlap = t1_kws & t2_kws
-                    if len(overlap) >= 2:
-                        matched_platforms[p2] = t2_title
-                        break
-            if len(matched_platforms) >= 2:
-                seen.add(t1_title)
-                cross_hot.append({
-                    "keyword": "、".join(t1_kws),
-                    "platforms": list(matched_platforms.keys()),
-                    "titles": matched_platforms,
-                    "platform_count": len(matched_platforms),
-                })
-
-    cross_hot.sort(key=lambda x: x["platform_count"], reverse=True)
-    return cross_hot[:10]
-
-
-def _build_platform_insights(topics: list[HotTopicOut]) -> list[PlatformInsight]:
+    """根据关键词规则对话题分类（规则靠前的类别优先）"""
+    from app.keywords import keyword_engine
+
+    categories = keyword_engine.match(title).categories
+    return categories[0] if categories else OTHER_CATEGORY
+
+
+def _find_cross_platform(topics: list[HotTopicOut], features: BatchFeatures | None = None,
+                         limit: int | None = None) -> list[dict]:
+    """找出跨平台共同热点：按共享实词聚类成故事，按覆盖平台数、得分排序，含全部成员标题"""
+    features = features or BatchFeatures(topics)
+    stories = features.clustering.cross_platform()
+    return [s.to_dict() for s in stories[:limit]]
+
+
+def _build_platform_insights(topics: list[HotTopicOut], features: BatchFeatures | None = None) -> list[PlatformInsight]:
     """各平台独特视角分析"""
-    by_platform: dict[str, list[HotTopicOut]] = {}
-    for t in topics:
-        by_platform.setdefault(t.platform, []).append(t)
+    features = features or BatchFeatures(topics)
 
     insights = []
-    for platform, ptopics in by_platform.items():
+    for platform, ptopics in features.by_platform.items():
         titles = [t.title for t in ptopics]
         cny_count = sum(1 for t in ptopics if t.is_cny_related)
-        # 找该平台独有的话题（其他平台没有相似标题）
-        other_titles = {t.title for t in topics if t.platform != platform}
-        unique = []
-        for title in titles[:20]:
-            kws = set(re.findall(r"[\u4e00-\u9fff]{2,4}", title))
-            is_unique = True
-            for ot in other_titles:
-                other_kws = set(re.findall(r"[\u4e00-\u9fff]{2,4}", ot))
-                if len(kws & other_kws) >= 2:
-                    is_unique = False
-                    break
-            if is_unique:
-                unique.append(title)
+        # 该平台独有的话题：批次倒排索引中与其他平台的标题都不共享 2 个以上实词
+        unique = [title for title in titles[:20] if features.is_unique(platform, title)]
 
         insights.append(PlatformInsight(
             platform=platform,
@@ -253,10 +207,13 @@ async def _llm_analysis(topics: list[HotTopicOut]) -> str | None:
 
 async def generate_analysis(topics: list[HotTopicOut]) -> AnalysisReport:
     """生成完整分析报告"""
+    # 批次分词与关键词匹配只做一次，以下各部分共用
+    features = BatchFeatures(topics)
+
     # 1. 分类统计
     category_counter: dict[str, list[str]] = {}
     for t in topics:
-        cat = _classify_topic(t.title)
+        cat = features.category(t.title)
         category_counter.setdefault(cat, []).append(t.title)
 
     total = max(len(topics), 1)
@@ -270,11 +227,11 @@ async def generate_analysis(topics: list[HotTopicOut]) -> AnalysisReport:
         for cat, titles in sorted(category_counter.items(), key=lambda x: -len(x[1]))
     ]
 
-    # 2. 跨平台热点
-    cross_platform = _find_cross_platform(topics)
+    # 2. 跨平台热点（聚类一次，平台洞察复用）
+    cross_platform = _find_cross_platform(topics, features)
 
     # 3. 平台洞察
-    platform_insights = _build_platform_insights(topics)
+    platform_insights = _build_platform_insights(topics, features)
 
     # 4. 春节专题
     cny_summary = _build_cny_summary(topics)
@@ -3,7 +3,6 @@ import datetime
 import io
 import json
 import logging
-import re
 from collections import Counter
 
 from fastapi import APIRouter, Depends, Query, Body, HTTPException
@@ -13,13 +12,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.cache import cache_get, cache_set, cache_delete
 from app.database import get_db
-from app.models import HotTopic, TopicLifecycle, DailyReport, AlertRule
+from app.dedup import as_utc
+from app.models import (
+    HotTopic, TopicLifecycle, DailyReport, AlertRule, TopicDetail, Event, EventMember, PropagationStat,
+)
 from app.schemas import (
     HotTopicOut, PlatformStats, TrendItem, AnalysisReport,
     SearchResult, TopicLifecycleOut, DailyReportOut,
-    AlertRuleCreate, AlertRuleOut, CompareResult,
+    AlertRuleCreate, AlertRuleOut, CompareResult, TopicDetailOut, EventOut, EventDetailOut, RescoreJobOut,
 )
 from app.config import get_runtime_config, update_runtime_config
+from app.network import cooccurrence_graph
+from app.propagation import summarize as summarize_propagation
+from app.rescore import rescore_manager
+from app.scrapers.proxy_pool import proxy_pool
+from app.scrapers.ratelimit import host_limiter
+from app.scrapers.registry import scraper_registry
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["hot-topics"])
@@ -185,20 +193,32 @@ async def set_config(updates: dict = Body(...)):
         raise HTTPException(status_code=422, detail=str(e))
     cache_delete()  # 配置变更后清除缓存
 
-    # 如果更新了抓取间隔，重新调度定时任务
-    if "scrape_interval_minutes" in updates:
-        from app.main import scheduler, run_scrapers
-        jobs = scheduler.get_jobs()
-        for job in jobs:
-            scheduler.remove_job(job.id)
-        scheduler.add_job(
-            run_scrapers, "interval",
-            minutes=new_config["scrape_interval_minutes"],
-        )
+    # 关键词变更会影响春节标记，下一轮需完整解析而非跳过未变化的榜单；历史数据在后台重新打分
+    if "cny_keywords" in updates or "custom_keywords" in updates:
+        for scraper in scraper_registry.loaded().values():
+            scraper.forget_payloads()
+        await rescore_manager.start("config")
+
+    # 如果更新了抓取间隔或平台，重新调度各平台定时任务
+    if "scrape_interval_minutes" in updates or "enabled_platforms" in updates:
+        from app.main import schedule_platform_jobs
+        schedule_platform_jobs(reset="scrape_interval_minutes" in updates)
 
     return {"message": "配置已更新", "config": new_config}
 
 
+@router.get("/rescore", response_model=RescoreJobOut | None)
+async def get_rescore():
+    """最近一次历史重新打分任务的进度"""
+    return await rescore_manager.latest()
+
+
+@router.post("/rescore", response_model=RescoreJobOut)
+async def start_rescore():
+    """手动开始历史重新打分（如发布了新的情感词典），取代正在运行的任务"""
+    return await rescore_manager.start("manual")
+
+
 @router.post("/scrape")
 async def trigger_scrape():
     """手动触发一次抓取"""
@@ -208,6 +228,25 @@ async def trigger_scrape():
     return {"message": "抓取任务已触发，请稍后刷新查看结果"}
 
 
+@router.get("/proxies")
+async def get_proxies():
+    """出口代理池状态：各代理健康度、延迟、并发与平台分配"""
+    return proxy_pool.snapshot()
+
+
+@router.post("/proxies/reload")
+async def reload_proxies():
+    """重新读取 PROXY_URLS / PROXY_FILE，已有代理保留健康记录"""
+    proxy_pool.load()
+    return proxy_pool.snapshot()
+
+
+@router.get("/ratelimits")
+async def get_rate_limits():
+    """各上游主机的限速配置、令牌余量、并发与等待时间统计"""
+    return host_limiter.stats()
+
+
 @router.get("/config/platforms")
 async def get_available_platforms():
     """获取所有可用平台列表"""
@@ -218,6 +257,10 @@ async def get_available_platforms():
             {"id": "baidu", "name": "百度", "icon": "🔍"},
             {"id": "douyin", "name": "抖音", "icon": "🎵"},
             {"id": "xiaohongshu", "name": "小红书", "icon": "📕"},
+        ] + [
+            # 插件平台只读入口点名称，不为列出平台而导入插件
+            {"id": name, "name": name, "icon": "🔌"}
+            for name in scraper_registry.names() if scraper_registry.is_plugin(name)
         ],
         "enabled": get_runtime_config()["enabled_platforms"],
     }
@@ -316,6 +359,100 @@ async def get_lifecycle(
     return result.scalars().all()
 
 
+@router.get("/details", response_model=list[TopicDetailOut])
+async def get_details(
+    platform: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """获取话题详情（热度、阅读/回答数、摘要），按抓取时间倒序"""
+    query = select(TopicDetail).order_by(TopicDetail.fetched_at.desc()).limit(limit)
+    if platform:
+        query = query.where(TopicDetail.platform == platform)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+# ---- 跨平台事件 ----
+
+def _event_out(event: Event, **extra) -> dict:
+    return {
+        "id": event.id, "title": event.title,
+        "keywords": json.loads(event.keywords or "[]"), "platforms": json.loads(event.platforms or "[]"),
+        "platform_count": event.platform_count, "first_seen": event.first_seen, "last_seen": event.last_seen,
+        "topic_count": event.topic_count,
+        "peak_rank": event.peak_rank, "status": event.status, **extra,
+    }
+
+
+@router.get("/events", response_model=list[EventOut])
+async def get_events(
+    status: str | None = Query(None, description="active/closed"),
+    min_platforms: int = Query(1, ge=1, description="至少出现在几个平台"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """获取跨平台、跨周期追踪的事件，按最近更新时间倒序"""
+    query = select(Event).order_by(Event.last_seen.desc())
+    if status:
+        query = query.where(Event.status == status)
+    if min_platforms > 1:
+        query = query.where(Event.platform_count >= min_platforms)
+    result = await db.execute(query.limit(limit))
+    return [_event_out(e) for e in result.scalars().all()]
+
+
+@router.get("/events/{event_id}", response_model=EventDetailOut)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_db)):
+    """获取单个事件及其时间线（成员话题按时间排列）"""
+    event = await db.get(Event, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    result = await db.execute(
+        select(EventMember).where(EventMember.event_id == event_id).order_by(EventMember.fetched_at, EventMember.id)
+    )
+    return _event_out(event, timeline=result.scalars().all())
+
+
+@router.get("/propagation")
+async def get_propagation(
+    platform: str | None = Query(None, description="只返回包含该平台的平台对"),
+    db: AsyncSession = Depends(get_db),
+):
+    """跨平台传播时差：各平台对谁先出现、另一平台隔多久跟进（由入库时增量维护的聚合得到）"""
+    result = await db.execute(select(PropagationStat))
+    return summarize_propagation(result.scalars().all(), platform)
+
+
+# ---- 关键词共现网络 ----
+
+@router.get("/network")
+async def get_network(
+    hours: int = Query(24, ge=1, le=24 * 30, description="窗口长度（小时），未指定 since 时使用"),
+    since: datetime.datetime | None = Query(None, description="窗口起点（按时间桶向前对齐）"),
+    until: datetime.datetime | None = Query(None, description="窗口终点，默认当前时间"),
+    limit: int = Query(100, ge=1, le=1000, description="返回权重最高的前 K 条边"),
+    min_count: int = Query(2, ge=1, description="最少共现次数"),
+    db: AsyncSession = Depends(get_db),
+):
+    """窗口内各时间桶共现矩阵合并后的前 K 条边、节点与社区（标签传播）"""
+    cache_key = None
+    if since is None and until is None:
+        cache_key = f"network:{hours}:{limit}:{min_count}"
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    until = as_utc(until or datetime.datetime.now(datetime.timezone.utc))
+    since = as_utc(since) if since else until - datetime.timedelta(hours=hours)
+    if since >= until:
+        raise HTTPException(status_code=422, detail="since must be earlier than until")
+    data = await cooccurrence_graph.window(db, since, until, limit=limit, min_count=min_count)
+    if cache_key:
+        cache_set(cache_key, data, ttl_seconds=60)
+    return data
+
+
 # ---- 每日报告 ----
 
 @router.get("/reports", response_model=list[DailyReportOut])
@@ -481,19 +618,13 @@ async def get_wordcloud(
     result = await db.execute(query)
     titles = [r[0] for r in result]
 
-    # 提取词频
+    # 分词统计词频（已去掉单字、数字和停用词）
+    from app.segmenter import content_words
+
     word_counter: Counter = Counter()
     for title in titles:
-        words = re.findall(r"[\u4e00-\u9fff]{2,4}", title)
-        word_counter.update(words)
-
-    # 过滤停用词
-    stopwords = {"什么", "怎么", "为什么", "如何", "可以", "就是", "这个", "那个", "一个", "不是"}
-    data = [
-        {"name": word, "value": count}
-        for word, count in word_counter.most_common(200)
-        if word not in stopwords
-    ]
+        word_counter.update(content_words(title))
+    data = [{"name": word, "value": count} for word, count in word_counter.most_common(200)]
 
     cache_set(cache_key, data, ttl_seconds=300)
     return data
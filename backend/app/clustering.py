@@ -0,0 +1,150 @@
+"""
+跨平台话题聚类
+- 倒排索引 词 → 话题，每批构建一次；候选对只在共享词的话题之间产生，不再逐平台两两比较标题
+- 共享至少 MIN_SHARED_WORDS 个实词的话题相连，并查集合并为一个"故事"（连通分量）
+- 多批次窗口中同一平台的同一标题先合并为一条，保留最好排名
+- 出现在大量标题中的泛词（如 "春节"）不参与候选生成，避免候选对数量按平方增长；
+  它们仍计入候选对的共享词数
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+MIN_SHARED_WORDS = 2
+MAX_POSTINGS = 50  # 倒排列表超过 max(MAX_POSTINGS, 文档数 × MAX_DF_RATIO) 的词视为泛词
+MAX_DF_RATIO = 0.1
+STORY_KEYWORDS = 5
+
+
+@dataclass
+class StoryMember:
+    platform: str
+    title: str
+    rank: int
+
+
+@dataclass
+class Story:
+    members: list[StoryMember]  # 按排名排序
+    keywords: list[str]
+    platforms: list[str]  # 按该平台最好排名排序
+    score: float
+
+    @property
+    def platform_count(self) -> int:
+        return len(self.platforms)
+
+    def to_dict(self) -> dict:
+        best = {}
+        for m in self.members:
+            best.setdefault(m.platform, m.title)
+        return {
+            "keyword": "、".join(self.keywords),
+            "platforms": self.platforms,
+            "titles": {p: best[p] for p in self.platforms},
+            "platform_count": self.platform_count,
+            "score": self.score,
+            "topic_count": len(self.members),
+            "members": [{"platform": m.platform, "title": m.title, "rank": m.rank} for m in self.members],
+        }
+
+
+@dataclass
+class Clustering:
+    stories: list[Story]  # 全部故事（含单平台），按平台数、得分降序
+    cross_linked: set[tuple[str, str]] = field(default_factory=set)  # 与其他平台话题直接相连的 (平台, 标题)
+
+    def cross_platform(self) -> list[Story]:
+        return [s for s in self.stories if s.platform_count >= 2]
+
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+def candidate_pairs(documents: list[frozenset[str]], min_shared: int = MIN_SHARED_WORDS):
+    """经倒排索引产生共享词不少于 min_shared 的文档对 (i, j)，i < j"""
+    index: dict[str, list[int]] = {}
+    for i, words in enumerate(documents):
+        for word in words:
+            index.setdefault(word, []).append(i)
+    cap = max(MAX_POSTINGS, int(len(documents) * MAX_DF_RATIO))
+    frequent = {w for w, postings in index.items() if len(postings) > cap}
+
+    for i, words in enumerate(documents):
+        shared = Counter()
+        for word in words:
+            if word in frequent:
+                continue
+            for j in index[word]:
+                if j > i:
+                    shared[j] += 1
+        for j, count in shared.items():
+            # 稀有词共享数不足时，再计入两者共有的泛词
+            if count >= min_shared or len(words & documents[j]) >= min_shared:
+                yield i, j
+
+
+def cluster_topics(topics: list, min_shared: int = MIN_SHARED_WORDS, words_of=None) -> Clustering:
+    """把一批（或多批）话题聚成故事；topics 需有 platform / title / rank，words_of 为标题分词函数"""
+    if words_of is None:
+        from app.segmenter import content_words as words_of
+
+    members: list[StoryMember] = []
+    position: dict[tuple[str, str], int] = {}
+    for t in topics:
+        key = (t.platform, t.title)
+        i = position.get(key)
+        if i is None:
+            position[key] = len(members)
+            members.append(StoryMember(t.platform, t.title, t.rank))
+        elif t.rank < members[i].rank:
+            members[i].rank = t.rank
+
+    words = [list(dict.fromkeys(words_of(m.title))) for m in members]
+    documents = [frozenset(w) for w in words]
+    uf = UnionFind(len(members))
+    cross_linked: set[tuple[str, str]] = set()
+    for i, j in candidate_pairs(documents, min_shared):
+        uf.union(i, j)
+        a, b = members[i], members[j]
+        if a.platform != b.platform:
+            cross_linked.add((a.platform, a.title))
+            cross_linked.add((b.platform, b.title))
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(members)):
+        groups.setdefault(uf.find(i), []).append(i)
+
+    stories = []
+    for indexes in groups.values():
+        group = sorted((members[i] for i in indexes), key=lambda m: m.rank)
+        best_rank: dict[str, int] = {}
+        for m in group:
+            best_rank.setdefault(m.platform, m.rank)
+        # 至少两个成员共有的词，按出现次数排序
+        counts = Counter(w for i in indexes for w in words[i])
+        keywords = [w for w, c in counts.most_common() if c >= 2][:STORY_KEYWORDS]
+        score = sum(1 + 1 / max(rank, 1) for rank in best_rank.values())
+        stories.append(Story(group, keywords, list(best_rank), round(score, 3)))
+
+    stories.sort(key=lambda s: (s.platform_count, s.score), reverse=True)
+    return Clustering(stories, cross_linked)
@@ -12,7 +12,78 @@ class Settings(BaseSettings):
     # 抓取配置
     SCRAPE_INTERVAL_MINUTES: int = 30
     SCRAPE_TOP_N: int = 50
+    # 按平台自适应调度：根据榜单变动率在 [MIN, MAX] 间调整各平台间隔
+    ADAPTIVE_SCHEDULING: bool = True
+    SCRAPE_MIN_INTERVAL_MINUTES: float = 2
+    SCRAPE_MAX_INTERVAL_MINUTES: float = 120
     ENABLED_PLATFORMS: list[str] = ["weibo", "zhihu", "baidu", "douyin", "xiaohongshu"]
+    # 爬虫 HTTP 连接池
+    SCRAPE_HTTP2: bool = True  # 需安装 h2，否则自动回退 HTTP/1.1
+    SCRAPE_TIMEOUT_SECONDS: float = 20
+    SCRAPE_MAX_CONNECTIONS: int = 10
+    SCRAPE_KEEPALIVE_EXPIRY: float = 120
+    # 多数据源对冲：首选源超过该时长未返回即并发请求备用源
+    SCRAPE_HEDGE_DELAY_SECONDS: float = 3.0
+    # Tophub 聚合页解析结果的共享缓存时间（秒）
+    TOPHUB_CACHE_SECONDS: float = 60
+    # 出口代理池：PROXY_URLS 逗号分隔、PROXY_FILE 每行一个，PROXY_URL 为单代理的旧配置
+    PROXY_URL: str = ""
+    PROXY_URLS: str = ""
+    PROXY_FILE: str = ""
+    PROXY_MAX_CONCURRENCY: int = 2  # 单个代理同时进行的平台抓取数
+    PROXY_EJECT_FAILURES: int = 3  # 连续失败 N 次剔除
+    PROXY_PROBE_SECONDS: float = 300  # 剔除后多久放行一次探测
+    # 按上游主机限速（令牌桶 + 并发上限），所有爬虫共享；HOST_RATE_OVERRIDES 按主机覆盖
+    HOST_RATE_LIMIT_ENABLED: bool = True
+    HOST_RATE_PER_SECOND: float = 1.0
+    HOST_BURST: int = 3
+    HOST_MAX_CONCURRENCY: int = 2
+    HOST_RATE_OVERRIDES: dict[str, dict] = {"tophub.today": {"rate_per_second": 0.5, "burst": 2}}
+    # 话题详情二级抓取（可选）：每轮各平台 Top N 进入后台有界队列
+    DETAIL_ENABLED: bool = False
+    DETAIL_TOP_N: int = 10
+    DETAIL_CONCURRENCY: int = 3
+    DETAIL_BUDGET_SECONDS: float = 60  # 每批时间预算，超时未处理的任务丢弃
+    DETAIL_REFRESH_MINUTES: float = 30  # 窗口内已抓过的话题复用上次结果
+    DETAIL_QUEUE_SIZE: int = 200
+    # 突发热点快速通道（可选）：秒级轮询微博、抖音 JSON 接口榜首，仅在有变化时入库、告警、推送
+    FAST_LANE_ENABLED: bool = False
+    FAST_LANE_SECONDS: int = 45
+    FAST_LANE_TOP_N: int = 10
+    FAST_LANE_RANK_JUMP: int = 5  # 排名上升不少于该值视为大幅跃升
+    # 中文分词：可选的额外词典（每行第一列为词）与标题分词缓存条数
+    SEGMENT_DICT_PATH: str = ""
+    SEGMENT_CACHE_SIZE: int = 20000
+    # 近似重复：同一平台去重窗口内字符 2-gram Jaccard 不低于阈值的标题归入已有话题
+    NEAR_DUP_ENABLED: bool = True
+    NEAR_DUP_THRESHOLD: float = 0.7
+    # 跨平台、跨周期事件追踪：新话题与活跃事件中心的余弦相似度不低于阈值即归入，空闲超时的事件关闭
+    EVENT_TRACKING_ENABLED: bool = True
+    EVENT_SIMILARITY: float = 0.5
+    EVENT_IDLE_HOURS: float = 24
+    EVENT_MAX_ACTIVE: int = 2000
+    # 关键词共现网络：每轮新话题的词对按时间桶累加，任意窗口由桶合并得到
+    NETWORK_ENABLED: bool = True
+    NETWORK_BUCKET_MINUTES: int = 60
+    NETWORK_RETENTION_DAYS: int = 30
+    # 情感分析后端：lexicon（词典 + 否定/程度词）或 bayes（基于已存标签训练的朴素贝叶斯，进程池打分）
+    SENTIMENT_BACKEND: str = "lexicon"
+    SENTIMENT_WORKERS: int = 1  # bayes 打分进程数，0 表示在线程中打分
+    SENTIMENT_CACHE_SIZE: int = 50000  # 按 dedup_key 记忆的打分结果条数
+    SENTIMENT_TRAINING_LIMIT: int = 20000  # 训练取最近的已标注标题数
+    SENTIMENT_MIN_TRAINING: int = 200  # 样本不足时 bayes 回退到 lexicon
+    # 历史重新打分：关键词配置或情感词典变化后，按主键分段重算已入库行的春节标记与词典情感
+    RESCORE_CHUNK: int = 5000  # 每段行数
+    RESCORE_WORKERS: int = 1  # 打分进程数，0 表示在线程中打分
+    RESCORE_PAUSE_SECONDS: float = 0.05  # 段间暂停，给抓取入库和接口查询让出数据库
+    # 熔断：连续失败 N 次后打开，冷却 RECOVERY 秒后半开探测
+    CIRCUIT_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_RECOVERY_SECONDS: float = 300
+    # 单个平台本轮抓取截止时间，超时记为 late，不拖慢其他平台入库
+    SCRAPE_PLATFORM_DEADLINE_SECONDS: float = 30
+    # 离线回放 / 录制上游响应的目录（见 app/scrapers/replay.py），回放优先
+    SCRAPE_REPLAY_DIR: str = ""
+    SCRAPE_RECORD_DIR: str = ""
     # API 安全
     API_KEY: str | None = os.getenv("API_KEY", None)  # 设置后需携带 X-API-Key 头
     RATE_LIMIT_PER_MINUTE: int = 60
@@ -34,19 +105,34 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
+class HostLimit(BaseModel):
+    rate_per_second: float | None = Field(None, gt=0, le=100)
+    burst: int | None = Field(None, ge=1, le=100)
+    max_concurrency: int | None = Field(None, ge=1, le=50)
+
+
 # 配置更新的校验 Schema
 class ConfigUpdate(BaseModel):
     scrape_interval_minutes: int | None = Field(None, ge=5, le=1440)
     scrape_top_n: int | None = Field(None, ge=10, le=100)
+    adaptive_scheduling: bool | None = None
+    scrape_min_interval_minutes: float | None = Field(None, ge=1, le=1440)
+    scrape_max_interval_minutes: float | None = Field(None, ge=1, le=1440)
     enabled_platforms: list[str] | None = None
     cny_keywords: list[str] | None = None
     custom_keywords: list[str] | None = None
     analysis_enabled: bool | None = None
     openai_model: str | None = None
+    host_rate_limit_enabled: bool | None = None
+    host_rate_per_second: float | None = Field(None, gt=0, le=100)
+    host_burst: int | None = Field(None, ge=1, le=100)
+    host_max_concurrency: int | None = Field(None, ge=1, le=50)
+    host_overrides: dict[str, HostLimit] | None = None
+    detail_enabled: bool | None = None
+    detail_top_n: int | None = Field(None, ge=1, le=50)
+    fast_lane_enabled: bool | None = None
 
 
-VALID_PLATFORMS = {"weibo", "zhihu", "baidu", "douyin", "xiaohongshu"}
-
 
 settings = Settings()
 
@@ -60,12 +146,25 @@ def get_runtime_config() -> dict:
     return {
         "scrape_interval_minutes": _runtime_overrides.get("scrape_interval_minutes", settings.SCRAPE_INTERVAL_MINUTES),
         "scrape_top_n": _runtime_overrides.get("scrape_top_n", settings.SCRAPE_TOP_N),
+        "adaptive_scheduling": _runtime_overrides.get("adaptive_scheduling", settings.ADAPTIVE_SCHEDULING),
+        "scrape_min_interval_minutes": _runtime_overrides.get(
+            "scrape_min_interval_minutes", settings.SCRAPE_MIN_INTERVAL_MINUTES),
+        "scrape_max_interval_minutes": _runtime_overrides.get(
+            "scrape_max_interval_minutes", settings.SCRAPE_MAX_INTERVAL_MINUTES),
         "enabled_platforms": _runtime_overrides.get("enabled_platforms", settings.ENABLED_PLATFORMS),
         "cny_keywords": _runtime_overrides.get("cny_keywords", settings.CNY_KEYWORDS),
         "custom_keywords": _runtime_overrides.get("custom_keywords", settings.CUSTOM_KEYWORDS),
         "analysis_enabled": _runtime_overrides.get("analysis_enabled", settings.ANALYSIS_ENABLED),
         "openai_model": _runtime_overrides.get("openai_model", settings.OPENAI_MODEL),
         "openai_configured": bool(settings.OPENAI_API_KEY),
+        "host_rate_limit_enabled": _runtime_overrides.get("host_rate_limit_enabled", settings.HOST_RATE_LIMIT_ENABLED),
+        "host_rate_per_second": _runtime_overrides.get("host_rate_per_second", settings.HOST_RATE_PER_SECOND),
+        "host_burst": _runtime_overrides.get("host_burst", settings.HOST_BURST),
+        "host_max_concurrency": _runtime_overrides.get("host_max_concurrency", settings.HOST_MAX_CONCURRENCY),
+        "host_overrides": _runtime_overrides.get("host_overrides", settings.HOST_RATE_OVERRIDES),
+        "detail_enabled": _runtime_overrides.get("detail_enabled", settings.DETAIL_ENABLED),
+        "detail_top_n": _runtime_overrides.get("detail_top_n", settings.DETAIL_TOP_N),
+        "fast_lane_enabled": _runtime_overrides.get("fast_lane_enabled", settings.FAST_LANE_ENABLED),
     }
 
 
@@ -74,14 +173,23 @@ def update_runtime_config(updates: dict) -> dict:
     validated = ConfigUpdate(**updates)
     update_dict = validated.model_dump(exclude_none=True)
 
-    # 校验平台名
+    # 校验平台名（内置平台 + 入口点注册的插件平台）
     if "enabled_platforms" in update_dict:
-        invalid = set(update_dict["enabled_platforms"]) - VALID_PLATFORMS
+        from app.scrapers.registry import scraper_registry
+        valid = scraper_registry.names()
+        invalid = set(update_dict["enabled_platforms"]) - set(valid)
         if invalid:
-            raise ValueError(f"无效平台: {invalid}. 可选: {VALID_PLATFORMS}")
+            raise ValueError(f"无效平台: {invalid}. 可选: {valid}")
         if not update_dict["enabled_platforms"]:
             raise ValueError("至少启用一个平台")
 
+    low = update_dict.get("scrape_min_interval_minutes",
+                          _runtime_overrides.get("scrape_min_interval_minutes", settings.SCRAPE_MIN_INTERVAL_MINUTES))
+    high = update_dict.get("scrape_max_interval_minutes",
+                           _runtime_overrides.get("scrape_max_interval_minutes", settings.SCRAPE_MAX_INTERVAL_MINUTES))
+    if low > high:
+        raise ValueError("最小抓取间隔不能大于最大抓取间隔")
+
     for key, value in update_dict.items():
         _runtime_overrides[key] = value
     return get_runtime_config()
@@ -1,13 +1,24 @@
-"""数据去重工具"""
+"""
+数据去重工具
+- make_dedup_key：平台 + 去标点标题的精确 hash
+- 近似重复：字符 n-gram 的 MinHash 签名 + LSH 分桶索引，"XX回应" 与 "XX回应了" 归到同一个规范话题；
+  每次查找只比较同桶候选，耗时与窗口内历史标题数基本无关
+"""
 
+import datetime
 import hashlib
+import random
 import re
 
+from app.config import settings
+
+_CORE_RE = re.compile(r"[^\u4e00-\u9fffA-Za-z0-9]")
+
 
 def make_dedup_key(platform: str, title: str) -> str:
     """生成去重 key: platform + 标题核心词 hash"""
     # 提取中文字符和字母数字，忽略标点
-    core = re.sub(r"[^\u4e00-\u9fffA-Za-z0-9]", "", title)
+    core = _CORE_RE.sub("", title)
     raw = f"{platform}:{core}"
     return hashlib.md5(raw.encode()).hexdigest()
 
@@ -23,3 +34,133 @@ def title_similarity(t1: str, t2: str) -> float:
         return 0.0
     overlap = len(b1 & b2)
     return overlap / min(len(b1), len(b2))
+
+
+SHINGLE_SIZE = 2
+NUM_PERM = 64
+BANDS = 16  # 16 段 × 4 行：Jaccard 约 0.5 起即大概率成为候选，再按精确 Jaccard 过滤
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20250129)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+
+
+def shingles(title: str, n: int = SHINGLE_SIZE) -> frozenset[str]:
+    """去标点、统一小写后的字符 n-gram；短于 n 的标题整体作为一个片段"""
+    core = _CORE_RE.sub("", title).lower()
+    if len(core) <= n:
+        return frozenset([core]) if core else frozenset()
+    return frozenset(core[i:i + n] for i in range(len(core) - n + 1))
+
+
+def minhash(grams: frozenset[str]) -> tuple[int, ...]:
+    """MinHash 签名：NUM_PERM 个 (a·x + b) mod p 置换下的最小值"""
+    if not grams:
+        return ()
+    values = [int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "little") for g in grams]
+    return tuple(min((a * x + b) % _MERSENNE for x in values) for a, b in _PERMUTATIONS)
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def as_utc(moment: datetime.datetime) -> datetime.datetime:
+    """库中读出的时间不带时区（按 UTC 存储），统一成带时区的时间再比较"""
+    return moment if moment.tzinfo else moment.replace(tzinfo=datetime.timezone.utc)
+
+
+class _Entry:
+    __slots__ = ("bands", "grams", "key", "seen", "title")
+
+    def __init__(self, key, title, grams, bands, seen):
+        self.key = key
+        self.title = title
+        self.grams = grams
+        self.bands = bands
+        self.seen = seen
+
+
+class NearDuplicateIndex:
+    """按平台维护去重窗口内规范话题的 LSH 索引：dedup_key → 标题签名"""
+
+    def __init__(self, threshold: float, window: datetime.timedelta, bands: int = BANDS):
+        self.threshold = threshold
+        self.window = window
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._entries: dict[str, dict[str, _Entry]] = {}  # platform → key → entry
+        self._buckets: dict[str, list[dict[tuple, set[str]]]] = {}  # platform → 每段的 桶 → keys
+        self.lookups = 0
+        self.candidates = 0
+        self.matches = 0
+
+    def _band_keys(self, signature: tuple[int, ...]) -> list[tuple]:
+        r = self.rows
+        return [signature[i * r:(i + 1) * r] for i in range(self.bands)] if signature else []
+
+    def add(self, platform: str, key: str, title: str, seen: datetime.datetime) -> None:
+        """登记（或刷新）一个规范话题；同一 key 只保留首次登记的标题"""
+        seen = as_utc(seen)
+        entries = self._entries.setdefault(platform, {})
+        entry = entries.get(key)
+        if entry is not None:
+            entry.seen = max(entry.seen, seen)
+            return
+        grams = shingles(title)
+        bands = self._band_keys(minhash(grams))
+        entries[key] = _Entry(key, title, grams, bands, seen)
+        buckets = self._buckets.setdefault(platform, [{} for _ in range(self.bands)])
+        for band, bucket_key in enumerate(bands):
+            buckets[band].setdefault(bucket_key, set()).add(key)
+
+    def find(self, platform: str, title: str) -> str | None:
+        """返回与标题近似重复的规范话题 key（精确 Jaccard 不低于阈值中最相似的），没有返回 None"""
+        entries = self._entries.get(platform)
+        if not entries:
+            return None
+        self.lookups += 1
+        grams = shingles(title)
+        buckets = self._buckets[platform]
+        candidates: set[str] = set()
+        for band, bucket_key in enumerate(self._band_keys(minhash(grams))):
+            candidates |= buckets[band].get(bucket_key, set())
+        self.candidates += len(candidates)
+        best, best_score = None, self.threshold
+        for key in candidates:
+            score = jaccard(grams, entries[key].grams)
+            if score >= best_score:
+                best, best_score = key, score
+        if best is not None:
+            self.matches += 1
+        return best
+
+    def prune(self, now: datetime.datetime) -> None:
+        """移除超出去重窗口的话题"""
+        cutoff = as_utc(now) - self.window
+        for platform, entries in self._entries.items():
+            buckets = self._buckets[platform]
+            for key in [k for k, e in entries.items() if e.seen < cutoff]:
+                for band, bucket_key in enumerate(entries.pop(key).bands):
+                    bucket = buckets[band][bucket_key]
+                    bucket.discard(key)
+                    if not bucket:
+                        del buckets[band][bucket_key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self.lookups = self.candidates = self.matches = 0
+
+    def stats(self) -> dict:
+        return {
+            "indexed": {p: len(e) for p, e in sorted(self._entries.items())},
+            "lookups": self.lookups,
+            "avg_candidates": round(self.candidates / self.lookups, 2) if self.lookups else None,
+            "matches": self.matches,
+        }
+
+
+DEDUP_WINDOW = datetime.timedelta(hours=6)
+near_dup_index = NearDuplicateIndex(settings.NEAR_DUP_THRESHOLD, DEDUP_WINDOW)
@@ -0,0 +1,216 @@
+"""
+跨平台、跨周期事件追踪（在线聚类）
+- 每个活跃事件在内存中保存中心：成员标题的实词计数，只保留权重最高的 CENTROID_TERMS 个词
+- 新入库的话题经 词 → 事件 倒排索引取候选事件，与中心的余弦相似度不低于 EVENT_SIMILARITY 时
+  归入最相似的事件，否则开一个新事件
+- 超过 EVENT_IDLE_HOURS 没有新成员的事件关闭并移出内存，活跃事件数不超过 EVENT_MAX_ACTIVE；
+  每轮开销只与本轮话题数和活跃事件数有关，与历史长度无关
+- 事件与成员写入 events / event_members 表，重启后从库中恢复活跃事件的中心
+- 事件首次出现在某个平台时交给 app.propagation 记录首次出现时间与平台间时差
+- 同一进程内各平台的入库串行归入事件，避免并发写同一事件
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.dedup import as_utc
+from app.models import Event, EventMember
+from app.propagation import record_arrivals
+
+logger = logging.getLogger(__name__)
+
+CENTROID_TERMS = 30
+EVENT_KEYWORDS = 5
+
+
+@dataclass
+class ActiveEvent:
+    id: int
+    last_seen: datetime.datetime
+    centroid: Counter = field(default_factory=Counter)
+    norm: float = 0.0
+
+
+class EventTracker:
+    def __init__(self, similarity: float, idle: datetime.timedelta, max_active: int):
+        self.similarity = similarity
+        self.idle = idle
+        self.max_active = max_active
+        self._events: dict[int, ActiveEvent] = {}
+        self._index: dict[str, set[int]] = {}  # 中心词 → 事件 id
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self.assigned = 0
+        self.opened = 0
+        self.closed = 0
+
+    @staticmethod
+    def _words(title: str) -> list[str]:
+        from app.segmenter import content_words
+
+        return list(dict.fromkeys(content_words(title)))
+
+    def match(self, words: list[str]) -> tuple[int | None, float]:
+        """最相似的活跃事件及余弦相似度；低于阈值返回 (None, 最高相似度)"""
+        candidates = set()
+        for word in words:
+            candidates |= self._index.get(word, set())
+        best, best_score = None, 0.0
+        for event_id in candidates:
+            event = self._events[event_id]
+            dot = sum(event.centroid.get(w, 0) for w in words)
+            score = dot / (math.sqrt(len(words)) * event.norm)
+            if score > best_score:
+                best, best_score = event_id, score
+        if best_score < self.similarity:
+            return None, best_score
+        return best, best_score
+
+    def _absorb(self, event: ActiveEvent, words: list[str]) -> None:
+        """把成员的词并入中心，只保留权重最高的词并同步倒排索引"""
+        event.centroid.update(words)
+        if len(event.centroid) > CENTROID_TERMS:
+            kept = Counter(dict(event.centroid.most_common(CENTROID_TERMS)))
+            for word in event.centroid.keys() - kept.keys():
+                self._unindex(word, event.id)
+            event.centroid = kept
+        for word in event.centroid:
+            self._index.setdefault(word, set()).add(event.id)
+        event.norm = math.sqrt(sum(c * c for c in event.centroid.values()))
+
+    def _unindex(self, word: str, event_id: int) -> None:
+        ids = self._index.get(word)
+        if ids is not None:
+            ids.discard(event_id)
+            if not ids:
+                del self._index[word]
+
+    def _drop(self, event_id: int) -> None:
+        event = self._events.pop(event_id)
+        for word in event.centroid:
+            self._unindex(word, event_id)
+
+    def _expire(self, now: datetime.datetime) -> list[int]:
+        """空闲超时的事件，以及超出活跃上限时最久未更新的事件"""
+        cutoff = now - self.idle
+        expired = [e.id for e in self._events.values() if e.last_seen < cutoff]
+        overflow = len(self._events) - len(expired) - self.max_active
+        if overflow > 0:
+            remaining = sorted((e for e in self._events.values() if e.last_seen >= cutoff), key=lambda e: e.last_seen)
+            expired += [e.id for e in remaining[:overflow]]
+        for event_id in expired:
+            self._drop(event_id)
+        return expired
+
+    async def _load(self, session, now: datetime.datetime) -> None:
+        """从库中恢复空闲窗口内的活跃事件及其近期成员"""
+        self._loaded = True
+        since = now - self.idle
+        result = await session.execute(
+            select(Event.id, Event.last_seen).where(Event.status == "active", Event.last_seen >= since)
+        )
+        events = {event_id: ActiveEvent(event_id, as_utc(last_seen)) for event_id, last_seen in result}
+        if not events:
+            return
+        result = await session.execute(
+            select(EventMember.event_id, EventMember.title)
+            .where(EventMember.event_id.in_(list(events)), EventMember.fetched_at >= since)
+        )
+        for event_id, title in result:
+            events[event_id].centroid.update(self._words(title))
+        for event in events.values():
+            self._events[event.id] = event
+            self._absorb(event, [])
+        logger.info("Restored %d active events", len(events))
+
+    async def ingest(self, session, topics: list, now: datetime.datetime) -> dict:
+        """把一批新入库的话题归入事件并写库；topics 需有 id / platform / title / rank / hot_value"""
+        async with self._lock:
+            try:
+                return await self._ingest(session, topics, as_utc(now))
+            except Exception:
+                # 写库失败时内存状态可能已领先于库：在持锁期间清空，下次入库从库中恢复
+                self.reset()
+                raise
+
+    async def _ingest(self, session, topics: list, now: datetime.datetime) -> dict:
+        if not self._loaded:
+            await self._load(session, now)
+        expired = self._expire(now)
+        if expired:
+            await session.execute(update(Event).where(Event.id.in_(expired)).values(status="closed"))
+            self.closed += len(expired)
+
+        rows: dict[int, Event] = {}
+        arrivals: list[tuple[int, str, int | None]] = []  # 事件首次出现在该平台
+        opened = assigned = 0
+        for t in topics:
+            words = self._words(t.title)
+            if not words:
+                continue
+            event_id, score = self.match(words)
+            if event_id is None:
+                row = Event(title=t.title, keywords="[]", platforms="[]", platform_count=0, first_seen=now,
+                            last_seen=now, topic_count=0, peak_rank=t.rank, status="active")
+                session.add(row)
+                await session.flush()
+                event_id, score = row.id, 1.0
+                self._events[event_id] = ActiveEvent(event_id, now)
+                rows[event_id] = row
+                opened += 1
+            else:
+                assigned += 1
+                if event_id not in rows:
+                    rows[event_id] = await session.get(Event, event_id)
+            active = self._events[event_id]
+            self._absorb(active, words)
+            active.last_seen = now
+
+            row = rows[event_id]
+            row.last_seen = now
+            row.topic_count += 1
+            platforms = json.loads(row.platforms or "[]")
+            if t.platform not in platforms:
+                arrivals.append((event_id, t.platform, t.rank))
+                row.platforms = json.dumps(platforms + [t.platform], ensure_ascii=False)
+                row.platform_count = len(platforms) + 1
+            if t.rank and (row.peak_rank is None or t.rank < row.peak_rank):
+                row.peak_rank = t.rank
+                row.title = t.title
+            row.keywords = json.dumps([w for w, _ in active.centroid.most_common(EVENT_KEYWORDS)], ensure_ascii=False)
+            session.add(EventMember(
+                event_id=event_id, topic_id=getattr(t, "id", None), platform=t.platform, title=t.title,
+                rank=t.rank, hot_value=t.hot_value, similarity=round(score, 3), fetched_at=now,
+            ))
+        await record_arrivals(session, arrivals, now)
+        await session.commit()
+        self.opened += opened
+        self.assigned += assigned
+        return {"opened": opened, "assigned": assigned, "closed": len(expired)}
+
+    def reset(self) -> None:
+        """清空内存状态，下次入库时从库中重新恢复；保留同一把锁，正在等待的入库仍然串行"""
+        self._events.clear()
+        self._index.clear()
+        self._loaded = False
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._events),
+            "indexed_terms": len(self._index),
+            "opened": self.opened,
+            "assigned": self.assigned,
+            "closed": self.closed,
+        }
+
+
+event_tracker = EventTracker(
+    settings.EVENT_SIMILARITY, datetime.timedelta(hours=settings.EVENT_IDLE_HOURS), settings.EVENT_MAX_ACTIVE)
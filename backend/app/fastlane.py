@@ -0,0 +1,111 @@
+"""
+突发热点快速通道
+- 以秒级间隔只轮询廉价 JSON 接口（微博、抖音）榜单前 N 条
+- 与内存中的上一份快照对比，只在出现新上榜或大幅跃升时返回变化
+- 常规抓取入库后用完整榜单刷新快照，避免同一变化被两条通道重复告警
+"""
+
+import datetime
+import logging
+from dataclasses import dataclass
+
+from app.config import settings
+from app.schemas import HotTopicCreate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FastLaneChange:
+    platform: str
+    topics: list[HotTopicCreate]  # 本次榜首全部条目
+    new: list[HotTopicCreate]  # 快照中没有的新上榜
+    jumps: list[dict]  # 大幅跃升：{"title", "from", "to"}
+
+    @property
+    def changed(self) -> list[HotTopicCreate]:
+        titles = {t.title for t in self.new} | {j["title"] for j in self.jumps}
+        return [t for t in self.topics if t.title in titles]
+
+
+def diff_top(previous: dict[str, int], current: list[HotTopicCreate], min_jump: int):
+    """榜首对比：返回 (新上榜条目, 排名上升不少于 min_jump 的条目)"""
+    new = [t for t in current if t.title not in previous]
+    jumps = [
+        {"title": t.title, "from": previous[t.title], "to": t.rank}
+        for t in current
+        if t.title in previous and previous[t.title] - t.rank >= min_jump
+    ]
+    return new, jumps
+
+
+class PlatformLane:
+    def __init__(self):
+        self.ranks: dict[str, int] | None = None
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_poll: datetime.datetime | None = None
+        self.last_change: datetime.datetime | None = None
+        self.last_error: str | None = None
+
+
+class FastLane:
+    """维护各平台榜首快照并计算变化"""
+
+    def __init__(self):
+        self._lanes: dict[str, PlatformLane] = {}
+
+    def _get(self, platform: str) -> PlatformLane:
+        if platform not in self._lanes:
+            self._lanes[platform] = PlatformLane()
+        return self._lanes[platform]
+
+    def seed(self, platform: str, topics: list) -> None:
+        """常规抓取成功后刷新快照（完整榜单，榜首之外的条目也计入，跌出再回来不算新上榜）"""
+        self._get(platform).ranks = {t.title: t.rank for t in topics}
+
+    def clear(self) -> None:
+        self._lanes.clear()
+
+    async def poll(self, scraper) -> FastLaneChange | None:
+        """轮询一个平台的榜首；首次轮询只建立快照，失败记入统计后返回 None"""
+        lane = self._get(scraper.platform)
+        lane.polls += 1
+        lane.last_poll = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            top = await scraper.fetch_top(settings.FAST_LANE_TOP_N)
+        except Exception as e:
+            lane.errors += 1
+            lane.last_error = str(e)
+            logger.debug("[%s] fast-lane poll failed: %s", scraper.platform, e)
+            return None
+
+        previous = lane.ranks
+        # 只更新榜首部分，保留快照中常规抓取得到的其余条目
+        lane.ranks = {**(previous or {}), **{t.title: t.rank for t in top}}
+        if previous is None or not top:
+            return None
+        new, jumps = diff_top(previous, top, settings.FAST_LANE_RANK_JUMP)
+        if not new and not jumps:
+            return None
+        lane.changes += 1
+        lane.last_change = lane.last_poll
+        return FastLaneChange(scraper.platform, top, new, jumps)
+
+    def snapshot(self) -> dict:
+        return {
+            platform: {
+                "polls": lane.polls,
+                "changes": lane.changes,
+                "errors": lane.errors,
+                "tracked": len(lane.ranks or {}),
+                "last_poll": lane.last_poll.isoformat() if lane.last_poll else None,
+                "last_change": lane.last_change.isoformat() if lane.last_change else None,
+                "last_error": lane.last_error,
+            }
+            for platform, lane in sorted(self._lanes.items())
+        }
+
+
+fast_lane = FastLane()
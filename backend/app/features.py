@@ -0,0 +1,54 @@
+"""
+批次特征预计算
+- 分析报告的各部分（分类、跨平台聚类、平台洞察）共用同一份分词与关键词匹配结果
+- 每个不同的标题只分词、匹配一次；跨平台聚类基于批次的倒排索引只做一次
+"""
+
+import functools
+
+from app.clustering import Clustering, cluster_topics
+from app.keywords import TitleMatch, keyword_engine
+from app.segmenter import content_words
+
+OTHER_CATEGORY = "📌 其他"
+
+
+class BatchFeatures:
+    """一批话题的分词、关键词匹配与聚类结果"""
+
+    def __init__(self, topics: list):
+        self.topics = topics
+        self._words: dict[str, list[str]] = {}
+        self._matches: dict[str, TitleMatch] = {}
+
+    def words(self, title: str) -> list[str]:
+        words = self._words.get(title)
+        if words is None:
+            words = self._words[title] = content_words(title)
+        return words
+
+    def match(self, title: str) -> TitleMatch:
+        match = self._matches.get(title)
+        if match is None:
+            match = self._matches[title] = keyword_engine.match(title)
+        return match
+
+    def category(self, title: str) -> str:
+        """规则靠前的类别优先"""
+        categories = self.match(title).categories
+        return categories[0] if categories else OTHER_CATEGORY
+
+    @functools.cached_property
+    def by_platform(self) -> dict[str, list]:
+        groups: dict[str, list] = {}
+        for t in self.topics:
+            groups.setdefault(t.platform, []).append(t)
+        return groups
+
+    @functools.cached_property
+    def clustering(self) -> Clustering:
+        return cluster_topics(self.topics, words_of=self.words)
+
+    def is_unique(self, platform: str, title: str) -> bool:
+        """该平台的标题是否与其他平台的标题都不共享 2 个以上实词"""
+        return (platform, title) not in self.clustering.cross_linked
@@ -0,0 +1,158 @@
+"""
+统一关键词匹配引擎
+- Aho-Corasick 自动机：一次扫描标题即得到所有关键词命中（含重叠命中与位置），耗时与关键词数量基本无关
+- 春节/自定义关键词、主题分类规则、情感词典编译进同一个自动机，每个关键词带上所属用途的标签
+- 关键词配置变更（/api/config 更新 cny_keywords / custom_keywords）后下次匹配时自动重建，version 随之递增
+- 告警规则的关键词按规则内容编译并缓存
+"""
+
+import functools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from app.config import get_runtime_config
+
+CNY = "cny"
+POSITIVE = "positive"
+NEGATIVE = "negative"
+
+
+@dataclass(frozen=True)
+class Hit:
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """Aho-Corasick 多模式匹配（区分大小写，与 `in` 判断一致）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        for keyword in self.keywords:
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node] = (keyword,)
+        self._build_fail_links()
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                # 后缀上的关键词一并输出（如 "春节快乐" 结尾处同时命中 "快乐"）
+                self._out[child] += self._out[self._fail[child]]
+
+    def find(self, text: str) -> list[Hit]:
+        """单次扫描返回全部命中，按结束位置排序"""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: list[Hit] = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for keyword in out[node]:
+                hits.append(Hit(keyword, i + 1 - len(keyword), i + 1))
+        return hits
+
+    def found(self, text: str) -> list[str]:
+        """命中的不同关键词，按首次出现顺序"""
+        return list(dict.fromkeys(h.keyword for h in self.find(text)))
+
+
+@dataclass
+class TitleMatch:
+    hits: list[Hit]
+    cny: bool = False
+    categories: list[str] = field(default_factory=list)  # 按 CATEGORY_RULES 顺序
+    positive: list[str] = field(default_factory=list)
+    negative: list[str] = field(default_factory=list)
+
+
+class CompiledKeywords:
+    """一个配置版本下编译好的自动机与关键词标签"""
+
+    def __init__(self, cny_keywords: list[str], categories: dict[str, list[str]],
+                 positive: list[str], negative: list[str]):
+        self.category_names = list(categories)
+        tags: dict[str, set] = {}
+        for kw in cny_keywords:
+            tags.setdefault(kw, set()).add(CNY)
+        for index, keywords in enumerate(categories.values()):
+            for kw in keywords:
+                tags.setdefault(kw, set()).add(index)
+        for kw in positive:
+            tags.setdefault(kw, set()).add(POSITIVE)
+        for kw in negative:
+            tags.setdefault(kw, set()).add(NEGATIVE)
+        self.tags = tags
+        self.matcher = KeywordMatcher(tags)
+
+    def match(self, title: str) -> TitleMatch:
+        hits = self.matcher.find(title)
+        result = TitleMatch(hits=hits)
+        category_ids: set[int] = set()
+        for keyword in dict.fromkeys(h.keyword for h in hits):
+            for tag in self.tags[keyword]:
+                if tag == CNY:
+                    result.cny = True
+                elif tag == POSITIVE:
+                    result.positive.append(keyword)
+                elif tag == NEGATIVE:
+                    result.negative.append(keyword)
+                else:
+                    category_ids.add(tag)
+        result.categories = [self.category_names[i] for i in sorted(category_ids)]
+        return result
+
+
+class KeywordEngine:
+    """按当前运行时配置提供编译好的关键词自动机"""
+
+    def __init__(self):
+        self._compiled: CompiledKeywords | None = None
+        self._source: tuple[list[str], list[str]] | None = None
+        self.version = 0
+
+    def compiled(self) -> CompiledKeywords:
+        cfg = get_runtime_config()
+        cny, custom = cfg["cny_keywords"], cfg["custom_keywords"]
+        # 配置更新会替换列表对象，按对象身份判断是否需要重建
+        if self._compiled is None or self._source[0] is not cny or self._source[1] is not custom:
+            from app.analyzer import CATEGORY_RULES
+            from app.sentiment import NEGATIVE_WORDS, POSITIVE_WORDS
+
+            self._compiled = CompiledKeywords(cny + custom, CATEGORY_RULES, POSITIVE_WORDS, NEGATIVE_WORDS)
+            self._source = (cny, custom)
+            self.version += 1
+        return self._compiled
+
+    def match(self, title: str) -> TitleMatch:
+        return self.compiled().match(title)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_keywords(keywords: tuple[str, ...]) -> KeywordMatcher:
+    """编译任意一组关键词（告警规则等），相同关键词组复用同一个自动机"""
+    return KeywordMatcher(keywords)
+
+
+keyword_engine = KeywordEngine()
@@ -12,30 +12,34 @@ from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from app.config import settings, get_enabled_platforms
+from app.config import settings, get_enabled_platforms, get_runtime_config
 from app.cache import cache_delete
 from app.database import init_db, async_session
-from app.dedup import make_dedup_key
-from app.sentiment import analyze_sentiment
+from app.dedup import DEDUP_WINDOW, make_dedup_key, near_dup_index
+from app.events import event_tracker
+from app.fastlane import FastLaneChange, fast_lane
+from app.network import cooccurrence_graph
+from app.rescore import rescore_manager
+from app.segmenter import segmenter
+from app.sentiment import bayes_backend, sentiment_service
 from app.models import HotTopic, TopicLifecycle, AlertRule
 from app.schemas import HotTopicOut
 from app.api.routes import router
-from app.scrapers.weibo import WeiboScraper
-from app.scrapers.zhihu import ZhihuScraper
-from app.scrapers.baidu import BaiduScraper
-from app.scrapers.douyin import DouyinScraper
-from app.scrapers.xiaohongshu import XiaohongshuScraper
+from app.scrapers.base import FastLaneMixin, PayloadUnchanged
+from app.scrapers.breaker import CLOSED, CircuitOpen
+from app.scrapers.details import DetailBatch, detail_crawler, enriched_topics
+from app.scrapers.http_pool import client_pool
+from app.scrapers.proxy_pool import proxy_pool
+from app.scrapers.ratelimit import host_limiter
+from app.scrapers import replay
+from app.scrapers.multisource import MultiSourceScraper
+from app.scrapers.tophub import tophub_source
+from app.scheduling import adaptive_scheduler
+from app.scrapers.registry import scraper_registry
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-ALL_SCRAPERS = {
-    "weibo": WeiboScraper(),
-    "zhihu": ZhihuScraper(),
-    "baidu": BaiduScraper(),
-    "douyin": DouyinScraper(),
-    "xiaohongshu": XiaohongshuScraper(),
-}
 scheduler = AsyncIOScheduler()
 _app_start_time = time.time()
 _scrape_count = 0
@@ -54,7 +58,7 @@ async def ws_broadcast(data: dict):
             await ws.send_text(msg)
         except Exception:
             dead.add(ws)
-    _ws_clients -= dead
+    _ws_clients.difference_update(dead)
 
 
 # ---- 限流中间件 ----
@@ -97,116 +101,326 @@ class ApiKeyMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
-# ---- 获取上一轮抓取数据（用于告警对比）----
-_previous_topics: list[HotTopicOut] = []
+# ---- 获取上一轮抓取数据（用于告警对比），按平台保存 ----
+_previous_topics: dict[str, list[HotTopicOut]] = {}
+# 各平台最近一次入库时完整榜单的 dedup_key（含去重掉的话题），榜单未变化时据此刷新生命周期
+_listed_keys: dict[str, list[str]] = {}
 
 
-async def run_scrapers():
-    """执行启用的爬虫并保存数据，含去重、情感分析、生命周期、告警"""
-    global _scrape_count, _last_scrape_status, _previous_topics
+async def run_scrapers(platforms: list[str] | None = None):
+    """执行启用的爬虫并保存数据，含去重、情感分析、生命周期、告警
+
+    platforms 为空时抓取全部启用平台；按平台调度的任务只传入单个平台。
+    各平台按完成先后依次入库、清缓存、推送，慢平台不影响快平台的数据新鲜度。
+    """
+    global _scrape_count, _last_scrape_status
     now = datetime.datetime.now(datetime.timezone.utc)
     enabled = get_enabled_platforms()
-    active_scrapers = [s for name, s in ALL_SCRAPERS.items() if name in enabled]
+    if platforms is not None:
+        enabled = [p for p in enabled if p in platforms]
+    if not enabled:
+        return
+    active_scrapers = scraper_registry.enabled(enabled)
     logger.info("Starting scrape cycle... (platforms: %s)", ", ".join(enabled))
 
-    results = await asyncio.gather(*(s.fetch() for s in active_scrapers), return_exceptions=True)
+    platform_status: dict[str, dict] = {}
+    scrape_errors: dict[str, str] = {}
+    deadline = settings.SCRAPE_PLATFORM_DEADLINE_SECONDS
+
+    for next_done in asyncio.as_completed([_fetch_with_deadline(s, deadline) for s in active_scrapers]):
+        scraper, items = await next_done
+        platform = scraper.platform
+        if isinstance(items, PayloadUnchanged):
+            # 榜单未变化：跳过解析、情感分析与入库，只刷新榜上话题的 last_seen
+            platform_status[platform] = {"status": "unchanged", "count": 0}
+            await _touch_lifecycles(platform, now)
+            _reschedule(platform, adaptive_scheduler.observe(platform, None))
+        elif isinstance(items, CircuitOpen):
+            # 熔断中：立即跳过，不阻塞其他平台
+            platform_status[platform] = {
+                "status": "skipped", "count": 0, "circuit": scraper.breaker.state, "reason": str(items),
+            }
+        elif isinstance(items, asyncio.TimeoutError):
+            logger.warning("[%s] missed the %ss deadline", platform, deadline)
+            platform_status[platform] = {"status": "late", "count": 0, "error": f"deadline {deadline}s exceeded"}
+            scrape_errors[platform] = platform_status[platform]["error"]
+        elif isinstance(items, Exception):
+            logger.warning("Scraper error: %s", items)
+            platform_status[platform] = {"status": "error", "count": 0, "error": str(items)}
+            scrape_errors[platform] = str(items)
+        else:
+            _reschedule(platform, adaptive_scheduler.observe(platform, {i.title: i.rank for i in items}))
+            fast_lane.seed(platform, items)
+            platform_status[platform] = await _ingest_platform(platform, items, now, scraper)
+        platform_status[platform]["time"] = now.isoformat()
 
-    platform_status = {}
-    scrape_errors = {}
-    new_topics: list[HotTopicOut] = []
+    if scrape_errors:
+        async with async_session() as session:
+            await _process_alert_rules(session, [], [], scrape_errors)
+
+    _scrape_count += 1
+    # 各平台独立调度，保留其他平台最近一次的状态
+    all_status = {**_last_scrape_status.get("platforms", {}), **platform_status}
+    _last_scrape_status = {
+        "time": now.isoformat(),
+        "total_saved": sum(p.get("count", 0) for p in platform_status.values()),
+        "deduped": sum(p.get("deduped", 0) for p in platform_status.values()),
+        "near_duplicates": sum(p.get("near_duplicates", 0) for p in platform_status.values()),
+        "unchanged": [p for p, st in platform_status.items() if st["status"] == "unchanged"],
+        "late": [p for p, st in platform_status.items() if st["status"] == "late"],
+        "platforms": all_status,
+    }
 
+    # WebSocket 广播本轮结束通知
+    await ws_broadcast({
+        "type": "scrape_complete",
+        "time": now.isoformat(),
+        "total": _last_scrape_status["total_saved"],
+        "platforms": list(platform_status.keys()),
+    })
+
+
+async def _fetch_with_deadline(scraper, deadline: float):
+    """抓取单个平台，超过截止时间取消；返回 (scraper, 结果或异常)"""
+    try:
+        return scraper, await asyncio.wait_for(scraper.fetch(), timeout=deadline)
+    except Exception as e:
+        return scraper, e
+
+
+def _invalidate_platform_cache(platform: str):
+    """只清除受该平台新数据影响的缓存"""
+    for prefix in ("topics", "wordcloud"):
+        cache_delete(f"{prefix}:{platform}:")
+        cache_delete(f"{prefix}:None:")
+    cache_delete("stats")
+
+
+async def _ingest_platform(platform: str, items: list, now: datetime.datetime, scraper=None) -> dict:
+    """单个平台入库：去重、情感分析、保存、生命周期、告警、清缓存、推送
+
+    启用详情抓取时，Top N 话题提交到后台详情队列；列表没有热度的平台，
+    热度突增检测延后到详情补齐热度之后。
+    """
+    from sqlalchemy import select
+
+    saved = 0
+    deduped = 0
+    near_duplicates = 0
+    new_topics: list[HotTopicOut] = []
     async with async_session() as session:
         try:
-            count = 0
-            dedup_count = 0
-
-            # 获取最近 6 小时的 dedup_key 集合用于去重
-            from sqlalchemy import select
-            six_hours_ago = now - datetime.timedelta(hours=6)
-            existing_keys = set()
+            # 获取该平台最近 6 小时的 dedup_key 集合用于去重，并同步近似重复索引
             result = await session.execute(
-                select(HotTopic.dedup_key).where(
-                    HotTopic.fetched_at >= six_hours_ago,
+                select(HotTopic.dedup_key, HotTopic.title, HotTopic.fetched_at).where(
+                    HotTopic.platform == platform,
+                    HotTopic.fetched_at >= now - DEDUP_WINDOW,
                     HotTopic.dedup_key.isnot(None),
                 )
             )
-            existing_keys = {r[0] for r in result}
-
-            for scraper, items in zip(active_scrapers, results):
-                if isinstance(items, Exception):
-                    logger.warning("Scraper error: %s", items)
-                    platform_status[scraper.platform] = {"status": "error", "count": 0, "error": str(items)}
-                    scrape_errors[scraper.platform] = str(items)
+            existing_keys = set()
+            for key, title, fetched_at in result:
+                existing_keys.add(key)
+                near_dup_index.add(platform, key, title, fetched_at)
+            near_dup_index.prune(now)
+
+            fresh = []
+            listed = []
+            for item in items:
+                # 去重检查：精确 key，其次是窗口内近似重复的规范话题
+                dk = _canonical_key(platform, item.title, existing_keys)
+                listed.append(dk)
+                if dk in existing_keys:
+                    deduped += 1
+                    if dk != make_dedup_key(platform, item.title):
+                        near_duplicates += 1
                     continue
-
-                saved = 0
-                for item in items:
-                    # 去重检查
-                    dk = make_dedup_key(item.platform, item.title)
-                    if dk in existing_keys:
-                        dedup_count += 1
-                        continue
-
-                    # 情感分析
-                    sentiment_label, sentiment_score = analyze_sentiment(item.title)
-
-                    topic = HotTopic(
-                        **item.model_dump(),
-                        fetched_at=now,
-                        dedup_key=dk,
-                        sentiment=sentiment_label,
-                        sentiment_score=sentiment_score,
-                    )
-                    session.add(topic)
-                    existing_keys.add(dk)
-                    count += 1
-                    saved += 1
-
-                platform_status[scraper.platform] = {"status": "ok", "count": saved}
+                existing_keys.add(dk)
+                near_dup_index.add(platform, dk, item.title, now)
+                fresh.append((dk, item))
+
+            # 情感分析：整批一次打分（线程/进程池中进行，按 dedup_key 记忆）
+            scores, sentiment_source = await sentiment_service.score_with_source(
+                [(dk, item.title) for dk, item in fresh])
+            for (dk, item), (sentiment_label, sentiment_score) in zip(fresh, scores):
+                topic = HotTopic(
+                    **item.model_dump(exclude={"sentiment", "sentiment_score"}),
+                    fetched_at=now,
+                    dedup_key=dk,
+                    sentiment=sentiment_label,
+                    sentiment_score=sentiment_score,
+                    sentiment_source=sentiment_source,
+                )
+                session.add(topic)
+                saved += 1
 
             await session.commit()
-            logger.info("Saved %d topics (%d deduped).", count, dedup_count)
+            logger.info("[%s] saved %d topics (%d deduped, %d near-duplicate).",
+                        platform, saved, deduped, near_duplicates)
 
-            # 获取本轮所有新增话题用于告警
-            result2 = await session.execute(
-                select(HotTopic).where(HotTopic.fetched_at == now).order_by(HotTopic.rank)
+            result = await session.execute(
+                select(HotTopic)
+                .where(HotTopic.platform == platform, HotTopic.fetched_at == now)
+                .order_by(HotTopic.rank)
             )
-            new_topics = [HotTopicOut.model_validate(t) for t in result2.scalars().all()]
+            new_topics = [HotTopicOut.model_validate(t) for t in result.scalars().all()]
 
-            # 更新生命周期
+            # 更新生命周期，新话题归入跨平台事件，词对计入共现网络
             await _update_lifecycles(session, new_topics, now)
+            await _track_events(session, new_topics, now)
+            await _record_network(session, new_topics, now)
 
-            # 处理告警
-            await _process_alert_rules(session, new_topics, _previous_topics, scrape_errors)
-
+            # 处理告警（热度突增 / 关键词），与该平台上一轮对比
+            defer_spikes = detail_crawler.enabled and all(t.hot_value is None for t in new_topics)
+            rule_types = {"keyword", "failure"} if defer_spikes else None
+            await _process_alert_rules(session, new_topics, _previous_topics.get(platform, []), {}, rule_types)
         except Exception as e:
             await session.rollback()
-            logger.error("Failed to save topics: %s", e)
-
-    _previous_topics = new_topics
-    _scrape_count += 1
-    _last_scrape_status = {
+            logger.error("[%s] failed to save topics: %s", platform, e)
+            return {"status": "error", "count": 0, "error": f"persist failed: {e}"}
+
+    previous = _previous_topics.get(platform, [])
+    _previous_topics[platform] = new_topics
+    _listed_keys[platform] = listed
+    if scraper is not None:
+        detail_crawler.submit(scraper, new_topics, previous)
+    _invalidate_platform_cache(platform)
+    await ws_broadcast({
+        "type": "platform_update",
+        "platform": platform,
         "time": now.isoformat(),
-        "total_saved": sum(p.get("count", 0) for p in platform_status.values()),
-        "deduped": dedup_count if 'dedup_count' in dir() else 0,
-        "platforms": platform_status,
-    }
-    cache_delete()
+        "total": saved,
+    })
+    return {"status": "ok", "count": saved, "deduped": deduped, "near_duplicates": near_duplicates}
+
+
+def _canonical_key(platform: str, title: str, existing_keys: set[str]) -> str:
+    """标题的 dedup_key；精确 key 不在窗口内时，查找近似重复的规范话题并沿用其 key"""
+    dk = make_dedup_key(platform, title)
+    if dk in existing_keys or not settings.NEAR_DUP_ENABLED:
+        return dk
+    return near_dup_index.find(platform, title) or dk
+
 
-    # WebSocket 广播新数据通知
+async def run_fast_lane():
+    """快速通道：轮询各平台榜首，只在出现新上榜或大幅跃升时入库、告警、推送"""
+    if not get_runtime_config()["fast_lane_enabled"]:
+        return
+    scrapers = [
+        s for s in scraper_registry.enabled(get_enabled_platforms())
+        if isinstance(s, FastLaneMixin) and s.breaker.state == CLOSED
+    ]
+    changes = await asyncio.gather(*(fast_lane.poll(s) for s in scrapers))
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for change in changes:
+        if change is not None:
+            await _ingest_fast_lane(change, now)
+
+
+async def _ingest_fast_lane(change: FastLaneChange, now: datetime.datetime):
+    """快速通道入库：只保存新上榜条目，更新变化条目的生命周期，处理告警并推送"""
+    from sqlalchemy import select
+
+    platform = change.platform
+    changed = change.changed
+    # 近似重复的措辞变体归入已有的规范话题
+    canonical = {t.title: _canonical_key(platform, t.title, set()) for t in changed}
+    async with async_session() as session:
+        try:
+            keys = {canonical[t.title]: t for t in change.new}
+            result = await session.execute(
+                select(HotTopic.dedup_key).where(
+                    HotTopic.dedup_key.in_(list(keys)),
+                    HotTopic.fetched_at >= now - DEDUP_WINDOW,
+                )
+            )
+            existing = {r[0] for r in result}
+            fresh = [(dk, item) for dk, item in keys.items() if dk not in existing]
+            scores, sentiment_source = await sentiment_service.score_with_source(
+                [(dk, item.title) for dk, item in fresh])
+            saved = []
+            for (dk, item), (sentiment_label, sentiment_score) in zip(fresh, scores):
+                topic = HotTopic(
+                    **item.model_dump(exclude={"sentiment", "sentiment_score"}),
+                    fetched_at=now,
+                    dedup_key=dk,
+                    sentiment=sentiment_label,
+                    sentiment_score=sentiment_score,
+                    sentiment_source=sentiment_source,
+                )
+                session.add(topic)
+                near_dup_index.add(platform, dk, item.title, now)
+                saved.append(topic)
+            await session.commit()
+            saved_topics = [HotTopicOut.model_validate(t) for t in saved]
+            await _track_events(session, saved_topics, now)
+            await _record_network(session, saved_topics, now)
+
+            # 新入库的条目建立生命周期；其余变化条目只刷新 last_seen 与最高排名，出现次数与状态留给常规抓取
+            await _update_lifecycles(session, saved_topics, now)
+            saved_keys = {t.dedup_key for t in saved_topics}
+            await _refresh_lifecycles(
+                session, [t for t in changed if canonical[t.title] not in saved_keys], now,
+                key_of=lambda t: canonical[t.title])
+            # 新上榜做关键词告警，跃升条目与上一轮常规抓取对比热度突增
+            await _process_alert_rules(
+                session, changed, _previous_topics.get(platform, []), {}, {"spike", "keyword"})
+        except Exception as e:
+            await session.rollback()
+            logger.error("[%s] failed to save fast-lane changes: %s", platform, e)
+            return
+
+    logger.info("[%s] fast lane: %d new, %d jumps, %d saved",
+                platform, len(change.new), len(change.jumps), len(saved))
+    _invalidate_platform_cache(platform)
     await ws_broadcast({
-        "type": "scrape_complete",
+        "type": "fast_lane",
+        "platform": platform,
         "time": now.isoformat(),
-        "total": len(new_topics),
-        "platforms": list(platform_status.keys()),
+        "total": len(saved),
+        "new": [{"title": t.title, "rank": t.rank} for t in change.new],
+        "jumps": change.jumps,
     })
 
 
-async def _update_lifecycles(session, topics: list[HotTopicOut], now: datetime.datetime):
-    """更新话题生命周期"""
+def _scrape_job_id(platform: str) -> str:
+    return f"scrape:{platform}"
+
+
+def schedule_platform_jobs(reset: bool = False):
+    """为每个启用平台注册独立抓取任务，移除已停用平台的任务"""
+    if reset:
+        adaptive_scheduler.reset()
+    enabled = get_enabled_platforms()
+    for job in scheduler.get_jobs():
+        if job.id.startswith("scrape:") and job.id.removeprefix("scrape:") not in enabled:
+            scheduler.remove_job(job.id)
+    for platform in enabled:
+        job_id = _scrape_job_id(platform)
+        if scheduler.get_job(job_id) and not reset:
+            continue
+        scheduler.add_job(
+            run_scrapers, "interval",
+            seconds=round(adaptive_scheduler.interval(platform) * 60),
+            args=[[platform]], id=job_id, replace_existing=True,
+        )
+
+
+def _reschedule(platform: str, minutes: float):
+    """平台间隔变化时调整其任务触发器"""
+    job = scheduler.get_job(_scrape_job_id(platform))
+    if not job:
+        return
+    seconds = round(minutes * 60)
+    if job.trigger.interval.total_seconds() != seconds:
+        scheduler.reschedule_job(job.id, trigger="interval", seconds=seconds)
+
+
+async def _update_lifecycles(session, topics: list[HotTopicOut], now: datetime.datetime, key_of=None):
+    """更新话题生命周期；key_of 给出话题的 dedup_key，默认取已存的 key"""
     from sqlalchemy import select
     for t in topics:
-        dk = make_dedup_key(t.platform, t.title)
+        dk = key_of(t) if key_of else t.dedup_key or make_dedup_key(t.platform, t.title)
         result = await session.execute(
             select(TopicLifecycle).where(TopicLifecycle.dedup_key == dk)
         )
@@ -253,14 +467,87 @@ async def _update_lifecycles(session, topics: list[HotTopicOut], now: datetime.d
     await session.commit()
 
 
-async def _process_alert_rules(session, current, previous, errors):
-    """处理告警规则"""
+async def _touch_lifecycles(platform: str, now: datetime.datetime):
+    """榜单未变化时上一轮的话题仍在榜：刷新 last_seen，避免被 2 小时未出现的清理标为 off"""
+    keys = _listed_keys.get(platform)
+    if not keys:
+        return
+    from sqlalchemy import update
+    async with async_session() as session:
+        await session.execute(
+            update(TopicLifecycle)
+            .where(TopicLifecycle.dedup_key.in_(keys), TopicLifecycle.status != "off")
+            .values(last_seen=now)
+        )
+        await session.commit()
+
+
+async def _refresh_lifecycles(session, topics: list, now: datetime.datetime, key_of):
+    """快速通道的排名变化：只刷新 last_seen 与最高排名，不计出现次数、不推进 rising/peak 状态"""
+    from sqlalchemy import select
+    ranks = {key_of(t): t.rank for t in topics}
+    if not ranks:
+        return
+    result = await session.execute(select(TopicLifecycle).where(TopicLifecycle.dedup_key.in_(list(ranks))))
+    for lifecycle in result.scalars():
+        lifecycle.last_seen = now
+        rank = ranks[lifecycle.dedup_key]
+        if rank and (lifecycle.peak_rank is None or rank < lifecycle.peak_rank):
+            lifecycle.peak_rank = rank
+            lifecycle.peak_time = now
+    await session.commit()
+
+
+async def _track_events(session, topics: list[HotTopicOut], now: datetime.datetime):
+    """在线事件聚类；失败只记日志，不影响话题入库"""
+    if not settings.EVENT_TRACKING_ENABLED or not topics:
+        return
+    try:
+        await event_tracker.ingest(session, topics, now)
+    except Exception as e:
+        await session.rollback()
+        logger.error("Event tracking failed: %s", e)
+
+
+async def _record_network(session, topics: list[HotTopicOut], now: datetime.datetime):
+    """新话题的词对计入当前时间桶的共现矩阵；失败只记日志"""
+    if not settings.NETWORK_ENABLED or not topics:
+        return
+    try:
+        await cooccurrence_graph.record(session, [t.title for t in topics], now)
+    except Exception as e:
+        await session.rollback()
+        logger.error("Co-occurrence update failed: %s", e)
+
+
+# ---- 详情补齐热度后的上一批（用于延后的热度突增对比），按平台保存 ----
+_previous_enriched: dict[str, list[HotTopicOut]] = {}
+
+
+async def _on_details_enriched(batch: DetailBatch):
+    """详情批次完成：列表无热度的平台用补齐后的热度做突增检测，并刷新缓存"""
+    if batch.results:
+        _invalidate_platform_cache(batch.platform)
+    if not batch.defer_spikes:
+        return
+    current = enriched_topics(batch)
+    async with async_session() as session:
+        await _process_alert_rules(session, current, _previous_enriched.get(batch.platform, []), {}, {"spike"})
+    _previous_enriched[batch.platform] = current
+
+
+detail_crawler.on_batch_done = _on_details_enriched
+
+
+async def _process_alert_rules(session, current, previous, errors, rule_types: set[str] | None = None):
+    """处理告警规则；rule_types 限定本次只处理的规则类型"""
     from sqlalchemy import select
     from app.alerts import process_alerts
 
-    result = await session.execute(
-        select(AlertRule).where(AlertRule.enabled == True)  # noqa: E712
-    )
+    query = select(AlertRule).where(AlertRule.enabled == True)  # noqa: E712
+    if rule_types is not None:
+        query = query.where(AlertRule.rule_type.in_(rule_types))
+    result = await session.execute(query)
     rules = result.scalars().all()
     if not rules:
         return
@@ -275,6 +562,15 @@ async def _process_alert_rules(session, current, previous, errors):
         logger.info("Alerts triggered: %d rules", len(triggered))
 
 
+async def _train_sentiment_job():
+    """用库中已存的情感标签重新训练朴素贝叶斯模型"""
+    async with async_session() as session:
+        try:
+            await bayes_backend.train(session)
+        except Exception as e:
+            logger.error("Sentiment model training failed: %s", e)
+
+
 async def _generate_daily_report_job():
     """定时生成每日报告"""
     from app.report_generator import generate_daily_report
@@ -288,13 +584,31 @@ async def _generate_daily_report_job():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
-    await run_scrapers()
-    scheduler.add_job(run_scrapers, "interval", minutes=settings.SCRAPE_INTERVAL_MINUTES)
+    replay.install_from_settings()
+    client_pool.open(get_enabled_platforms())
+    # 首轮抓取在后台进行，不阻塞服务启动；已有数据的接口可立即响应
+    initial_scrape = asyncio.create_task(run_scrapers())
+    schedule_platform_jobs()
     # 每天 23:55 生成日报
     scheduler.add_job(_generate_daily_report_job, "cron", hour=23, minute=55)
+    # 快速通道任务常驻，开关由运行时配置 fast_lane_enabled 控制
+    scheduler.add_job(run_fast_lane, "interval", seconds=settings.FAST_LANE_SECONDS,
+                      id="fast_lane", max_instances=1, coalesce=True)
+    # bayes 情感后端：启动时训练一次，之后每天凌晨用新积累的标签重训
+    if settings.SENTIMENT_BACKEND == "bayes":
+        scheduler.add_job(_train_sentiment_job, "cron", hour=4, minute=30, id="sentiment_train",
+                          next_run_time=datetime.datetime.now())
     scheduler.start()
+    # 继续上次未完成的历史重新打分；关键词配置与上次打分时不同则重新开始
+    await rescore_manager.resume()
     yield
     scheduler.shutdown()
+    initial_scrape.cancel()
+    await asyncio.gather(initial_scrape, return_exceptions=True)
+    await detail_crawler.stop()
+    await rescore_manager.stop()
+    bayes_backend.close()
+    await client_pool.close()
 
 
 app = FastAPI(
@@ -334,6 +648,24 @@ async def health():
         "last_scrape": _last_scrape_status or None,
         "enabled_platforms": get_enabled_platforms(),
         "ws_clients": len(_ws_clients),
+        "circuit_breakers": {name: s.breaker.to_dict() for name, s in scraper_registry.loaded().items()},
+        "http_pool": client_pool.stats(),
+        "proxies": proxy_pool.snapshot(),
+        "rate_limits": host_limiter.stats(),
+        "schedule": adaptive_scheduler.snapshot(),
+        "sources": {
+            name: s.source_stats()
+            for name, s in scraper_registry.loaded().items() if isinstance(s, MultiSourceScraper)
+        },
+        "tophub": tophub_source.stats(),
+        "details": detail_crawler.stats(),
+        "fast_lane": fast_lane.snapshot(),
+        "segmenter": segmenter.stats(),
+        "near_duplicates": near_dup_index.stats(),
+        "events": event_tracker.stats(),
+        "network": cooccurrence_graph.stats(),
+        "sentiment": sentiment_service.stats(),
+        "rescore": rescore_manager.stats(),
     }
 
 
@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import String, Integer, DateTime, Text, Boolean, Index, Float, UniqueConstraint
+from sqlalchemy import String, Integer, BigInteger, DateTime, Text, Boolean, Index, Float, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -18,6 +18,7 @@ class HotTopic(Base):
     is_cny_related: Mapped[bool] = mapped_column(Boolean, default=False, comment="是否春节相关")
     sentiment: Mapped[str | None] = mapped_column(String(10), nullable=True, comment="情感: positive/neutral/negative")
     sentiment_score: Mapped[float | None] = mapped_column(Float, nullable=True, comment="情感分数 -1~1")
+    sentiment_source: Mapped[str | None] = mapped_column(String(10), nullable=True, comment="情感标签来源: lexicon/bayes/manual")
     dedup_key: Mapped[str | None] = mapped_column(String(64), nullable=True, comment="去重 hash key")
     fetched_at: Mapped[datetime.datetime] = mapped_column(
         DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc),
@@ -57,6 +58,136 @@ class TopicLifecycle(Base):
     )
 
 
+class TopicDetail(Base):
+    """话题详情页补充信息（二级抓取），按 dedup_key 保存最新一次"""
+    __tablename__ = "topic_details"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    platform: Mapped[str] = mapped_column(String(20), nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    dedup_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    hot_value: Mapped[int | None] = mapped_column(BigInteger, nullable=True, comment="详情页热度")
+    read_count: Mapped[int | None] = mapped_column(BigInteger, nullable=True, comment="阅读/浏览量")
+    answer_count: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="回答/讨论数")
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True, comment="摘要")
+    fetched_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_detail_platform_fetched", "platform", "fetched_at"),
+    )
+
+
+class Event(Base):
+    """跨平台、跨周期的事件（故事），由入库时的在线聚类维护"""
+    __tablename__ = "events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    title: Mapped[str] = mapped_column(String(500), nullable=False, comment="代表标题（排名最好的成员）")
+    keywords: Mapped[str | None] = mapped_column(Text, nullable=True, comment="JSON list")
+    platforms: Mapped[str | None] = mapped_column(Text, nullable=True, comment="JSON list")
+    platform_count: Mapped[int] = mapped_column(Integer, default=0)
+    first_seen: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    last_seen: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    topic_count: Mapped[int] = mapped_column(Integer, default=0)
+    peak_rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="active", comment="active/closed")
+
+    __table_args__ = (
+        Index("ix_event_status_last_seen", "status", "last_seen"),
+    )
+
+
+class EventMember(Base):
+    """事件成员：每次有话题归入事件记一行，按时间排列即事件时间线"""
+    __tablename__ = "event_members"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    topic_id: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="hot_topics.id")
+    platform: Mapped[str] = mapped_column(String(20), nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    hot_value: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    similarity: Mapped[float | None] = mapped_column(Float, nullable=True, comment="归入时与事件中心的相似度")
+    fetched_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_event_member_event", "event_id", "fetched_at"),
+    )
+
+
+class EventPlatform(Base):
+    """事件在各平台的首次出现时间（跨平台传播分析的联结）"""
+    __tablename__ = "event_platforms"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    platform: Mapped[str] = mapped_column(String(20), nullable=False)
+    first_seen: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    first_rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("event_id", "platform", name="uq_event_platform"),
+    )
+
+
+class PropagationStat(Base):
+    """平台对传播时差的增量聚合：leader 先出现、follower 随后跟进的事件数与时差分布"""
+    __tablename__ = "propagation_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    leader: Mapped[str] = mapped_column(String(20), nullable=False)
+    follower: Mapped[str] = mapped_column(String(20), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, comment="leader 领先的事件数")
+    ties: Mapped[int] = mapped_column(Integer, default=0, comment="同一时刻出现的事件数（记在 leader < follower 的行）")
+    total_minutes: Mapped[float] = mapped_column(Float, default=0.0)
+    max_minutes: Mapped[float] = mapped_column(Float, default=0.0)
+    histogram: Mapped[str] = mapped_column(Text, nullable=False, comment="JSON list，各时差区间的事件数")
+
+    __table_args__ = (
+        UniqueConstraint("leader", "follower", name="uq_propagation_pair"),
+    )
+
+
+class TermCooccurrence(Base):
+    """关键词共现：每个时间桶一个稀疏上三角矩阵，term_a == term_b 为词的出现次数"""
+    __tablename__ = "term_cooccurrence"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, comment="桶起点")
+    term_a: Mapped[str] = mapped_column(String(20), nullable=False)
+    term_b: Mapped[str] = mapped_column(String(20), nullable=False, comment="字典序不小于 term_a")
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("bucket", "term_a", "term_b", name="uq_cooccurrence_bucket_pair"),
+    )
+
+
+class RescoreJob(Base):
+    """历史重新打分任务：游标随每段提交推进，重启后从游标继续"""
+    __tablename__ = "rescore_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    reason: Mapped[str] = mapped_column(String(20), nullable=False, comment="config/manual/startup")
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False, comment="关键词与情感词典的摘要")
+    status: Mapped[str] = mapped_column(String(20), default="running", comment="running/completed/superseded/failed")
+    last_id: Mapped[int] = mapped_column(Integer, default=0, comment="已处理到的 hot_topics.id")
+    max_id: Mapped[int] = mapped_column(Integer, default=0, comment="开始时的最大 id，之后入库的行已按新配置打分")
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    scanned: Mapped[int] = mapped_column(Integer, default=0)
+    changed: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_rescore_status", "status"),
+    )
+
+
 class DailyReport(Base):
     """每日/每周分析报告"""
     __tablename__ = "daily_reports"
@@ -0,0 +1,184 @@
+"""
+关键词共现网络
+- 每轮入库的新话题按标题分词（实词去重），同一标题中的两个词记一次共现，词自身的出现次数记在对角线 (词, 词)
+- 共现按时间桶（NETWORK_BUCKET_MINUTES）累加到 term_cooccurrence 表，每个桶即一个稀疏的 词 × 词 上三角矩阵
+- 任意时间窗口的网络 = 窗口内各桶矩阵相加（按词对分组求和），不扫描 hot_topics 原始数据
+- 社区：窗口内权重最高的边构成的图上做加权标签传播
+- 超过 NETWORK_RETENTION_DAYS 的桶在进入新桶时删除
+"""
+
+import asyncio
+import datetime
+import itertools
+import logging
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.dedup import as_utc
+from app.models import TermCooccurrence
+
+logger = logging.getLogger(__name__)
+
+MAX_TERMS_PER_TITLE = 12  # 限制单个标题产生的词对数
+MAX_TERM_LENGTH = 20  # 分词器把词典外的连续单字合并为候选词，过长的不计入
+PROPAGATION_ROUNDS = 20
+EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def bucket_of(moment: datetime.datetime, minutes: int) -> datetime.datetime:
+    """时间所在桶的起点（UTC，按 minutes 对齐）"""
+    size = datetime.timedelta(minutes=minutes)
+    return EPOCH + (as_utc(moment) - EPOCH) // size * size
+
+
+def count_pairs(titles: list[str], words_of=None) -> Counter:
+    """一批标题的 (词, 词) 共现计数，词对按字典序；对角线为词的出现次数"""
+    if words_of is None:
+        from app.segmenter import content_words as words_of
+
+    counts: Counter = Counter()
+    for title in titles:
+        words = sorted({w for w in words_of(title)[:MAX_TERMS_PER_TITLE] if len(w) <= MAX_TERM_LENGTH})
+        counts.update((w, w) for w in words)
+        counts.update(itertools.combinations(words, 2))
+    return counts
+
+
+def label_propagation(edges: list[tuple[str, str, float]], rounds: int = PROPAGATION_ROUNDS) -> dict[str, str]:
+    """加权标签传播：每个节点取邻居中权重和最大的标签，平局取字典序最小者；按固定顺序更新，结果确定"""
+    neighbours: dict[str, Counter] = {}
+    for a, b, weight in edges:
+        neighbours.setdefault(a, Counter())[b] += weight
+        neighbours.setdefault(b, Counter())[a] += weight
+    labels = {node: node for node in neighbours}
+    # 强连接的节点先更新，标签从核心向外扩散
+    order = sorted(neighbours, key=lambda n: (-sum(neighbours[n].values()), n))
+    for _ in range(rounds):
+        changed = False
+        for node in order:
+            votes: Counter = Counter()
+            for other, weight in neighbours[node].items():
+                votes[labels[other]] += weight
+            best = max(votes.values())
+            label = min(lbl for lbl, v in votes.items() if v == best)
+            if label != labels[node]:
+                labels[node] = label
+                changed = True
+        if not changed:
+            break
+    return labels
+
+
+class CooccurrenceGraph:
+    """按时间桶维护的共现矩阵；同一进程内的写入串行进行，避免并发插入同一词对"""
+
+    def __init__(self, bucket_minutes: int, retention: datetime.timedelta):
+        self.bucket_minutes = bucket_minutes
+        self.retention = retention
+        self._lock = asyncio.Lock()
+        self._bucket: datetime.datetime | None = None
+        self.titles = 0
+        self.pairs = 0
+
+    async def record(self, session, titles: list[str], now: datetime.datetime) -> int:
+        """把一轮新话题的共现累加到当前桶，返回更新的词对数"""
+        counts = count_pairs(titles)
+        if not counts:
+            return 0
+        bucket = bucket_of(now, self.bucket_minutes)
+        async with self._lock:
+            if bucket != self._bucket:
+                self._bucket = bucket
+                await session.execute(delete(TermCooccurrence).where(TermCooccurrence.bucket < bucket - self.retention))
+
+            terms = {a for a, _ in counts}
+            result = await session.execute(
+                select(TermCooccurrence).where(TermCooccurrence.bucket == bucket, TermCooccurrence.term_a.in_(terms))
+            )
+            existing = {(row.term_a, row.term_b): row for row in result.scalars()}
+            for (a, b), count in counts.items():
+                row = existing.get((a, b))
+                if row is None:
+                    session.add(TermCooccurrence(bucket=bucket, term_a=a, term_b=b, count=count))
+                else:
+                    row.count += count
+            await session.commit()
+        self.titles += len(titles)
+        self.pairs += len(counts)
+        return len(counts)
+
+    async def window(self, session, since: datetime.datetime, until: datetime.datetime,
+                     limit: int = 100, min_count: int = 2) -> dict:
+        """窗口 [since, until) 内各桶相加后的前 limit 条边、节点与社区"""
+        start, end = bucket_of(since, self.bucket_minutes), as_utc(until)
+        in_window = (TermCooccurrence.bucket >= start, TermCooccurrence.bucket < end)
+        weight = func.sum(TermCooccurrence.count)
+        result = await session.execute(
+            select(TermCooccurrence.term_a, TermCooccurrence.term_b, weight)
+            .where(*in_window, TermCooccurrence.term_a != TermCooccurrence.term_b)
+            .group_by(TermCooccurrence.term_a, TermCooccurrence.term_b)
+            .having(weight >= min_count)
+            .order_by(weight.desc(), TermCooccurrence.term_a, TermCooccurrence.term_b)
+            .limit(limit)
+        )
+        edges = [(a, b, int(w)) for a, b, w in result]
+        terms = {t for a, b, _ in edges for t in (a, b)}
+        frequency: dict[str, int] = {}
+        if terms:
+            result = await session.execute(
+                select(TermCooccurrence.term_a, weight)
+                .where(*in_window, TermCooccurrence.term_a == TermCooccurrence.term_b,
+                       TermCooccurrence.term_a.in_(terms))
+                .group_by(TermCooccurrence.term_a)
+            )
+            frequency = {term: int(count) for term, count in result}
+
+        labels = label_propagation(edges)
+        groups: dict[str, list[str]] = {}
+        for term, label in labels.items():
+            groups.setdefault(label, []).append(term)
+        strength = Counter()
+        for a, b, w in edges:
+            if labels[a] == labels[b]:
+                strength[labels[a]] += w
+        ranked = sorted(groups, key=lambda lbl: (-strength[lbl], -len(groups[lbl]), lbl))
+        community_of = {label: i for i, label in enumerate(ranked)}
+
+        return {
+            "since": start,
+            "until": end,
+            "nodes": sorted(
+                ({"term": t, "count": frequency.get(t, 0), "community": community_of[labels[t]]} for t in terms),
+                key=lambda n: (-n["count"], n["term"]),
+            ),
+            "edges": [
+                {"source": a, "target": b, "weight": w,
+                 # 共现占两词出现总次数的比例（Jaccard），区分高频词之间的偶然共现
+                 "jaccard": round(w / max(frequency.get(a, 0) + frequency.get(b, 0) - w, w), 3)}
+                for a, b, w in edges
+            ],
+            "communities": [
+                {"id": community_of[lbl], "terms": sorted(groups[lbl], key=lambda t: (-frequency.get(t, 0), t)),
+                 "weight": strength[lbl]}
+                for lbl in ranked
+            ],
+        }
+
+    def reset(self) -> None:
+        """清空写入状态；保留同一把锁，正在等待的写入仍然串行"""
+        self._bucket = None
+        self.titles = self.pairs = 0
+
+    def stats(self) -> dict:
+        return {
+            "bucket_minutes": self.bucket_minutes,
+            "current_bucket": self._bucket.isoformat() if self._bucket else None,
+            "titles": self.titles,
+            "pairs": self.pairs,
+        }
+
+
+cooccurrence_graph = CooccurrenceGraph(
+    settings.NETWORK_BUCKET_MINUTES, datetime.timedelta(days=settings.NETWORK_RETENTION_DAYS))
@@ -0,0 +1,134 @@
+"""
+跨平台传播时差
+- 事件（app.events 的在线聚类结果）第一次出现在某个平台时记下该平台的首次出现时间（event_platforms 表）
+- 同时与该事件已出现的每个平台比较：先出现的为 leader，时差计入 (leader, follower) 的增量聚合
+  （事件数、总时差、最大时差、按 LAG_BINS 分区间的计数，propagation_stats 表，行数只与平台对数有关）
+- 同一时刻出现的记为 ties；查询时由聚合直接得到各平台对的时差分布与分位数，不扫描话题或事件明细
+"""
+
+import bisect
+import datetime
+import json
+
+from sqlalchemy import select
+
+from app.dedup import as_utc
+from app.models import EventPlatform, PropagationStat
+
+# 时差区间上界（分钟），最后一个区间无上界
+LAG_BINS = [5, 15, 30, 60, 120, 240, 480, 720, 1440, 2880]
+
+
+def bin_labels() -> list[str]:
+    bounds = [0, *LAG_BINS]
+    return [f"{lo}-{hi}m" for lo, hi in zip(bounds, bounds[1:])] + [f">{LAG_BINS[-1]}m"]
+
+
+def _add_lag(stat: PropagationStat, minutes: float) -> None:
+    histogram = json.loads(stat.histogram)
+    histogram[bisect.bisect_right(LAG_BINS, minutes)] += 1
+    stat.histogram = json.dumps(histogram)
+    stat.count += 1
+    stat.total_minutes += minutes
+    stat.max_minutes = max(stat.max_minutes, minutes)
+
+
+async def record_arrivals(session, arrivals: list[tuple[int, str, int | None]], now: datetime.datetime) -> int:
+    """事件首次出现在新平台：arrivals 为 (event_id, platform, rank)；返回新增的平台对时差数"""
+    if not arrivals:
+        return 0
+    now = as_utc(now)
+    event_ids = {event_id for event_id, _, _ in arrivals}
+    result = await session.execute(select(EventPlatform).where(EventPlatform.event_id.in_(event_ids)))
+    firsts: dict[int, dict[str, datetime.datetime]] = {}
+    for row in result.scalars():
+        firsts.setdefault(row.event_id, {})[row.platform] = as_utc(row.first_seen)
+    stats = {(s.leader, s.follower): s for s in (await session.execute(select(PropagationStat))).scalars()}
+
+    def stat_for(leader: str, follower: str) -> PropagationStat:
+        stat = stats.get((leader, follower))
+        if stat is None:
+            stat = PropagationStat(leader=leader, follower=follower, count=0, ties=0, total_minutes=0.0,
+                                   max_minutes=0.0, histogram=json.dumps([0] * (len(LAG_BINS) + 1)))
+            session.add(stat)
+            stats[(leader, follower)] = stat
+        return stat
+
+    recorded = 0
+    for event_id, platform, rank in arrivals:
+        seen = firsts.setdefault(event_id, {})
+        if platform in seen:
+            continue
+        for other, first_seen in seen.items():
+            minutes = (now - first_seen).total_seconds() / 60
+            if minutes <= 0:
+                stat_for(min(other, platform), max(other, platform)).ties += 1
+            else:
+                _add_lag(stat_for(other, platform), minutes)
+            recorded += 1
+        seen[platform] = now
+        session.add(EventPlatform(event_id=event_id, platform=platform, first_seen=now, first_rank=rank))
+    return recorded
+
+
+def _percentile(histogram: list[int], max_minutes: float, q: float) -> float | None:
+    """由区间计数估计分位数（区间内线性插值，最后一个区间以最大时差为上界）"""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = q * total
+    bounds = [0, *LAG_BINS, max(max_minutes, LAG_BINS[-1])]
+    cumulative = 0
+    for i, count in enumerate(histogram):
+        if count and cumulative + count >= target:
+            lo, hi = bounds[i], min(bounds[i + 1], max_minutes)
+            return round(lo + (hi - lo) * (target - cumulative) / count, 1)
+        cumulative += count
+    return round(max_minutes, 1)
+
+
+def _direction(stat: PropagationStat | None) -> dict:
+    if stat is None or not stat.count:
+        return {"count": 0, "mean_minutes": None, "median_minutes": None, "p90_minutes": None,
+                "max_minutes": None, "histogram": dict.fromkeys(bin_labels(), 0)}
+    histogram = json.loads(stat.histogram)
+    return {
+        "count": stat.count,
+        "mean_minutes": round(stat.total_minutes / stat.count, 1),
+        "median_minutes": _percentile(histogram, stat.max_minutes, 0.5),
+        "p90_minutes": _percentile(histogram, stat.max_minutes, 0.9),
+        "max_minutes": round(stat.max_minutes, 1),
+        "histogram": dict(zip(bin_labels(), histogram)),
+    }
+
+
+def summarize(stats: list[PropagationStat], platform: str | None = None) -> dict:
+    """各平台对（按字典序 a < b）的领先次数、同时出现次数与双向时差分布，以及各平台领先/跟进总数"""
+    by_pair = {(s.leader, s.follower): s for s in stats}
+    pairs = sorted({tuple(sorted(key)) for key in by_pair})
+    out, totals = [], {}
+    for a, b in pairs:
+        forward, backward = by_pair.get((a, b)), by_pair.get((b, a))
+        ties = (forward.ties if forward else 0) + (backward.ties if backward else 0)
+        a_to_b, b_to_a = _direction(forward), _direction(backward)
+        for leader, follower, direction in ((a, b, a_to_b), (b, a, b_to_a)):
+            totals.setdefault(leader, {"leads": 0, "follows": 0, "ties": 0})["leads"] += direction["count"]
+            totals.setdefault(follower, {"leads": 0, "follows": 0, "ties": 0})["follows"] += direction["count"]
+        totals[a]["ties"] += ties
+        totals[b]["ties"] += ties
+        if platform and platform not in (a, b):
+            continue
+        stories = a_to_b["count"] + b_to_a["count"] + ties
+        out.append({
+            "platforms": [a, b],
+            "stories": stories,
+            "ties": ties,
+            # 键为先出现的平台：另一平台跟进的时差分布
+            "lead_times": {a: a_to_b, b: b_to_a},
+        })
+    out.sort(key=lambda p: (-p["stories"], p["platforms"]))
+    platforms = {}
+    for name, t in sorted(totals.items()):
+        decided = t["leads"] + t["follows"]
+        platforms[name] = {**t, "lead_ratio": round(t["leads"] / decided, 3) if decided else None}
+    return {"bins": bin_labels(), "platforms": platforms, "pairs": out}
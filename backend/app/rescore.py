@@ -0,0 +1,225 @@
+"""
+历史数据重新打分
+- 运行时更新 cny_keywords / custom_keywords（或发布新的情感词典）后，已入库行的 is_cny_related、
+  sentiment、sentiment_score 仍是入库时的结果；重新打分任务把历史数据对齐到当前配置
+- 按主键分段读取 hot_topics，每段在进程池中用向量化打分（app.scoring）计算，只对结果变化的行批量 UPDATE
+- 任务与游标保存在 rescore_jobs 表，每段提交后推进；服务重启后从游标继续，配置已再次变化则从头开始
+- 段间让出事件循环并短暂停顿，不阻塞抓取入库与接口查询
+- 情感只在实际生效的后端为 lexicon 时重算，重算后的标签来源记为 lexicon；人工标注的行不改写
+"""
+
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select, update
+
+from app.cache import cache_delete
+from app.config import get_runtime_config, settings
+from app.database import async_session
+from app.models import HotTopic, RescoreJob
+from app.schemas import RescoreJobOut
+
+if TYPE_CHECKING:
+    from app.scoring import ScoringLexicon
+
+logger = logging.getLogger(__name__)
+
+
+def _rescores_sentiment() -> bool:
+    from app.sentiment import sentiment_service
+
+    return sentiment_service.backend.tag[0] == "lexicon"
+
+
+def scoring_fingerprint(with_sentiment: bool) -> str:
+    """当前关键词配置与情感词典的摘要；与已完成任务的摘要不同说明历史数据需要重新打分"""
+    from app.sentiment import (
+        ADVERSATIVE_WORDS, CONCESSIVE_WORDS, DEGREE_WORDS, NEGATION_WORDS, NEGATIVE_WORDS, PLAIN_WORDS, POSITIVE_WORDS,
+    )
+
+    cfg = get_runtime_config()
+    source = {"cny": cfg["cny_keywords"], "custom": cfg["custom_keywords"]}
+    if with_sentiment:
+        source["sentiment"] = [POSITIVE_WORDS, NEGATIVE_WORDS, NEGATION_WORDS, DEGREE_WORDS,
+                               ADVERSATIVE_WORDS, CONCESSIVE_WORDS, PLAIN_WORDS]
+    return hashlib.sha256(json.dumps(source, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+# 打分进程内的词表：随进程池创建时安装，之后每段只传标题
+_worker_lexicon: "ScoringLexicon | None" = None
+
+
+def _install_worker_lexicon(lexicon: "ScoringLexicon") -> None:
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _score_chunk(titles: list[str], lexicon: "ScoringLexicon | None" = None) -> tuple[list[bool], list[tuple[str, float]]]:
+    # numpy / scipy 只在真正打分时加载，不拖慢应用启动
+    from app.scoring import score_titles
+
+    scores = score_titles(titles, lexicon or _worker_lexicon)
+    return scores.cny.tolist(), scores.sentiments
+
+
+def job_out(job: RescoreJob) -> RescoreJobOut:
+    return RescoreJobOut(
+        id=job.id, reason=job.reason, status=job.status, last_id=job.last_id, max_id=job.max_id,
+        total=job.total, scanned=job.scanned, changed=job.changed,
+        progress=round(job.scanned / job.total, 4) if job.total else 1.0,
+        error=job.error, started_at=job.started_at, updated_at=job.updated_at, finished_at=job.finished_at,
+    )
+
+
+class RescoreManager:
+    """同一时间只运行一个重新打分任务；新任务取代正在运行的任务"""
+
+    def __init__(self, chunk: int, workers: int, pause: float):
+        self.chunk = chunk
+        self.workers = workers
+        self.pause = pause
+        self._task: asyncio.Task | None = None
+        self._job_id: int | None = None
+        self.chunks = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, reason: str) -> RescoreJobOut:
+        """从头开始一个新任务；正在运行的任务标记为 superseded"""
+        await self._cancel()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        async with async_session() as session:
+            await session.execute(
+                update(RescoreJob).where(RescoreJob.status == "running").values(status="superseded", updated_at=now))
+            max_id = (await session.execute(select(func.max(HotTopic.id)))).scalar() or 0
+            total = (await session.execute(select(func.count(HotTopic.id)).where(HotTopic.id <= max_id))).scalar()
+            job = RescoreJob(reason=reason, fingerprint=scoring_fingerprint(_rescores_sentiment()), status="running",
+                             last_id=0, max_id=max_id, total=total, scanned=0, changed=0,
+                             started_at=now, updated_at=now)
+            session.add(job)
+            await session.commit()
+            self._launch(job.id)
+            logger.info("Rescore job %d started (%s): %d rows", job.id, reason, total)
+            return job_out(job)
+
+    async def resume(self) -> None:
+        """启动时：继续未完成的任务；配置与上次完成的任务不一致时重新开始"""
+        async with async_session() as session:
+            job = (await session.execute(select(RescoreJob).order_by(RescoreJob.id.desc()).limit(1))).scalar()
+        if job is None:
+            return
+        fingerprint = scoring_fingerprint(_rescores_sentiment())
+        if job.fingerprint != fingerprint:
+            await self.start("startup")
+        elif job.status == "running":
+            logger.info("Resuming rescore job %d from id %d", job.id, job.last_id)
+            self._launch(job.id)
+
+    def _launch(self, job_id: int) -> None:
+        self._job_id = job_id
+        self._task = asyncio.create_task(self._run(job_id))
+
+    async def _cancel(self) -> None:
+        if self.running:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def stop(self) -> None:
+        """停止运行中的任务，游标保留在库中，下次启动继续"""
+        await self._cancel()
+
+    async def _run(self, job_id: int) -> None:
+        from app.scoring import scoring_lexicon
+
+        lexicon = scoring_lexicon()
+        with_sentiment = _rescores_sentiment()
+        pool = None
+        if self.workers > 0:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_install_worker_lexicon,
+                                       initargs=(lexicon,))
+        try:
+            while True:
+                async with async_session() as session:
+                    job = await session.get(RescoreJob, job_id)
+                    if job is None or job.status != "running":
+                        return
+                    result = await session.execute(
+                        select(HotTopic.id, HotTopic.title, HotTopic.is_cny_related,
+                               HotTopic.sentiment, HotTopic.sentiment_score, HotTopic.sentiment_source)
+                        .where(HotTopic.id > job.last_id, HotTopic.id <= job.max_id)
+                        .order_by(HotTopic.id)
+                        .limit(self.chunk)
+                    )
+                    rows = result.all()
+                    if not rows:
+                        now = datetime.datetime.now(datetime.timezone.utc)
+                        job.status, job.updated_at, job.finished_at = "completed", now, now
+                        await session.commit()
+                        logger.info("Rescore job %d completed: %d scanned, %d changed",
+                                    job.id, job.scanned, job.changed)
+                        break
+
+                # 打分期间不占用数据库连接
+                titles = [r.title for r in rows]
+                if pool is None:
+                    cny, sentiments = await asyncio.to_thread(_score_chunk, titles, lexicon)
+                else:
+                    cny, sentiments = await asyncio.get_running_loop().run_in_executor(pool, _score_chunk, titles)
+
+                changes = []
+                for row, is_cny, (label, score) in zip(rows, cny, sentiments):
+                    values = {"is_cny_related": is_cny}
+                    if with_sentiment and row.sentiment_source != "manual":  # 人工标注不覆盖
+                        values.update(sentiment=label, sentiment_score=score, sentiment_source="lexicon")
+                    current = {"is_cny_related": bool(row.is_cny_related), "sentiment": row.sentiment,
+                               "sentiment_score": row.sentiment_score, "sentiment_source": row.sentiment_source}
+                    if any(current[k] != v for k, v in values.items()):
+                        changes.append({"id": row.id, **values})
+
+                # 变化的行与游标在同一事务中提交，中断后从游标继续不会漏行
+                async with async_session() as session:
+                    if changes:
+                        await session.execute(update(HotTopic), changes)  # 按主键批量更新
+                    await session.execute(
+                        update(RescoreJob).where(RescoreJob.id == job_id).values(
+                            last_id=rows[-1].id,
+                            scanned=RescoreJob.scanned + len(rows),
+                            changed=RescoreJob.changed + len(changes),
+                            updated_at=datetime.datetime.now(datetime.timezone.utc),
+                        )
+                    )
+                    await session.commit()
+                self.chunks += 1
+                await asyncio.sleep(self.pause)
+            cache_delete()
+        except Exception as e:
+            logger.error("Rescore job %d failed: %s", job_id, e)
+            async with async_session() as session:
+                await session.execute(update(RescoreJob).where(RescoreJob.id == job_id).values(
+                    status="failed", error=str(e)[:500], updated_at=datetime.datetime.now(datetime.timezone.utc)))
+                await session.commit()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    async def latest(self) -> RescoreJobOut | None:
+        async with async_session() as session:
+            job = (await session.execute(select(RescoreJob).order_by(RescoreJob.id.desc()).limit(1))).scalar()
+        return job_out(job) if job else None
+
+    def stats(self) -> dict:
+        return {"running": self.running, "job_id": self._job_id, "chunks": self.chunks}
+
+
+rescore_manager = RescoreManager(settings.RESCORE_CHUNK, settings.RESCORE_WORKERS, settings.RESCORE_PAUSE_SECONDS)
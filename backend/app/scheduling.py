@@ -0,0 +1,97 @@
+"""
+按平台自适应抓取调度
+- 每个平台一个独立的定时任务
+- 比较相邻两轮榜单：新上榜标题数 + 排名变化数 = 变动率
+- 变动大的平台缩短间隔，变动小的平台拉长间隔，限制在 [min, max] 之间
+"""
+
+import logging
+
+from app.config import get_runtime_config
+
+logger = logging.getLogger(__name__)
+
+# 变动率阈值：高于 HIGH 加速，低于 LOW 减速
+CHURN_HIGH = 0.3
+CHURN_LOW = 0.05
+SPEED_UP = 0.5
+SLOW_DOWN = 1.5
+
+
+def measure_churn(previous: dict[str, int], current: dict[str, int]) -> float:
+    """榜单变动率：(新上榜数 + 排名变化数) / 本轮条数"""
+    if not current:
+        return 0.0
+    new_titles = sum(1 for title in current if title not in previous)
+    rank_moves = sum(1 for title, rank in current.items() if title in previous and previous[title] != rank)
+    return round((new_titles + rank_moves) / len(current), 3)
+
+
+class PlatformSchedule:
+    def __init__(self, minutes: float):
+        self.minutes = minutes
+        self.last_churn: float | None = None
+        self.ranks: dict[str, int] = {}
+
+
+class AdaptiveScheduler:
+    """维护各平台当前抓取间隔和上一轮榜单快照"""
+
+    def __init__(self):
+        self._platforms: dict[str, PlatformSchedule] = {}
+
+    def _bounds(self) -> tuple[float, float]:
+        cfg = get_runtime_config()
+        return cfg["scrape_min_interval_minutes"], cfg["scrape_max_interval_minutes"]
+
+    def _get(self, platform: str) -> PlatformSchedule:
+        if platform not in self._platforms:
+            self._platforms[platform] = PlatformSchedule(get_runtime_config()["scrape_interval_minutes"])
+        return self._platforms[platform]
+
+    def interval(self, platform: str) -> float:
+        return self._get(platform).minutes
+
+    def reset(self) -> None:
+        """基础间隔变更后，各平台从新的基础间隔重新开始适应"""
+        base = get_runtime_config()["scrape_interval_minutes"]
+        for state in self._platforms.values():
+            state.minutes = base
+
+    def observe(self, platform: str, ranks: dict[str, int] | None) -> float:
+        """记录一轮抓取结果并返回新的间隔（分钟）；ranks 为 None 表示榜单未变化"""
+        state = self._get(platform)
+        if ranks is None:
+            churn = 0.0
+        elif not state.ranks:
+            # 首轮没有可比较的快照
+            state.ranks = ranks
+            return state.minutes
+        else:
+            churn = measure_churn(state.ranks, ranks)
+            state.ranks = ranks
+        state.last_churn = churn
+
+        if not get_runtime_config()["adaptive_scheduling"]:
+            return state.minutes
+
+        low, high = self._bounds()
+        minutes = state.minutes
+        if churn >= CHURN_HIGH:
+            minutes *= SPEED_UP
+        elif churn <= CHURN_LOW:
+            minutes *= SLOW_DOWN
+        minutes = round(min(max(minutes, low), high), 2)
+        if minutes != state.minutes:
+            logger.info("[%s] churn=%.2f, interval %.1f -> %.1f min", platform, churn, state.minutes, minutes)
+        state.minutes = minutes
+        return minutes
+
+    def snapshot(self) -> dict:
+        return {
+            p: {"interval_minutes": s.minutes, "last_churn": s.last_churn}
+            for p, s in self._platforms.items()
+        }
+
+
+adaptive_scheduler = AdaptiveScheduler()
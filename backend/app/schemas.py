@@ -107,6 +107,76 @@ class TopicLifecycleOut(BaseModel):
         from_attributes = True
 
 
+# ---- 话题详情（二级抓取） ----
+
+class TopicDetailData(BaseModel):
+    """详情页补充的字段，取不到的保持 None"""
+    hot_value: int | None = None
+    read_count: int | None = None
+    answer_count: int | None = None
+    summary: str | None = None
+
+
+class TopicDetailOut(TopicDetailData):
+    platform: str
+    title: str
+    url: str | None
+    dedup_key: str
+    fetched_at: datetime.datetime
+
+    class Config:
+        from_attributes = True
+
+
+# ---- 事件（跨平台、跨周期聚类） ----
+
+class EventMemberOut(BaseModel):
+    platform: str
+    title: str
+    rank: int | None
+    hot_value: int | None
+    similarity: float | None
+    fetched_at: datetime.datetime
+
+    class Config:
+        from_attributes = True
+
+
+class EventOut(BaseModel):
+    id: int
+    title: str
+    keywords: list[str]
+    platforms: list[str]
+    platform_count: int
+    first_seen: datetime.datetime
+    last_seen: datetime.datetime
+    topic_count: int
+    peak_rank: int | None
+    status: str
+
+
+class EventDetailOut(EventOut):
+    timeline: list[EventMemberOut]
+
+
+# ---- 历史重新打分 ----
+
+class RescoreJobOut(BaseModel):
+    id: int
+    reason: str
+    status: str
+    last_id: int
+    max_id: int
+    total: int
+    scanned: int
+    changed: int
+    progress: float
+    error: str | None = None
+    started_at: datetime.datetime
+    updated_at: datetime.datetime
+    finished_at: datetime.datetime | None = None
+
+
 # ---- 每日报告 ----
 
 class DailyReportOut(BaseModel):
@@ -0,0 +1,225 @@
+"""
+批量关键词打分（NumPy / SciPy 向量化）
+- 词表：春节/自定义关键词、主题分类规则、情感词与情感修饰词，每个词一列
+- 标题编码：字符映射为词表字母表中的编号（不在字母表中的字为 0），长度为 L 的词在每个位置取 L 字 n-gram 的整数键，
+  与词的键比较即得命中位置，累加为 标题 × 词 稀疏计数矩阵（与 Aho-Corasick 一样统计全部重叠命中）
+- 分类、春节标记由计数矩阵乘以各类别的列向量得到；情感只含不互相重叠的情感词、没有否定/程度/转折等修饰词时
+  按 (正面次数 - 负面次数) / 总次数 直接得到，其余含情感词的标题逐条调用词典打分
+- 结果与 _classify_topic / _is_cny_related / analyze_sentiment 逐条计算完全一致
+"""
+
+import functools
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from app.features import OTHER_CATEGORY
+from app.keywords import CNY, NEGATIVE, POSITIVE, CompiledKeywords, keyword_engine
+from app.sentiment import (
+    ADVERSATIVE_WORDS,
+    CONCESSIVE_WORDS,
+    DEGREE_WORDS,
+    NEGATION_WORDS,
+    PLAIN_WORDS,
+    POSITIVE_WORDS,
+    _label,
+    lexicon_backend,
+)
+
+SCORE_CHUNK = 20000  # 每段标题数，限制 n-gram 键数组的内存占用
+KEY_BITS = 63
+
+
+@dataclass
+class BatchScores:
+    categories: list[str]
+    cny: np.ndarray  # bool
+    sentiments: list[tuple[str, float]]
+    fallback: int = 0  # 逐条词典打分的标题数
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """两个词在同一标题中的命中能否重叠（包含，或一个的后缀是另一个的前缀）"""
+    if a != b and (a in b or b in a):
+        return True
+    shortest = min(len(a), len(b))
+    return any(a[-k:] == b[:k] or b[-k:] == a[:k] for k in range(1, shortest if a == b else shortest + 1))
+
+
+class ScoringLexicon:
+    """一个关键词配置版本下的词表与各用途的列向量（纯数据，可传给打分进程）"""
+
+    def __init__(self, compiled: CompiledKeywords, max_gram: int | None = None):
+        modifiers = [*NEGATION_WORDS, *DEGREE_WORDS, *ADVERSATIVE_WORDS, *CONCESSIVE_WORDS, *PLAIN_WORDS]
+        self.terms = list(dict.fromkeys([*compiled.tags, *modifiers]))
+        self.category_names = compiled.category_names
+        self.compiled = compiled  # 回退到逐条词典打分时使用同一版本的自动机
+        column = {term: j for j, term in enumerate(self.terms)}
+        size = len(self.terms)
+
+        self.cny = np.zeros(size, dtype=np.int32)
+        self.positive = np.zeros(size, dtype=np.int32)
+        self.negative = np.zeros(size, dtype=np.int32)
+        self.modifier = np.zeros(size, dtype=np.int32)
+        rows, cols = [], []
+        positive_words = frozenset(POSITIVE_WORDS)
+        for term, tags in compiled.tags.items():
+            j = column[term]
+            for tag in tags:
+                if tag == CNY:
+                    self.cny[j] = 1
+                elif tag in (POSITIVE, NEGATIVE):
+                    # 与词典打分一致：同时在两个词表中的词按正面计
+                    if term in positive_words:
+                        self.positive[j] = 1
+                    else:
+                        self.negative[j] = 1
+                else:
+                    rows.append(j)
+                    cols.append(tag)
+        for term in modifiers:
+            self.modifier[column[term]] = 1
+        self.category_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(size, len(self.category_names)))
+
+        # 可能互相重叠的情感词对：标题中同时出现时需要按最长匹配消解，逐条打分
+        polar = [term for term in self.terms if self.positive[column[term]] or self.negative[column[term]]]
+        self.polar_columns = np.array([column[t] for t in polar], dtype=np.int64)
+        pairs = [(i, k) for i, a in enumerate(polar) for k, b in enumerate(polar) if _overlaps(a, b)]
+        self.polar_conflicts = sparse.csr_matrix(
+            (np.ones(len(pairs), dtype=np.int32), ([i for i, _ in pairs], [k for _, k in pairs])),
+            shape=(len(polar), len(polar)))
+
+        # 字母表与 n-gram 键
+        self.alphabet = np.array(sorted({ord(ch) for term in self.terms for ch in term}), dtype=np.uint32)
+        self.bits = max(len(self.alphabet).bit_length(), 1)
+        # 超过 max_gram 个字的词（如 "DeepSeek"）按片段分别比较
+        self.max_gram = min(KEY_BITS // self.bits, max_gram or KEY_BITS)
+        self._short: dict[int, tuple[np.ndarray, np.ndarray]] = {}  # 长度 → (排好序的词键, 对应列)
+        self._long: list[tuple[int, int, list[tuple[int, int, int]]]] = []  # (列, 长度, [(偏移, 片段长度, 片段键)])
+        short: dict[int, list[tuple[int, int]]] = {}
+        for j, term in enumerate(self.terms):
+            codes = self._codes(term)
+            if len(term) <= self.max_gram:
+                short.setdefault(len(term), []).append((self._key(codes), j))
+            else:
+                pieces = [(off, len(codes[off:off + self.max_gram]), self._key(codes[off:off + self.max_gram]))
+                          for off in range(0, len(term), self.max_gram)]
+                self._long.append((j, len(term), pieces))
+        for length, entries in short.items():
+            entries.sort()
+            self._short[length] = (np.array([k for k, _ in entries], dtype=np.int64),
+                                   np.array([j for _, j in entries], dtype=np.int64))
+        self.gram_lengths = sorted({*self._short, *(p[1] for _, _, pieces in self._long for p in pieces)})
+
+    def _codes(self, text: str) -> list[int]:
+        return [int(np.searchsorted(self.alphabet, ord(ch))) + 1 for ch in text]
+
+    def _key(self, codes: list[int]) -> int:
+        key = 0
+        for code in codes:
+            key = (key << self.bits) | code
+        return key
+
+    def encode(self, titles: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """标题拼接成一维字母表编号数组（标题间以 0 分隔），以及每个位置所属的标题序号"""
+        text = "\0".join(titles) + "\0"
+        points = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        index = np.searchsorted(self.alphabet, points)
+        clipped = np.minimum(index, len(self.alphabet) - 1)
+        codes = np.where(self.alphabet[clipped] == points, index + 1, 0).astype(np.int64)
+        lengths = np.fromiter((len(t) + 1 for t in titles), dtype=np.int64, count=len(titles))
+        title_of = np.repeat(np.arange(len(titles), dtype=np.int64), lengths)
+        return codes, title_of
+
+    def incidence(self, titles: list[str]) -> sparse.csr_matrix:
+        """标题 × 词 命中次数矩阵"""
+        codes, title_of = self.encode(titles)
+        keys: dict[int, np.ndarray] = {}
+        current = None
+        for length in range(1, max(self.gram_lengths, default=0) + 1):
+            # 含 0（分隔符或字母表外的字）的窗口键中有一段为 0，不会等于任何词的键
+            current = codes if current is None else (current[:-1] << self.bits) | codes[length - 1:]
+            if length in self.gram_lengths:
+                keys[length] = current
+
+        rows, cols = [], []
+        for length, (term_keys, term_cols) in self._short.items():
+            gram = keys[length]
+            position = np.minimum(np.searchsorted(term_keys, gram), len(term_keys) - 1)
+            hit = term_keys[position] == gram
+            rows.append(title_of[:len(gram)][hit])
+            cols.append(term_cols[position[hit]])
+        for j, length, pieces in self._long:
+            count = len(codes) - length + 1
+            if count <= 0:
+                continue
+            hit = np.ones(count, dtype=bool)
+            for offset, piece_length, piece_key in pieces:
+                hit &= keys[piece_length][offset:offset + count] == piece_key
+            rows.append(title_of[:count][hit])
+            cols.append(np.full(int(hit.sum()), j, dtype=np.int64))
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(titles), len(self.terms)))
+
+    def score(self, titles: list[str]) -> BatchScores:
+        """一段标题的分类、春节标记与词典情感"""
+        counts = self.incidence(titles)
+
+        cny = (counts @ self.cny) > 0
+        hits = (counts @ self.category_matrix).toarray() > 0
+        first = np.where(hits.any(axis=1), hits.argmax(axis=1), len(self.category_names))
+        names = [*self.category_names, OTHER_CATEGORY]
+        categories = [names[i] for i in first.tolist()]
+
+        positive = counts @ self.positive
+        negative = counts @ self.negative
+        polar = (positive + negative) > 0
+        modified = (counts @ self.modifier) > 0
+        present = (counts[:, self.polar_columns] > 0).astype(np.int32)
+        conflicted = np.asarray((present @ self.polar_conflicts).multiply(present).sum(axis=1)).ravel() > 0
+        exact = polar & ~modified & ~conflicted
+        fallback = polar & ~exact
+
+        sentiments: list[tuple[str, float]] = [("neutral", 0.0)] * len(titles)
+        # 情感词互不重叠且无修饰词：每次命中权重 ±1，按 (正面, 负面) 次数组合取值
+        pairs = np.stack([positive[exact], negative[exact]], axis=1)
+        if len(pairs):
+            unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+            labels = [_label(float(p - n) / max(float(p + n), 1.0)) for p, n in unique.tolist()]
+            for i, u in zip(np.flatnonzero(exact).tolist(), inverse.ravel().tolist()):
+                sentiments[i] = labels[u]
+        for i in np.flatnonzero(fallback).tolist():
+            sentiments[i] = lexicon_backend.score_title(titles[i], self.compiled)
+        return BatchScores(categories, cny, sentiments, int(fallback.sum()))
+
+
+@functools.lru_cache(maxsize=4)
+def _lexicon_for(compiled: CompiledKeywords) -> ScoringLexicon:
+    return ScoringLexicon(compiled)
+
+
+def scoring_lexicon() -> ScoringLexicon:
+    """当前关键词配置下的词表；配置更新后自动重建"""
+    return _lexicon_for(keyword_engine.compiled())
+
+
+def score_titles(titles: list[str], lexicon: ScoringLexicon | None = None) -> BatchScores:
+    """批量计算分类、春节标记与词典情感，按 SCORE_CHUNK 分段"""
+    lexicon = lexicon or scoring_lexicon()
+    parts = [lexicon.score(titles[i:i + SCORE_CHUNK]) for i in range(0, len(titles), SCORE_CHUNK)]
+    if not parts:
+        return BatchScores([], np.zeros(0, dtype=bool), [])
+    return BatchScores(
+        [c for p in parts for c in p.categories],
+        np.concatenate([p.cny for p in parts]),
+        [s for p in parts for s in p.sentiments],
+        sum(p.fallback for p in parts),
+    )
@@ -1,7 +1,12 @@
 import httpx
-from bs4 import BeautifulSoup
 from app.schemas import HotTopicCreate
 from app.scrapers.base import BaseScraper
+from app.scrapers.parsing import NodeQuery, has_class
+
+BOARD_TITLES = NodeQuery(
+    css=".c-single-text-ellipsis",
+    xpath=f"//*[{has_class('c-single-text-ellipsis')}]",
+)
 
 
 class BaiduScraper(BaseScraper):
@@ -11,15 +16,13 @@ class BaiduScraper(BaseScraper):
 
     async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
         url = "https://top.baidu.com/board?tab=realtime"
-        resp = await client.get(url)
-        resp.raise_for_status()
+        resp = await self._get_list(client, url)
 
-        soup = BeautifulSoup(resp.text, "html.parser")
         topics: list[HotTopicCreate] = []
 
-        items = soup.select(".c-single-text-ellipsis")
+        items = self._extract(resp, BOARD_TITLES)
         for i, item in enumerate(items[:50], start=1):
-            title = item.get_text(strip=True)
+            title = item.text
             if not title:
                 continue
             topics.append(
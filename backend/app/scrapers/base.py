@@ -1,17 +1,23 @@
 import abc
 import asyncio
+import contextvars
+import hashlib
 import logging
-import os
 import random
+import time
 import httpx
-from app.config import get_effective_keywords
-from app.schemas import HotTopicCreate
+from app.config import settings
+from app.keywords import keyword_engine
+from app.schemas import HotTopicCreate, HotTopicOut, TopicDetailData
+from app.scrapers.breaker import CircuitBreaker, CircuitOpen
+from app.scrapers.http_pool import client_pool
+from app.scrapers.proxy_pool import proxy_pool
+from app.scrapers.details import extract_counts
+from app.scrapers.parsing import META_DESCRIPTION, PAGE_TEXT, Node, NodeQuery, get_extractor
+from app.scrapers.tophub import tophub_source
 
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
-RETRY_BACKOFF = [2, 5, 10]
-
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -22,13 +28,35 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0",
 ]
 
-PROXY_URL = os.getenv("PROXY_URL", None)  # e.g. http://proxy:8080
+# 当前正在执行的数据源名（多数据源并发请求时区分各自的待提交指纹）
+current_source: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_source", default=None)
+
+
+# 详情等后台请求在主机限速中为列表请求预留的令牌数
+BACKGROUND_REQUEST = {"rate_limit_reserve": 1}
+
+
+class PayloadUnchanged(Exception):
+    """上游榜单与上一轮相同（304 或内容指纹一致），本轮无需解析入库"""
 
 
 class BaseScraper(abc.ABC):
-    """爬虫基类，含 UA 轮换、代理支持、指数退避重试"""
+    """爬虫基类，含 UA 轮换、代理池出口、熔断、长连接复用、条件请求"""
 
     platform: str = ""
+    html_parser: str = "lxml"  # HTML 解析后端，见 app.scrapers.parsing
+
+    def __init__(self):
+        # url -> 条件请求头（If-None-Match / If-Modified-Since）
+        self._validators: dict[str, dict[str, str]] = {}
+        # url -> 上一轮成功解析的响应内容指纹
+        self._fingerprints: dict[str, str] = {}
+        # 本轮已请求、待解析成功后才提交的 (指纹, 条件请求头, 数据源)
+        self._pending: dict[str, tuple[str, dict[str, str], str | None]] = {}
+        # 失败不在周期内阻塞重试，由熔断器决定后续周期是否继续请求
+        self.breaker = CircuitBreaker(settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RECOVERY_SECONDS)
+        # 本轮抓取使用的出口代理（None 为直连），由代理池按平台粘性分配
+        self._proxy: str | None = None
 
     def _get_headers(self) -> dict:
         return {
@@ -37,38 +65,157 @@ class BaseScraper(abc.ABC):
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
         }
 
+    def _extract(self, resp: httpx.Response, query: NodeQuery) -> list[Node]:
+        """按本爬虫选定的解析后端，从响应字节中抽取节点"""
+        return get_extractor(self.html_parser).extract(resp.content, query, resp.charset_encoding)
+
     def _is_cny_related(self, title: str) -> bool:
-        return any(kw in title for kw in get_effective_keywords())
+        return keyword_engine.match(title).cny
+
+    async def _get_list(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        """请求榜单数据：携带条件请求头，命中 304 或内容指纹未变时抛出 PayloadUnchanged"""
+        key = str(httpx.URL(url, params=kwargs.get("params")))
+        headers = {**(kwargs.pop("headers", None) or {}), **self._validators.get(key, {})}
+        resp = await client.get(url, headers=headers, **kwargs)
+        if resp.status_code == 304:
+            raise PayloadUnchanged(key)
+        resp.raise_for_status()
+
+        validators = {}
+        if resp.headers.get("ETag"):
+            validators["If-None-Match"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+        self._track_payload(key, hashlib.sha1(resp.content).hexdigest(), validators)
+        return resp
+
+    async def _get_tophub(self, url: str) -> list[Node]:
+        """经共享 Tophub 数据源获取聚合页链接节点（请求合并 + 短时缓存）"""
+        page = await tophub_source.get(url, headers=self._get_headers(), proxy=self._proxy)
+        # 条件请求由共享数据源负责，这里只按内容指纹判断本平台是否有变化
+        self._track_payload(url, page.digest, {})
+        return list(page.nodes)
+
+    def _track_payload(self, key: str, digest: str, validators: dict[str, str]) -> None:
+        """内容指纹与上一轮一致时抛出 PayloadUnchanged，否则记为待提交"""
+        if self._fingerprints.get(key) == digest:
+            raise PayloadUnchanged(key)
+        self._pending[key] = (digest, validators, current_source.get())
+
+    def _discard_pending(self, keep_source: str | None = None) -> None:
+        """丢弃未被采用的数据源的响应指纹，避免把无效响应记为基线"""
+        self._pending = {k: v for k, v in self._pending.items() if keep_source and v[2] == keep_source}
+
+    def _commit_pending(self) -> None:
+        for key, (digest, validators, _) in self._pending.items():
+            self._fingerprints[key] = digest
+            if validators:
+                self._validators[key] = validators
+            else:
+                self._validators.pop(key, None)
+        self._pending.clear()
+
+    def forget_payloads(self) -> None:
+        """清除指纹和条件请求头，下一轮强制完整抓取（如关键词配置变更后）"""
+        self._validators.clear()
+        self._fingerprints.clear()
+        self._pending.clear()
 
     async def fetch(self) -> list[HotTopicCreate]:
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                proxy = PROXY_URL if PROXY_URL else None
-                async with httpx.AsyncClient(
-                    headers=self._get_headers(),
-                    timeout=20,
-                    follow_redirects=True,
-                    proxy=proxy,
-                ) as client:
-                    result = await self._parse(client)
-                    if result:
-                        if attempt > 0:
-                            logger.info("[%s] succeeded on retry #%d", self.platform, attempt)
-                        return result
-                    return []
-            except Exception as e:
-                last_error = e
-                if attempt < MAX_RETRIES - 1:
-                    wait = RETRY_BACKOFF[attempt]
-                    logger.warning(
-                        "[%s] attempt %d/%d failed: %s, retrying in %ds...",
-                        self.platform, attempt + 1, MAX_RETRIES, e, wait,
-                    )
-                    await asyncio.sleep(wait)
-        logger.error("[%s] all %d attempts failed: %s", self.platform, MAX_RETRIES, last_error)
-        return []
+        """抓取一次；熔断打开时抛出 CircuitOpen，失败时抛出原始异常，留待后续周期重试"""
+        if not self.breaker.allow():
+            raise CircuitOpen(f"{self.platform} circuit open, retry in {self.breaker.retry_in()}s")
+        try:
+            lease = await proxy_pool.acquire(self.platform)
+        except BaseException:
+            # 没有可用代理或等待代理时被取消：本轮未发出请求，归还熔断器的放行名额
+            self.breaker.cancel()
+            raise
+
+        self._proxy = lease.url
+        started = time.perf_counter()
+        self._pending.clear()
+        error: BaseException | None = None
+        try:
+            client = client_pool.get(self.platform, proxy=lease.url)
+            # 每轮轮换 UA，连接与 Cookie 保持不变
+            client.headers.update(self._get_headers())
+            result = await self._parse(client)
+            if not result:
+                raise ValueError("no topics parsed")
+        except PayloadUnchanged:
+            self.breaker.record_success()
+            logger.info("[%s] hot list unchanged since last cycle", self.platform)
+            raise
+        except Exception as e:
+            error = e
+            self.breaker.record_failure(e)
+            if isinstance(e, httpx.TransportError):
+                # 连接层错误：丢弃可能已损坏的连接，下次重建
+                await client_pool.reset(self.platform)
+            logger.warning("[%s] fetch failed (circuit %s): %s", self.platform, self.breaker.state, e)
+            raise
+        except asyncio.CancelledError as e:
+            # 超过本轮截止时间被取消：计一次失败，避免半开探测标记一直占用；代理得分不受影响
+            error = e
+            self.breaker.record_failure(TimeoutError("fetch cancelled at cycle deadline"))
+            self._pending.clear()
+            raise
+        finally:
+            lease.release(error)
+            client_pool.record_cycle(self.platform, time.perf_counter() - started)
+
+        self._commit_pending()
+        self.breaker.record_success()
+        return result
 
     @abc.abstractmethod
     async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
         ...
+
+    async def _get_json_direct(self, url: str, headers: dict | None = None) -> dict:
+        """快速通道请求：不走条件请求（不影响常规抓取的指纹），不计入熔断器；仍经过代理池与主机限速"""
+        lease = await proxy_pool.acquire(self.platform)
+        error: BaseException | None = None
+        try:
+            client = client_pool.get(self.platform, proxy=lease.url)
+            resp = await client.get(url, headers=headers)
+            resp.raise_for_status()
+            return resp.json()
+        except (Exception, asyncio.CancelledError) as e:
+            error = e
+            raise
+        finally:
+            lease.release(error)
+
+    async def _get_detail(self, url: str, **kwargs) -> httpx.Response:
+        """详情请求：与列表请求一样占用代理名额并回报结果，按后台请求限速"""
+        lease = await proxy_pool.acquire(self.platform)
+        error: BaseException | None = None
+        try:
+            client = client_pool.get(self.platform, proxy=lease.url)
+            resp = await client.get(url, extensions=BACKGROUND_REQUEST, **kwargs)
+            resp.raise_for_status()
+            return resp
+        except (Exception, asyncio.CancelledError) as e:
+            error = e
+            raise
+        finally:
+            lease.release(error)
+
+    async def fetch_detail(self, topic: HotTopicOut) -> TopicDetailData | None:
+        """二级抓取：打开话题链接，补充热度、阅读/回答数和摘要；子类可改用平台接口"""
+        if not topic.url:
+            return None
+        resp = await self._get_detail(topic.url)
+        summary = next((n.text for n in self._extract(resp, META_DESCRIPTION) if n.text), None)
+        text = " ".join(n.text for n in self._extract(resp, PAGE_TEXT))
+        return TopicDetailData(summary=summary, **extract_counts(text))
+
+
+class FastLaneMixin(abc.ABC):
+    """有廉价 JSON 榜单接口、可供快速通道高频轮询榜首的平台混入此类"""
+
+    @abc.abstractmethod
+    async def fetch_top(self, limit: int) -> list[HotTopicCreate]:
+        """只取榜单前 limit 条；不走条件请求、不计入熔断器（见 _get_json_direct）"""
@@ -0,0 +1,80 @@
+"""
+按平台的熔断器
+- closed   : 正常抓取，连续失败达到阈值后打开
+- open     : 直接跳过该平台，不再在抓取周期内等待重试
+- half_open: 冷却时间过后放行一次探测请求，成功则关闭，失败则重新打开
+"""
+
+import datetime
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """熔断器处于打开状态，本轮跳过该平台"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 3, recovery_seconds: float = 300):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self.recent_failures: deque[dict] = deque(maxlen=10)
+
+    def allow(self) -> bool:
+        """本轮是否允许请求；打开状态冷却结束后转为半开并放行一次探测"""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_seconds:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+        return self.state == CLOSED
+
+    def cancel(self) -> None:
+        """放行后未实际发出请求（如没有可用代理），归还半开探测名额"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.total_successes += 1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self, error: BaseException) -> None:
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self.recent_failures.append({
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "error": str(error) or type(error).__name__,
+        })
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def retry_in(self) -> float | None:
+        if self.state != OPEN:
+            return None
+        return max(0.0, round(self.recovery_seconds - (time.monotonic() - self.opened_at), 1))
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_successes": self.total_successes,
+            "retry_in_seconds": self.retry_in(),
+            "recent_failures": list(self.recent_failures),
+        }
@@ -0,0 +1,280 @@
+"""
+话题详情二级抓取
+- 每轮列表入库后，取各平台 Top N 话题进入有界优先队列：新上榜 > 排名上升 > 其他，同级按排名
+- 固定数量的后台 worker 抓取详情页，补充热度、阅读/回答数和摘要
+- 跨周期去重：刷新窗口内已抓过的话题直接复用上次结果
+- 每批有时间预算，超时未处理的任务丢弃；队列满时丢弃新任务
+- 完全在后台运行，不阻塞列表抓取；详情请求在主机限速中预留令牌给列表请求
+"""
+
+import asyncio
+import datetime
+import itertools
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+
+from app.config import get_runtime_config, settings
+from app.dedup import make_dedup_key
+from app.schemas import HotTopicOut, TopicDetailData
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_NEW = 0
+PRIORITY_RISING = 1
+PRIORITY_OTHER = 2
+MAX_DB_INT = 2**31 - 1  # hot_topics.hot_value 为 32 位整数
+
+_NUMBER = r"(\d[\d,]*(?:\.\d+)?)\s*(万|亿)?"
+COUNT_PATTERNS: dict[str, list[re.Pattern]] = {
+    "hot_value": [re.compile(r"(?:热度|热搜指数|热力值)[:：\s]*" + _NUMBER), re.compile(_NUMBER + r"\s*热度")],
+    "read_count": [re.compile(r"(?:阅读|浏览)(?:量|数|次数)?[:：\s]*" + _NUMBER),
+                   re.compile(_NUMBER + r"\s*(?:次)?(?:阅读|浏览)")],
+    "answer_count": [re.compile(r"(?:回答|讨论|评论)(?:数)?[:：\s]*" + _NUMBER),
+                     re.compile(_NUMBER + r"\s*(?:个|条)?(?:回答|讨论|评论)")],
+}
+
+
+def parse_count(number: str, unit: str | None = None) -> int:
+    """"2.1" + "亿" -> 210000000；"12,345" -> 12345"""
+    value = float(number.replace(",", ""))
+    return int(value * {"万": 10_000, "亿": 100_000_000}.get(unit or "", 1))
+
+
+def extract_counts(text: str) -> dict[str, int]:
+    """从详情页正文中按中文计数写法提取热度、阅读数、回答数"""
+    counts = {}
+    for name, patterns in COUNT_PATTERNS.items():
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                counts[name] = parse_count(*match.groups())
+                break
+    return counts
+
+
+@dataclass
+class DetailBatch:
+    """一个平台一轮的详情任务"""
+    platform: str
+    topics: list[HotTopicOut]
+    deadline: float
+    defer_spikes: bool = False  # 列表无热度，热度突增检测等详情补齐后再做
+    pending: int = 0
+    results: dict[str, TopicDetailData] = field(default_factory=dict)
+    fresh: set[str] = field(default_factory=set)  # 本批实际抓取（非复用）的话题
+
+
+@dataclass(order=True)
+class DetailJob:
+    priority: tuple[int, int]
+    seq: int
+    topic: HotTopicOut = field(compare=False)
+    scraper: object = field(compare=False)
+    batch: DetailBatch = field(compare=False)
+
+
+class DetailCrawler:
+    """有界并发的详情抓取队列"""
+
+    def __init__(self):
+        self._queue: asyncio.PriorityQueue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._seq = itertools.count()
+        self._queued: set[str] = set()
+        self._finishing: set[asyncio.Task] = set()
+        # dedup_key -> (抓取时间, 结果)，刷新窗口内复用
+        self._recent: dict[str, tuple[float, TopicDetailData]] = {}
+        self._stats = {"submitted": 0, "fetched": 0, "reused": 0, "failed": 0, "expired": 0, "dropped": 0}
+        # 每批完成后的回调：callback(batch)，用于延后的热度突增检测
+        self.on_batch_done = None
+
+    @property
+    def enabled(self) -> bool:
+        return get_runtime_config()["detail_enabled"]
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue(maxsize=settings.DETAIL_QUEUE_SIZE)
+        self._queued.clear()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(settings.DETAIL_CONCURRENCY)]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    async def join(self) -> None:
+        """等待已提交的任务全部处理完（测试/基准用）"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def submit(self, scraper, topics: list[HotTopicOut], previous: list[HotTopicOut]) -> DetailBatch | None:
+        """提交一个平台本轮的 Top N 话题，立即返回，不等待抓取"""
+        if not self.enabled or not topics:
+            return None
+        self._ensure_workers()
+        top_n = get_runtime_config()["detail_top_n"]
+        selected = sorted(topics, key=lambda t: t.rank)[:top_n]
+        batch = DetailBatch(
+            platform=scraper.platform,
+            topics=selected,
+            deadline=time.monotonic() + settings.DETAIL_BUDGET_SECONDS,
+            defer_spikes=all(t.hot_value is None for t in topics),
+        )
+        previous_ranks = {t.title: t.rank for t in previous}
+        refresh = settings.DETAIL_REFRESH_MINUTES * 60
+
+        for topic in selected:
+            key = topic.dedup_key or make_dedup_key(topic.platform, topic.title)
+            recent = self._recent.get(key)
+            if recent and time.monotonic() - recent[0] < refresh:
+                batch.results[key] = recent[1]
+                self._stats["reused"] += 1
+                continue
+            if key in self._queued:
+                continue
+            if topic.title not in previous_ranks:
+                tier = PRIORITY_NEW
+            elif topic.rank < previous_ranks[topic.title]:
+                tier = PRIORITY_RISING
+            else:
+                tier = PRIORITY_OTHER
+            try:
+                self._queue.put_nowait(DetailJob((tier, topic.rank), next(self._seq), topic, scraper, batch))
+            except asyncio.QueueFull:
+                self._stats["dropped"] += 1
+                continue
+            self._queued.add(key)
+            batch.pending += 1
+            self._stats["submitted"] += 1
+
+        if batch.pending == 0:
+            task = self._loop.create_task(self._finish(batch))
+            self._finishing.add(task)
+            task.add_done_callback(self._finishing.discard)
+        return batch
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception as e:  # worker 不因单个任务异常退出
+                logger.warning("[%s] detail job crashed: %s", job.batch.platform, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: DetailJob) -> None:
+        batch = job.batch
+        key = job.topic.dedup_key or make_dedup_key(job.topic.platform, job.topic.title)
+        try:
+            remaining = batch.deadline - time.monotonic()
+            if remaining <= 0:
+                self._stats["expired"] += 1
+                return
+            try:
+                data = await asyncio.wait_for(job.scraper.fetch_detail(job.topic), timeout=remaining)
+            except asyncio.TimeoutError:
+                self._stats["expired"] += 1
+                return
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.debug("[%s] detail fetch failed for %s: %s", batch.platform, job.topic.title, e)
+                return
+            if data is not None:
+                batch.results[key] = data
+                batch.fresh.add(key)
+                self._recent[key] = (time.monotonic(), data)
+                self._stats["fetched"] += 1
+        finally:
+            self._queued.discard(key)
+            batch.pending -= 1
+            if batch.pending == 0:
+                await self._finish(batch)
+
+    async def _finish(self, batch: DetailBatch) -> None:
+        """保存本批详情，回填缺失的热度，并触发回调"""
+        self._prune()
+        if batch.results:
+            try:
+                await save_details(batch)
+            except Exception as e:
+                logger.error("[%s] failed to save topic details: %s", batch.platform, e)
+        if self.on_batch_done is not None:
+            try:
+                await self.on_batch_done(batch)
+            except Exception as e:
+                logger.error("[%s] detail batch callback failed: %s", batch.platform, e)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - settings.DETAIL_REFRESH_MINUTES * 60
+        self._recent = {k: v for k, v in self._recent.items() if v[0] >= cutoff}
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "cached": len(self._recent),
+            **self._stats,
+        }
+
+
+def enriched_topics(batch: DetailBatch) -> list[HotTopicOut]:
+    """用详情热度补齐列表缺失的 hot_value"""
+    topics = []
+    for topic in batch.topics:
+        data = batch.results.get(topic.dedup_key or make_dedup_key(topic.platform, topic.title))
+        if topic.hot_value is None and data is not None and data.hot_value is not None:
+            topic = topic.model_copy(update={"hot_value": min(data.hot_value, MAX_DB_INT)})
+        topics.append(topic)
+    return topics
+
+
+async def save_details(batch: DetailBatch) -> None:
+    from sqlalchemy import select, update
+
+    from app.database import async_session
+    from app.models import HotTopic, TopicDetail
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    by_key = {t.dedup_key or make_dedup_key(t.platform, t.title): t for t in batch.topics}
+    async with async_session() as session:
+        existing = {
+            d.dedup_key: d for d in (await session.execute(
+                select(TopicDetail).where(TopicDetail.dedup_key.in_(list(batch.fresh)))
+            )).scalars()
+        }
+        for key, data in batch.results.items():
+            topic = by_key[key]
+            if key in batch.fresh:
+                row = existing.get(key)
+                if row is None:
+                    row = TopicDetail(platform=topic.platform, title=topic.title, dedup_key=key)
+                    session.add(row)
+                row.url = topic.url
+                row.hot_value = data.hot_value
+                row.read_count = data.read_count
+                row.answer_count = data.answer_count
+                row.summary = data.summary
+                row.fetched_at = now
+            # 复用的详情同样回填本轮新入库记录的热度
+            if topic.hot_value is None and data.hot_value is not None:
+                await session.execute(
+                    update(HotTopic)
+                    .where(HotTopic.id == topic.id, HotTopic.hot_value.is_(None))
+                    .values(hot_value=min(data.hot_value, MAX_DB_INT))
+                )
+        await session.commit()
+    logger.info("[%s] enriched %d topic details (%d fetched)", batch.platform, len(batch.results), len(batch.fresh))
+
+
+detail_crawler = DetailCrawler()
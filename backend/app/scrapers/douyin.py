@@ -1,68 +1,67 @@
 import httpx
 from app.schemas import HotTopicCreate
-from app.scrapers.base import BaseScraper
+from app.scrapers.base import FastLaneMixin
+from app.scrapers.multisource import MultiSourceScraper
 
+HOT_SEARCH_URL = "https://www.douyin.com/aweme/v1/web/hot/search/list/"
 
-class DouyinScraper(BaseScraper):
+
+class DouyinScraper(FastLaneMixin, MultiSourceScraper):
     """抖音热搜爬虫 - 使用第三方聚合 API 作为备选"""
 
     platform = "douyin"
+    sources = ("official", "tophub")
 
-    async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
-        topics: list[HotTopicCreate] = []
+    def _official_headers(self) -> dict:
+        return {**self._get_headers(), "Referer": "https://www.douyin.com/"}
 
-        # 方式1: 尝试抖音官方接口
-        try:
-            url = "https://www.douyin.com/aweme/v1/web/hot/search/list/"
-            headers = {**self._get_headers(), "Referer": "https://www.douyin.com/"}
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-            word_list = data.get("data", {}).get("word_list", [])
-            for i, item in enumerate(word_list[:50], start=1):
-                title = item.get("word", "")
-                if not title:
-                    continue
-                topics.append(
-                    HotTopicCreate(
-                        platform=self.platform,
-                        title=title,
-                        url=f"https://www.douyin.com/search/{title}",
-                        rank=i,
-                        hot_value=item.get("hot_value"),
-                        category=item.get("word_type_str"),
-                        is_cny_related=self._is_cny_related(title),
-                    )
-                )
-            if topics:
-                return topics
-        except Exception:
-            pass
+    async def _source_official(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        """方式1: 抖音官方接口"""
+        resp = await self._get_list(client, HOT_SEARCH_URL, headers=self._official_headers())
+        return self._topics_from_json(resp.json())
 
-        # 方式2: 使用 Tophub 聚合热搜
-        try:
-            from bs4 import BeautifulSoup
+    async def fetch_top(self, limit: int) -> list[HotTopicCreate]:
+        """快速通道只用官方接口，Tophub 页面较重且有共享缓存，不适合高频轮询"""
+        data = await self._get_json_direct(HOT_SEARCH_URL, headers=self._official_headers())
+        return self._topics_from_json(data, limit)
 
-            resp = await client.get("https://tophub.today/n/DpQvNABoNE")
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            items = soup.select("table tr td a")
-            for i, item in enumerate(items[:50], start=1):
-                title = item.get_text(strip=True)
-                if not title:
-                    continue
-                topics.append(
-                    HotTopicCreate(
-                        platform=self.platform,
-                        title=title,
-                        url=f"https://www.douyin.com/search/{title}",
-                        rank=i,
-                        hot_value=None,
-                        category=None,
-                        is_cny_related=self._is_cny_related(title),
-                    )
+    def _topics_from_json(self, data: dict, limit: int = 50) -> list[HotTopicCreate]:
+        topics: list[HotTopicCreate] = []
+        word_list = data.get("data", {}).get("word_list", [])
+        for i, item in enumerate(word_list[:limit], start=1):
+            title = item.get("word", "")
+            if not title:
+                continue
+            topics.append(
+                HotTopicCreate(
+                    platform=self.platform,
+                    title=title,
+                    url=f"https://www.douyin.com/search/{title}",
+                    rank=i,
+                    hot_value=item.get("hot_value"),
+                    category=item.get("word_type_str"),
+                    is_cny_related=self._is_cny_related(title),
                 )
-        except Exception:
-            pass
+            )
+        return topics
 
+    async def _source_tophub(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        """方式2: 使用 Tophub 聚合热搜"""
+        topics: list[HotTopicCreate] = []
+        items = await self._get_tophub("https://tophub.today/n/DpQvNABoNE")
+        for i, item in enumerate(items[:50], start=1):
+            title = item.text
+            if not title:
+                continue
+            topics.append(
+                HotTopicCreate(
+                    platform=self.platform,
+                    title=title,
+                    url=f"https://www.douyin.com/search/{title}",
+                    rank=i,
+                    hot_value=None,
+                    category=None,
+                    is_cny_related=self._is_cny_related(title),
+                )
+            )
         return topics
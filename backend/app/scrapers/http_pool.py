@@ -0,0 +1,152 @@
+"""
+爬虫 HTTP 连接池
+- 每个平台（及其出口代理）一个进程级长连接 httpx.AsyncClient，跨抓取周期复用 TCP/TLS 连接
+- 可选 HTTP/2（需安装 h2），自动协商 gzip/brotli 压缩
+- Cookie 保存在客户端内，周期之间不丢失
+- 所有请求经过按主机的共享限速（见 ratelimit.py）
+- 统计各平台请求数、线上传输字节数、建连次数和最近一轮耗时
+"""
+
+import importlib.util
+import logging
+
+import httpx
+
+from app.config import settings
+from app.scrapers.ratelimit import RateLimitedTransport
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _accept_encoding() -> str:
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """包装响应流，按压缩前的线上字节计数"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, stats: dict):
+        self._stream = stream
+        self._stats = stats
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._stats["bytes_downloaded"] += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """统计请求数与下载字节数的传输层包装"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, stats: dict):
+        self._inner = inner
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats["requests"] += 1
+        resp = await self._inner.handle_async_request(request)
+        return httpx.Response(
+            status_code=resp.status_code,
+            headers=resp.headers,
+            stream=_CountingStream(resp.stream, self._stats),
+            extensions=resp.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class ScraperClientPool:
+    """按平台管理长连接客户端，在 FastAPI lifespan 中打开和关闭"""
+
+    def __init__(self):
+        # (平台, 代理) -> 客户端；平台换用代理时新建客户端，旧客户端留到 reset/close
+        self._clients: dict[tuple[str, str | None], httpx.AsyncClient] = {}
+        self._stats: dict[str, dict] = {}
+        self._transport_factory = None
+        self.http2 = settings.SCRAPE_HTTP2 and _http2_available()
+
+    def set_transport_factory(self, factory) -> None:
+        """替换底层传输（测试/回放用），factory(platform) -> AsyncBaseTransport"""
+        self._transport_factory = factory
+
+    def _platform_stats(self, platform: str) -> dict:
+        return self._stats.setdefault(platform, {
+            "requests": 0,
+            "bytes_downloaded": 0,
+            "clients_opened": 0,
+            "last_cycle_ms": None,
+        })
+
+    def _build_transport(self, platform: str, proxy: str | None) -> httpx.AsyncBaseTransport:
+        if self._transport_factory is not None:
+            return self._transport_factory(platform)
+        return self.default_transport(proxy)
+
+    def default_transport(self, proxy: str | None = None) -> httpx.AsyncHTTPTransport:
+        """真实网络传输（录制时作为内层传输）"""
+        return httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            proxy=proxy,
+            limits=httpx.Limits(
+                max_connections=settings.SCRAPE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SCRAPE_MAX_CONNECTIONS,
+                keepalive_expiry=settings.SCRAPE_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    def get(self, platform: str, proxy: str | None = None) -> httpx.AsyncClient:
+        """获取平台经指定代理出口的客户端，不存在时创建"""
+        client = self._clients.get((platform, proxy))
+        if client is not None and not client.is_closed:
+            return client
+
+        stats = self._platform_stats(platform)
+        client = httpx.AsyncClient(
+            headers={"Accept-Encoding": _accept_encoding()},
+            timeout=settings.SCRAPE_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            transport=_CountingTransport(RateLimitedTransport(self._build_transport(platform, proxy)), stats),
+        )
+        stats["clients_opened"] += 1
+        self._clients[(platform, proxy)] = client
+        logger.info("[%s] opened pooled HTTP client (http2=%s, proxy=%s)", platform, self.http2, proxy is not None)
+        return client
+
+    def open(self, platforms: list[str]) -> None:
+        """为启用的平台预先创建客户端"""
+        for platform in platforms:
+            self.get(platform)
+
+    def record_cycle(self, platform: str, elapsed: float) -> None:
+        self._platform_stats(platform)["last_cycle_ms"] = round(elapsed * 1000, 1)
+
+    async def reset(self, platform: str) -> None:
+        """关闭并丢弃某平台的全部客户端（连接或 Cookie 失效时）"""
+        for key in [k for k in self._clients if k[0] == platform]:
+            await self._clients.pop(key).aclose()
+
+    async def close(self) -> None:
+        for platform in {p for p, _ in self._clients}:
+            await self.reset(platform)
+        logger.info("Scraper HTTP clients closed")
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "open_clients": sorted({p for (p, _), c in self._clients.items() if not c.is_closed}),
+            "platforms": {p: dict(s) for p, s in self._stats.items()},
+        }
+
+
+client_pool = ScraperClientPool()
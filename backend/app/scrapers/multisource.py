@@ -0,0 +1,163 @@
+"""
+多数据源爬虫（官方接口 + Tophub 等备用源）的对冲请求
+- 按声明顺序尝试（官方接口在前，字段更全）；某个源连续失败 DEMOTE_STREAK 次后才降到健康源之后
+- 首选源超过延迟预算仍未返回时启动下一个源；首选源近期失败（连续失败 >= HEDGE_STREAK）时立即并发
+- 立即并发时备用源往往先返回、首选源被取消；被取消的源不计成功也不计失败，
+  因此失败中的源每隔 PROBE_INTERVAL 秒独占一次延迟预算（降级的源同时回到原位置）作为探测，探测成功即恢复
+- 第一个拿到有效结果的源胜出，其余请求取消
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+
+import httpx
+
+from app.config import settings
+from app.schemas import HotTopicCreate
+from app.scrapers.base import BaseScraper, PayloadUnchanged, current_source
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 20
+HEDGE_STREAK = 1  # 首选源连续失败达到该值时不等延迟预算，直接并发下一个源
+DEMOTE_STREAK = 3  # 连续失败次数达到该值才降级，偶发的失败不改变顺序
+PROBE_INTERVAL = 300.0  # 失败中的源的探测间隔（秒），从开始失败时算起
+
+
+class SourceStats:
+    """单个数据源最近 N 次请求的成功/延迟记录"""
+
+    def __init__(self):
+        self.history: deque[tuple[bool, float]] = deque(maxlen=HISTORY_SIZE)
+        self.last_probe = 0.0  # 上次独占延迟预算探测（或开始失败）的时间，time.monotonic()
+
+    def record(self, ok: bool, latency: float) -> None:
+        if not ok and not self.failure_streak:
+            self.last_probe = time.monotonic()
+        self.history.append((ok, latency))
+
+    @property
+    def success_rate(self) -> float:
+        if not self.history:
+            return 1.0
+        return sum(1 for ok, _ in self.history if ok) / len(self.history)
+
+    @property
+    def median_latency(self) -> float:
+        latencies = [lat for ok, lat in self.history if ok]
+        return statistics.median(latencies) if latencies else 0.0
+
+    @property
+    def failure_streak(self) -> int:
+        streak = 0
+        for ok, _ in reversed(self.history):
+            if ok:
+                break
+            streak += 1
+        return streak
+
+    @property
+    def demoted(self) -> bool:
+        return self.failure_streak >= DEMOTE_STREAK
+
+    def probe_due(self, now: float) -> bool:
+        return self.failure_streak > 0 and now - self.last_probe >= PROBE_INTERVAL
+
+    def to_dict(self) -> dict:
+        return {
+            "attempts": len(self.history),
+            "success_rate": round(self.success_rate, 2),
+            "median_latency_ms": round(self.median_latency * 1000, 1),
+            "failure_streak": self.failure_streak,
+            "demoted": self.demoted,
+        }
+
+
+class MultiSourceScraper(BaseScraper):
+    """子类在 sources 中声明数据源名，并实现对应的 _source_<name>(client) 方法"""
+
+    sources: tuple[str, ...] = ()
+
+    def __init__(self):
+        super().__init__()
+        self._source_stats: dict[str, SourceStats] = {name: SourceStats() for name in self.sources}
+
+    def source_order(self, now: float | None = None) -> list[str]:
+        """声明顺序，降级的源排到后面；到了探测时间的降级源回到原位置"""
+        now = time.monotonic() if now is None else now
+        return sorted(self.sources, key=lambda name: self._source_stats[name].demoted
+                      and not self._source_stats[name].probe_due(now))
+
+    def source_stats(self) -> dict:
+        return {name: self._source_stats[name].to_dict() for name in self.source_order()}
+
+    async def _run_source(self, name: str, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        current_source.set(name)
+        topics = await getattr(self, f"_source_{name}")(client)
+        if not topics:
+            raise ValueError(f"source {name} returned no topics")
+        return topics
+
+    async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        order = self.source_order()
+        hedge_delay = settings.SCRAPE_HEDGE_DELAY_SECONDS
+        tasks: dict[asyncio.Task, tuple[str, float]] = {}
+
+        def start_next() -> None:
+            name = order[len(tasks)]
+            tasks[asyncio.create_task(self._run_source(name, client))] = (name, time.perf_counter())
+
+        # 首选源近期失败则直接并发，到了探测时间时例外；所有源都已降级时不探测
+        primary = self._source_stats[order[0]]
+        now = time.monotonic()
+        probing = primary.probe_due(now) and not all(self._source_stats[name].demoted for name in order)
+        if probing:
+            primary.last_probe = now
+        start_next()
+        if len(order) > 1 and primary.failure_streak >= HEDGE_STREAK and not probing:
+            start_next()
+
+        pending = set(tasks)
+        last_error: BaseException | None = None
+        try:
+            while pending or len(tasks) < len(order):
+                if not pending:
+                    start_next()
+                    pending = {t for t in tasks if not t.done()}
+                    continue
+                timeout = hedge_delay if len(tasks) < len(order) else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info("[%s] %s slower than %.1fs, hedging with %s", self.platform,
+                                ", ".join(tasks[t][0] for t in pending), hedge_delay, order[len(tasks)])
+                    start_next()
+                    pending = {t for t in tasks if not t.done()}
+                    continue
+
+                for task in done:
+                    name, started = tasks[task]
+                    latency = time.perf_counter() - started
+                    error = task.exception()
+                    if error is None or isinstance(error, PayloadUnchanged):
+                        self._source_stats[name].record(True, latency)
+                        self._discard_pending(keep_source=name)
+                        if error is not None:
+                            raise error
+                        if len(order) > 1 and name != order[0]:
+                            logger.info("[%s] served by fallback source %s", self.platform, name)
+                        return task.result()
+                    self._source_stats[name].record(False, latency)
+                    logger.debug("[%s] source %s failed: %s", self.platform, name, error)
+                    last_error = error
+        finally:
+            losers = [t for t in tasks if not t.done()]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+
+        if last_error is not None:
+            raise last_error
+        return []
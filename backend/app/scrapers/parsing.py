@@ -0,0 +1,87 @@
+"""
+HTML 解析层
+- 直接从响应字节解码，不构建中间的 resp.text
+- 只抽取需要的节点（文本 + 链接），不做整页 CSS 遍历
+- 后端可按爬虫选择：lxml（XPath，默认）/ bs4（html.parser，兼容回退）
+"""
+
+import abc
+from dataclasses import dataclass
+from typing import NamedTuple
+
+
+class Node(NamedTuple):
+    text: str
+    href: str
+
+
+@dataclass(frozen=True)
+class NodeQuery:
+    """同一组节点的两种写法：bs4 用 CSS，lxml 用 XPath"""
+    css: str
+    xpath: str
+
+
+def has_class(name: str) -> str:
+    """XPath 谓词：class 属性包含完整的类名（等价于 CSS .name）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+TOPHUB_LINKS = NodeQuery(css="table tr td a", xpath="//table//tr//td//a")
+META_DESCRIPTION = NodeQuery(
+    css='meta[name="description"], meta[property="og:description"]',
+    xpath='//meta[@name="description" or @property="og:description"]',
+)
+PAGE_TEXT = NodeQuery(css="body", xpath="//body")
+
+
+class HtmlExtractor(abc.ABC):
+    name: str = ""
+
+    @abc.abstractmethod
+    def extract(self, content: bytes, query: NodeQuery, encoding: str | None = None) -> list[Node]:
+        ...
+
+
+class LxmlExtractor(HtmlExtractor):
+    """lxml + XPath：C 实现的解析器，只为匹配节点构造 Python 对象"""
+
+    name = "lxml"
+
+    def extract(self, content: bytes, query: NodeQuery, encoding: str | None = None) -> list[Node]:
+        from lxml import html
+
+        if not content:
+            return []
+        parser = html.HTMLParser(encoding=encoding or "utf-8")
+        root = html.fromstring(content, parser=parser)
+        # 与 bs4 get_text(strip=True) 一致：逐段去空白后拼接；<meta> 等无文本节点取 content 属性
+        return [
+            Node("".join(s.strip() for s in el.itertext()) or el.get("content", ""), el.get("href", ""))
+            for el in root.xpath(query.xpath)
+        ]
+
+
+class SoupExtractor(HtmlExtractor):
+    """BeautifulSoup + html.parser：纯 Python，较慢，保留作兼容回退"""
+
+    name = "bs4"
+
+    def extract(self, content: bytes, query: NodeQuery, encoding: str | None = None) -> list[Node]:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "html.parser", from_encoding=encoding or "utf-8")
+        return [
+            Node(el.get_text(strip=True) or el.get("content", ""), el.get("href", ""))
+            for el in soup.select(query.css)
+        ]
+
+
+EXTRACTORS: dict[str, HtmlExtractor] = {e.name: e for e in (LxmlExtractor(), SoupExtractor())}
+
+
+def get_extractor(name: str) -> HtmlExtractor:
+    try:
+        return EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"未知 HTML 解析后端: {name}. 可选: {sorted(EXTRACTORS)}") from None
@@ -0,0 +1,204 @@
+"""
+爬虫出口代理池
+- 代理来源：PROXY_URLS（逗号分隔）、PROXY_FILE（每行一个，# 开头为注释），兼容单个 PROXY_URL
+- 按最近成功率与延迟（EWMA）为每个代理打分，新分配时选得分最高、分配平台最少的代理
+- 每个代理限制同时进行的平台抓取数，满载时等待
+- 平台粘性分配：同一平台持续使用同一代理（Cookie、会话一致），直到该代理被剔除
+- 连续失败的代理由熔断器剔除，冷却后半开放行一次真实请求作为探测
+未配置任何代理时直连。
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from pathlib import Path
+
+import httpx
+
+from app.config import settings
+from app.scrapers.breaker import CLOSED, CircuitBreaker, CircuitOpen
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 20
+LATENCY_ALPHA = 0.3  # 延迟 EWMA 平滑系数
+WAIT_INTERVAL = 0.05  # 代理满载时的轮询间隔（秒）
+# 这些状态码说明出口 IP 被拒绝或限流，记为代理失败
+PROXY_BLOCK_STATUSES = {403, 407, 429}
+
+
+class NoHealthyProxy(CircuitOpen):
+    """所有代理均已被剔除，本轮跳过该平台（不回退直连，避免暴露本机 IP）"""
+
+
+def is_proxy_failure(error: BaseException) -> bool:
+    """连接层错误与封禁类状态码归咎于代理；解析失败等其他错误不影响代理得分"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in PROXY_BLOCK_STATUSES
+    return False
+
+
+def mask_proxy(url: str) -> str:
+    """隐藏代理地址中的账号密码"""
+    parsed = httpx.URL(url)
+    if not parsed.userinfo:
+        return url
+    return str(parsed.copy_with(username="***", password=None))
+
+
+class ProxyState:
+    """单个代理的健康度、延迟与并发"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.in_flight = 0
+        self.latency_ewma: float | None = None
+        self.history: deque[bool] = deque(maxlen=HISTORY_SIZE)
+        self.breaker = CircuitBreaker(settings.PROXY_EJECT_FAILURES, settings.PROXY_PROBE_SECONDS)
+
+    @property
+    def success_rate(self) -> float:
+        if not self.history:
+            return 1.0
+        return sum(self.history) / len(self.history)
+
+    @property
+    def score(self) -> float:
+        """成功率越高、延迟越低得分越高；无延迟记录的新代理按 0 延迟参与"""
+        return self.success_rate / (1.0 + (self.latency_ewma or 0.0))
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < settings.PROXY_MAX_CONCURRENCY
+
+    def record(self, ok: bool, latency: float, error: BaseException | None = None) -> None:
+        self.history.append(ok)
+        if ok:
+            self.latency_ewma = latency if self.latency_ewma is None else (
+                LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency_ewma)
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure(error or RuntimeError("proxy failure"))
+            if self.breaker.state != CLOSED:
+                logger.warning("Proxy %s ejected: %s", mask_proxy(self.url), error)
+
+    def to_dict(self) -> dict:
+        return {
+            "url": mask_proxy(self.url),
+            "state": self.breaker.state,
+            "score": round(self.score, 3),
+            "success_rate": round(self.success_rate, 2),
+            "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "in_flight": self.in_flight,
+            "retry_in_seconds": self.breaker.retry_in(),
+            "recent_failures": list(self.breaker.recent_failures),
+        }
+
+
+class ProxyLease:
+    """一次平台抓取占用的代理名额；release 时回报结果"""
+
+    def __init__(self, pool: "ProxyPool", proxy: ProxyState | None):
+        self._pool = pool
+        self.proxy = proxy
+        self.started = time.perf_counter()
+
+    @property
+    def url(self) -> str | None:
+        return self.proxy.url if self.proxy else None
+
+    def release(self, error: BaseException | None = None) -> None:
+        if self.proxy is None:
+            return
+        self.proxy.in_flight -= 1
+        if isinstance(error, asyncio.CancelledError):
+            # 被截止时间或对冲取消：不计成功也不计失败，只归还可能占用的半开探测名额
+            self.proxy.breaker.cancel()
+            return
+        failed = error is not None and is_proxy_failure(error)
+        self.proxy.record(not failed, time.perf_counter() - self.started, error)
+        if failed and self.proxy.breaker.state != CLOSED:
+            self._pool.unassign(self.proxy.url)
+
+
+class ProxyPool:
+    def __init__(self):
+        self._proxies: dict[str, ProxyState] = {}
+        self._sticky: dict[str, str] = {}  # 平台 -> 代理 URL
+
+    def load(self, urls: list[str] | None = None) -> None:
+        """载入代理列表（默认读配置）；已存在的代理保留其健康记录"""
+        if urls is None:
+            urls = configured_proxies()
+        self._proxies = {url: self._proxies.get(url) or ProxyState(url) for url in urls}
+        self._sticky = {p: url for p, url in self._sticky.items() if url in self._proxies}
+        if urls:
+            logger.info("Proxy pool loaded with %d proxies", len(urls))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._proxies)
+
+    def unassign(self, url: str) -> None:
+        """代理被剔除后解除其平台绑定，下次重新分配"""
+        self._sticky = {p: u for p, u in self._sticky.items() if u != url}
+
+    def _candidates(self, platform: str) -> list[ProxyState]:
+        sticky = self._proxies.get(self._sticky.get(platform, ""))
+        if sticky is not None and sticky.breaker.state == CLOSED:
+            return [sticky]
+        assigned = {url: 0 for url in self._proxies}
+        for url in self._sticky.values():
+            assigned[url] += 1
+        return sorted(self._proxies.values(), key=lambda p: (-p.score, assigned[p.url]))
+
+    def _try_acquire(self, platform: str) -> ProxyState | None:
+        for proxy in self._candidates(platform):
+            # allow() 对冷却结束的代理只放行一次半开探测
+            if proxy.has_capacity() and proxy.breaker.allow():
+                proxy.in_flight += 1
+                if self._sticky.get(platform) != proxy.url:
+                    logger.info("[%s] assigned proxy %s", platform, mask_proxy(proxy.url))
+                    self._sticky[platform] = proxy.url
+                return proxy
+        return None
+
+    def _all_ejected(self) -> bool:
+        return all(p.breaker.state != CLOSED and p.breaker.retry_in() for p in self._proxies.values())
+
+    async def acquire(self, platform: str) -> ProxyLease:
+        """为平台分配代理；代理满载时等待，全部被剔除时抛出 NoHealthyProxy"""
+        if not self._proxies:
+            return ProxyLease(self, None)
+        while True:
+            proxy = self._try_acquire(platform)
+            if proxy is not None:
+                return ProxyLease(self, proxy)
+            if self._all_ejected():
+                raise NoHealthyProxy(f"all {len(self._proxies)} proxies ejected")
+            await asyncio.sleep(WAIT_INTERVAL)
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": settings.PROXY_MAX_CONCURRENCY,
+            "assignments": {p: mask_proxy(url) for p, url in sorted(self._sticky.items())},
+            "proxies": [p.to_dict() for p in sorted(self._proxies.values(), key=lambda p: -p.score)],
+        }
+
+
+def configured_proxies() -> list[str]:
+    """合并 PROXY_URLS、PROXY_FILE 与 PROXY_URL，保持顺序去重"""
+    urls = [u.strip() for u in settings.PROXY_URLS.split(",")]
+    if settings.PROXY_FILE and Path(settings.PROXY_FILE).exists():
+        lines = Path(settings.PROXY_FILE).read_text(encoding="utf-8").splitlines()
+        urls += [line.strip() for line in lines if not line.strip().startswith("#")]
+    if settings.PROXY_URL:
+        urls.append(settings.PROXY_URL)
+    return list(dict.fromkeys(u for u in urls if u))
+
+
+proxy_pool = ProxyPool()
+proxy_pool.load()
@@ -0,0 +1,173 @@
+"""
+按上游主机的礼貌限速
+- 每个主机一个令牌桶（速率 + 突发）和并发上限，所有爬虫、备用源、手动触发共享
+- 作为传输层包装挂在连接池每个客户端上，对冲请求、Tophub、代理出口都经过同一限速
+- 速率、突发、并发及按主机覆盖值从运行时配置读取，可通过 /api/config 即时调整
+- 记录各主机等待次数、总等待时间、最大和 P95 等待时间，用于找到上游能承受的最高持续速率
+"""
+
+import asyncio
+import statistics
+import time
+from collections import deque
+
+import httpx
+
+from app.config import get_runtime_config
+
+WAIT_INTERVAL = 0.05  # 并发已满时的轮询间隔（秒）
+WAIT_HISTORY = 200
+
+
+class HostLimiter:
+    """单个主机的令牌桶 + 并发上限"""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.tokens: float | None = None  # 首次使用时按突发值装满
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits: deque[float] = deque(maxlen=WAIT_HISTORY)
+
+    def limits(self) -> dict:
+        cfg = get_runtime_config()
+        limits = {
+            "rate_per_second": cfg["host_rate_per_second"],
+            "burst": cfg["host_burst"],
+            "max_concurrency": cfg["host_max_concurrency"],
+        }
+        override = cfg["host_overrides"].get(self.host) or {}
+        limits.update({k: v for k, v in override.items() if v is not None})
+        return limits
+
+    def _refill(self, rate: float, burst: int) -> None:
+        now = time.monotonic()
+        if self.tokens is None:
+            self.tokens = float(burst)
+        else:
+            self.tokens = min(float(burst), self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    async def acquire(self, reserve: int = 0) -> None:
+        """取得一个令牌和并发名额；reserve>0 的后台请求只在桶内余量超过 reserve 时才取"""
+        started = time.monotonic()
+        while True:
+            limits = self.limits()
+            self._refill(limits["rate_per_second"], limits["burst"])
+            # 预留不能超过桶容量，否则后台请求永远取不到令牌
+            needed = 1 + min(reserve, limits["burst"] - 1)
+            if self.in_flight < limits["max_concurrency"]:
+                if self.tokens >= needed:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    break
+                delay = (needed - self.tokens) / limits["rate_per_second"]
+            else:
+                delay = WAIT_INTERVAL
+            await asyncio.sleep(delay)
+
+        wait = time.monotonic() - started
+        self.requests += 1
+        self.waits.append(wait)
+        if wait > 0.001:
+            self.waited += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def release(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def to_dict(self) -> dict:
+        p95 = statistics.quantiles(self.waits, n=20)[-1] if len(self.waits) >= 2 else 0.0
+        return {
+            **self.limits(),
+            "tokens": round(self.tokens, 2) if self.tokens is not None else None,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "waited": self.waited,
+            "total_wait_ms": round(self.total_wait * 1000, 1),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "p95_wait_ms": round(p95 * 1000, 1),
+        }
+
+
+class HostRateLimiter:
+    """主机 -> HostLimiter 注册表"""
+
+    def __init__(self):
+        self._hosts: dict[str, HostLimiter] = {}
+
+    def for_host(self, host: str) -> HostLimiter:
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostLimiter(host)
+        return limiter
+
+    @property
+    def enabled(self) -> bool:
+        return get_runtime_config()["host_rate_limit_enabled"]
+
+    def reset(self) -> None:
+        self._hosts.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hosts": {host: limiter.to_dict() for host, limiter in sorted(self._hosts.items())},
+        }
+
+
+host_limiter = HostRateLimiter()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """响应体读完（流关闭）时归还并发名额"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, limiter: HostLimiter):
+        self._stream = stream
+        self._limiter = limiter
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._limiter.release()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """按请求主机限速的传输层包装"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, registry: HostRateLimiter = host_limiter):
+        self._inner = inner
+        self._registry = registry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._registry.enabled:
+            return await self._inner.handle_async_request(request)
+        limiter = self._registry.for_host(request.url.host)
+        await limiter.acquire(request.extensions.get("rate_limit_reserve", 0))
+        try:
+            resp = await self._inner.handle_async_request(request)
+        except BaseException:
+            limiter.release()
+            raise
+        return httpx.Response(
+            status_code=resp.status_code,
+            headers=resp.headers,
+            stream=_ReleasingStream(resp.stream, limiter),
+            extensions=resp.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
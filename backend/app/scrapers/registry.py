@@ -0,0 +1,105 @@
+"""
+爬虫注册表
+- 按平台名登记 "模块:类" 路径，首次取用时才导入模块并实例化，每个平台一个实例
+- 只取用启用的平台：仅提供 API 的进程和测试不导入用不到的爬虫与解析器
+- 第三方爬虫通过入口点组 hot_topics.scrapers 注册，例如 pyproject.toml 中：
+      [project.entry-points."hot_topics.scrapers"]
+      bilibili = "hot_topics_bilibili:BilibiliScraper"
+  内置平台同名时以内置为准
+"""
+
+import importlib
+import logging
+from importlib.metadata import entry_points
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "hot_topics.scrapers"
+
+BUILTIN_SCRAPERS = {
+    "weibo": "app.scrapers.weibo:WeiboScraper",
+    "zhihu": "app.scrapers.zhihu:ZhihuScraper",
+    "baidu": "app.scrapers.baidu:BaiduScraper",
+    "douyin": "app.scrapers.douyin:DouyinScraper",
+    "xiaohongshu": "app.scrapers.xiaohongshu:XiaohongshuScraper",
+}
+
+
+class UnknownPlatform(KeyError):
+    """未注册的平台名"""
+
+
+class ScraperRegistry:
+    def __init__(self, builtins: dict[str, str] = BUILTIN_SCRAPERS, group: str | None = ENTRY_POINT_GROUP):
+        self._specs: dict[str, str] = dict(builtins)
+        self._plugins: set[str] = set()
+        self._instances: dict = {}
+        self._group = group
+        self._discovered = group is None
+
+    def _discover(self) -> None:
+        """读取入口点元数据（不导入插件模块）"""
+        if self._discovered:
+            return
+        self._discovered = True
+        for ep in entry_points(group=self._group):
+            if ep.name in self._specs:
+                logger.warning("Scraper plugin %s ignored: platform name already registered", ep.value)
+                continue
+            self._specs[ep.name] = ep.value
+            self._plugins.add(ep.name)
+
+    def register(self, name: str, spec: str, plugin: bool = True) -> None:
+        """登记一个平台；spec 为 "模块:类" 路径"""
+        self._discover()
+        self._specs[name] = spec
+        self._instances.pop(name, None)
+        if plugin:
+            self._plugins.add(name)
+
+    def names(self) -> list[str]:
+        self._discover()
+        return list(self._specs)
+
+    def is_plugin(self, name: str) -> bool:
+        self._discover()
+        return name in self._plugins
+
+    def get(self, name: str):
+        """取平台爬虫实例，首次取用时导入并实例化"""
+        scraper = self._instances.get(name)
+        if scraper is not None:
+            return scraper
+        self._discover()
+        spec = self._specs.get(name)
+        if spec is None:
+            raise UnknownPlatform(name)
+
+        from app.scrapers.base import BaseScraper
+
+        module_name, _, attr = spec.partition(":")
+        cls = getattr(importlib.import_module(module_name), attr)
+        if not (isinstance(cls, type) and issubclass(cls, BaseScraper)):
+            raise TypeError(f"{spec} is not a BaseScraper subclass")
+        if cls.platform != name:
+            raise TypeError(f"{spec} declares platform {cls.platform!r}, registered as {name!r}")
+        scraper = self._instances[name] = cls()
+        logger.info("Loaded scraper %s (%s)", name, spec)
+        return scraper
+
+    def enabled(self, names: list[str]) -> list:
+        """按名取一组爬虫；未注册或加载失败的平台记日志后跳过"""
+        scrapers = []
+        for name in names:
+            try:
+                scrapers.append(self.get(name))
+            except (UnknownPlatform, ImportError, TypeError, AttributeError) as e:
+                logger.error("Scraper %s unavailable: %r", name, e)
+        return scrapers
+
+    def loaded(self) -> dict:
+        """已实例化的爬虫（健康检查、清指纹等只需处理这些）"""
+        return dict(self._instances)
+
+
+scraper_registry = ScraperRegistry()
@@ -0,0 +1,181 @@
+"""
+上游响应录制与回放
+- RecordingTransport：包装真实传输层，把每个响应保存到 <目录>/<平台>/
+- ReplayTransport   ：按 方法 + URL 返回录制的响应，完全离线、结果确定
+- Fault             ：回放时按 URL 片段注入延迟、错误状态码或连接异常，
+                      用于在受控条件下观察超时、对冲、熔断行为
+
+录制目录结构：
+    <目录>/<平台>/index.json   [{"method", "url", "status", "headers", "body"}]
+    <目录>/<平台>/<body 文件>   响应体原始字节
+
+通过 client_pool.set_transport_factory 接入所有 BaseScraper；
+设置 SCRAPE_REPLAY_DIR / SCRAPE_RECORD_DIR 后在启动时自动启用。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from app.config import settings
+from app.scrapers.http_pool import client_pool
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+# 只保留与解析和条件请求相关的响应头
+KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class ReplayMiss(httpx.TransportError):
+    """回放目录中没有该请求的录制"""
+
+
+@dataclass
+class Fault:
+    """回放故障：delay 秒后返回 status，或抛出 error；times 为生效次数（None 表示一直生效）"""
+
+    delay: float = 0.0
+    status: int | None = None
+    error: type[httpx.TransportError] | None = None
+    times: int | None = None
+
+    def consume(self) -> bool:
+        if self.times is None:
+            return True
+        if self.times <= 0:
+            return False
+        self.times -= 1
+        return True
+
+
+def _request_key(method: str, url: httpx.URL | str) -> str:
+    return f"{method} {url}"
+
+
+def _body_name(method: str, url: httpx.URL) -> str:
+    digest = hashlib.sha1(_request_key(method, url).encode()).hexdigest()[:10]
+    return f"{url.host.replace('.', '_')}_{digest}.body"
+
+
+def load_recordings(directory: str | Path) -> dict[str, dict]:
+    """读取单个平台的录制，返回 "METHOD URL" -> 录制项（含响应体字节）"""
+    directory = Path(directory)
+    index_path = directory / INDEX_FILE
+    if not index_path.exists():
+        return {}
+    entries = json.loads(index_path.read_text(encoding="utf-8"))
+    recordings = {}
+    for entry in entries:
+        entry = {**entry, "content": (directory / entry["body"]).read_bytes()}
+        recordings[_request_key(entry["method"], httpx.URL(entry["url"]))] = entry
+    return recordings
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """离线回放录制的响应；支持条件请求（If-None-Match 命中录制的 ETag 时返回 304）"""
+
+    def __init__(self, directory: str | Path, latency: float = 0.0, faults: dict[str, Fault] | None = None):
+        self.recordings = load_recordings(directory)
+        self.latency = latency
+        self.faults = faults or {}
+        self.requests: list[str] = []
+
+    def _fault_for(self, url: str) -> Fault | None:
+        for fragment, fault in self.faults.items():
+            if fragment in url and fault.consume():
+                return fault
+        return None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requests.append(url)
+        fault = self._fault_for(url)
+        delay = self.latency + (fault.delay if fault else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if fault and fault.error is not None:
+            raise fault.error(f"injected fault for {url}", request=request)
+        if fault and fault.status is not None:
+            return httpx.Response(fault.status, request=request)
+
+        entry = self.recordings.get(_request_key(request.method, request.url))
+        if entry is None:
+            raise ReplayMiss(f"no recording for {request.method} {url}", request=request)
+        etag = entry["headers"].get("etag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"etag": etag}, request=request)
+        return httpx.Response(entry["status"], headers=entry["headers"], content=entry["content"], request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """透传请求并把响应写入录制目录（同一请求只保留最新一次）"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, directory: str | Path):
+        self._inner = inner
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index_path = self.directory / INDEX_FILE
+        entries = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else []
+        self._entries = {_request_key(e["method"], httpx.URL(e["url"])): e for e in entries}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        resp = await self._inner.handle_async_request(request)
+        content = await resp.aread()  # 按 Content-Encoding 解压
+        await resp.aclose()
+        headers = {k: v for k, v in resp.headers.items() if k.lower() in KEPT_HEADERS}
+
+        if resp.status_code != 304:
+            body = _body_name(request.method, request.url)
+            (self.directory / body).write_bytes(content)
+            self._entries[_request_key(request.method, request.url)] = {
+                "method": request.method,
+                "url": str(request.url),
+                "status": resp.status_code,
+                "headers": headers,
+                "body": body,
+            }
+            (self.directory / INDEX_FILE).write_text(
+                json.dumps(list(self._entries.values()), ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+        # 内容已解压读出，去掉编码相关头后重新封装
+        return httpx.Response(resp.status_code, headers=headers, content=content, request=request,
+                              extensions=resp.extensions)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def use_replay(directory: str | Path, latency: float = 0.0, faults: dict[str, Fault] | None = None) -> dict:
+    """所有平台改为从 <directory>/<平台>/ 回放；返回 平台 -> ReplayTransport，便于检查请求记录"""
+    transports: dict[str, ReplayTransport] = {}
+
+    def factory(platform: str) -> ReplayTransport:
+        transports[platform] = ReplayTransport(Path(directory) / platform, latency=latency, faults=faults)
+        return transports[platform]
+
+    client_pool.set_transport_factory(factory)
+    return transports
+
+
+def use_recording(directory: str | Path) -> None:
+    """所有平台照常联网，同时把响应录制到 <directory>/<平台>/"""
+    def factory(platform: str) -> RecordingTransport:
+        return RecordingTransport(client_pool.default_transport(), Path(directory) / platform)
+
+    client_pool.set_transport_factory(factory)
+
+
+def install_from_settings() -> None:
+    """按配置启用回放或录制（回放优先）"""
+    if settings.SCRAPE_REPLAY_DIR:
+        use_replay(settings.SCRAPE_REPLAY_DIR)
+        logger.warning("Scrapers replaying recorded responses from %s", settings.SCRAPE_REPLAY_DIR)
+    elif settings.SCRAPE_RECORD_DIR:
+        use_recording(settings.SCRAPE_RECORD_DIR)
+        logger.info("Recording upstream responses to %s", settings.SCRAPE_RECORD_DIR)
@@ -0,0 +1,88 @@
+"""
+Tophub 聚合页共享数据源
+- 各平台的备用源都指向 tophub.today，官方源同时失败（如 IP 被封）时会并发打到同一上游
+- 同一 URL 同一时间只发一个请求，所有等待者共享结果（请求合并）
+- 解析结果短时缓存，TTL 内直接复用；过期后带条件请求头刷新
+- 所有平台共用一个 "tophub" 长连接客户端
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import NamedTuple
+
+from app.config import settings
+from app.scrapers.http_pool import client_pool
+from app.scrapers.parsing import TOPHUB_LINKS, Node, get_extractor
+
+logger = logging.getLogger(__name__)
+
+TOPHUB_CLIENT = "tophub"
+
+
+class TophubPage(NamedTuple):
+    url: str
+    digest: str
+    nodes: tuple[Node, ...]
+    fetched_at: float
+
+
+class TophubSource:
+    """按 URL 合并并缓存 Tophub 页面请求"""
+
+    def __init__(self):
+        self._cache: dict[str, TophubPage] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._validators: dict[str, dict[str, str]] = {}
+        self._stats = {"requests": 0, "coalesced": 0, "cache_hits": 0, "not_modified": 0}
+
+    async def get(self, url: str, headers: dict | None = None, proxy: str | None = None) -> TophubPage:
+        """获取页面：缓存未过期直接返回，已有请求在途则等待其结果"""
+        cached = self._cache.get(url)
+        if cached and time.monotonic() - cached.fetched_at < settings.TOPHUB_CACHE_SECONDS:
+            self._stats["cache_hits"] += 1
+            return cached
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(url, headers or {}, proxy))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        else:
+            self._stats["coalesced"] += 1
+        # 单个等待者被取消（如对冲请求落败）不影响其他等待者
+        return await asyncio.shield(task)
+
+    async def _fetch(self, url: str, headers: dict, proxy: str | None) -> TophubPage:
+        self._stats["requests"] += 1
+        client = client_pool.get(TOPHUB_CLIENT, proxy=proxy)
+        resp = await client.get(url, headers={**headers, **self._validators.get(url, {})})
+        cached = self._cache.get(url)
+        if resp.status_code == 304 and cached:
+            self._stats["not_modified"] += 1
+            logger.debug("tophub %s not modified", url)
+            page = cached._replace(fetched_at=time.monotonic())
+        else:
+            resp.raise_for_status()
+            nodes = get_extractor("lxml").extract(resp.content, TOPHUB_LINKS, resp.charset_encoding)
+            page = TophubPage(url, hashlib.sha1(resp.content).hexdigest(), tuple(nodes), time.monotonic())
+            validators = {}
+            if resp.headers.get("ETag"):
+                validators["If-None-Match"] = resp.headers["ETag"]
+            if resp.headers.get("Last-Modified"):
+                validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+            self._validators[url] = validators
+        self._cache[url] = page
+        return page
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._validators.clear()
+
+    def stats(self) -> dict:
+        return {**self._stats, "cached_pages": len(self._cache), "in_flight": len(self._inflight)}
+
+
+tophub_source = TophubSource()
+
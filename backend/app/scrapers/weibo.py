@@ -1,9 +1,11 @@
 import httpx
 from app.schemas import HotTopicCreate
-from app.scrapers.base import BaseScraper
+from app.scrapers.base import BaseScraper, FastLaneMixin
 
+HOT_SEARCH_URL = "https://weibo.com/ajax/side/hotSearch"
 
-class WeiboScraper(BaseScraper):
+
+class WeiboScraper(FastLaneMixin, BaseScraper):
     """微博热搜爬虫"""
 
     platform = "weibo"
@@ -18,16 +20,20 @@ class WeiboScraper(BaseScraper):
         return h
 
     async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
-        # 先访问首页获取 Cookie
-        await client.get("https://weibo.com/")
-        url = "https://weibo.com/ajax/side/hotSearch"
-        resp = await client.get(url)
-        resp.raise_for_status()
-        data = resp.json()
+        # 首次访问首页获取 Cookie，之后复用连接池中保存的 Cookie
+        if not client.cookies:
+            await client.get("https://weibo.com/")
+        resp = await self._get_list(client, HOT_SEARCH_URL)
+        return self._topics_from_json(resp.json())
+
+    async def fetch_top(self, limit: int) -> list[HotTopicCreate]:
+        data = await self._get_json_direct(HOT_SEARCH_URL, headers=self._get_headers())
+        return self._topics_from_json(data, limit)
 
+    def _topics_from_json(self, data: dict, limit: int = 50) -> list[HotTopicCreate]:
         topics: list[HotTopicCreate] = []
         realtime = data.get("data", {}).get("realtime", [])
-        for i, item in enumerate(realtime[:50], start=1):
+        for i, item in enumerate(realtime[:limit], start=1):
             title = item.get("word", "") or item.get("note", "")
             if not title:
                 continue
@@ -1,86 +1,96 @@
+import re
+
 import httpx
-from app.schemas import HotTopicCreate
-from app.scrapers.base import BaseScraper
+from app.schemas import HotTopicCreate, HotTopicOut, TopicDetailData
+from app.scrapers.multisource import MultiSourceScraper
+
+QUESTION_URL = re.compile(r"zhihu\.com/question/(\d+)")
 
 
-class ZhihuScraper(BaseScraper):
+class ZhihuScraper(MultiSourceScraper):
     """知乎热榜爬虫"""
 
     platform = "zhihu"
+    sources = ("official", "tophub")
 
-    async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+    async def _source_official(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        """方式1: 知乎热榜 API"""
         topics: list[HotTopicCreate] = []
-
-        # 方式1: 知乎热榜 API
-        try:
-            headers = {
-                **self._get_headers(),
-                "Referer": "https://www.zhihu.com/hot",
-                "Cookie": "_zap=placeholder",
-            }
-            resp = await client.get(
-                "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total",
-                params={"limit": 50},
-                headers=headers,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            for i, item in enumerate(data.get("data", []), start=1):
-                target = item.get("target", {})
-                title = target.get("title", "")
-                if not title:
-                    continue
-                try:
-                    text = item.get("detail_text", "0").replace(" 热度", "").strip()
-                    if "万" in text:
-                        hot_val = int(float(text.replace("万", "")) * 10000)
-                    else:
-                        hot_val = int(text)
-                except (ValueError, AttributeError):
-                    hot_val = None
-                topics.append(
-                    HotTopicCreate(
-                        platform=self.platform,
-                        title=title,
-                        url=f"https://www.zhihu.com/question/{target.get('id', '')}",
-                        rank=i,
-                        hot_value=hot_val,
-                        category=None,
-                        is_cny_related=self._is_cny_related(title),
-                    )
+        headers = {
+            **self._get_headers(),
+            "Referer": "https://www.zhihu.com/hot",
+            "Cookie": "_zap=placeholder",
+        }
+        resp = await self._get_list(
+            client,
+            "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total",
+            params={"limit": 50},
+            headers=headers,
+        )
+        data = resp.json()
+        for i, item in enumerate(data.get("data", []), start=1):
+            target = item.get("target", {})
+            title = target.get("title", "")
+            if not title:
+                continue
+            try:
+                text = item.get("detail_text", "0").replace(" 热度", "").strip()
+                if "万" in text:
+                    hot_val = int(float(text.replace("万", "")) * 10000)
+                else:
+                    hot_val = int(text)
+            except (ValueError, AttributeError):
+                hot_val = None
+            topics.append(
+                HotTopicCreate(
+                    platform=self.platform,
+                    title=title,
+                    url=f"https://www.zhihu.com/question/{target.get('id', '')}",
+                    rank=i,
+                    hot_value=hot_val,
+                    category=None,
+                    is_cny_related=self._is_cny_related(title),
                 )
-            if topics:
-                return topics
-        except Exception:
-            pass
-
-        # 方式2: 通过 Tophub 聚合
-        try:
-            from bs4 import BeautifulSoup
+            )
+        return topics
 
-            resp = await client.get("https://tophub.today/n/mproPpoq6O")
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            items = soup.select("table tr td a")
-            for i, item in enumerate(items[:50], start=1):
-                title = item.get_text(strip=True)
-                if not title:
-                    continue
-                href = item.get("href", "")
-                if href and not href.startswith("http"):
-                    href = f"https://tophub.today{href}"
-                topics.append(
-                    HotTopicCreate(
-                        platform=self.platform,
-                        title=title,
-                        url=href,
-                        rank=i,
-                        hot_value=None,
-                        category=None,
-                        is_cny_related=self._is_cny_related(title),
-                    )
+    async def _source_tophub(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        """方式2: 通过 Tophub 聚合"""
+        topics: list[HotTopicCreate] = []
+        items = await self._get_tophub("https://tophub.today/n/mproPpoq6O")
+        for i, item in enumerate(items[:50], start=1):
+            title = item.text
+            if not title:
+                continue
+            href = item.href
+            if href and not href.startswith("http"):
+                href = f"https://tophub.today{href}"
+            topics.append(
+                HotTopicCreate(
+                    platform=self.platform,
+                    title=title,
+                    url=href,
+                    rank=i,
+                    hot_value=None,
+                    category=None,
+                    is_cny_related=self._is_cny_related(title),
                 )
-        except Exception:
-            pass
-
+            )
         return topics
+
+    async def fetch_detail(self, topic: HotTopicOut) -> TopicDetailData | None:
+        """问题详情走知乎问题接口（浏览数、回答数、摘要），其余链接按通用页面解析"""
+        match = QUESTION_URL.search(topic.url or "")
+        if not match:
+            return await super().fetch_detail(topic)
+        resp = await self._get_detail(
+            f"https://www.zhihu.com/api/v4/questions/{match.group(1)}",
+            params={"include": "answer_count,visit_count,excerpt"},
+            headers={"Referer": "https://www.zhihu.com/hot"},
+        )
+        data = resp.json()
+        return TopicDetailData(
+            read_count=data.get("visit_count"),
+            answer_count=data.get("answer_count"),
+            summary=data.get("excerpt") or None,
+        )
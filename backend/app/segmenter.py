@@ -0,0 +1,194 @@
+"""
+中文分词
+- 词典前缀树 + 双向最大匹配：正向、逆向各切一遍，取词数少、单字少的结果，同分取逆向
+- 词典：基础词典 app/data/dict.txt、可选的 SEGMENT_DICT_PATH，以及由关键词引擎提供的用户词典
+  （春节/自定义关键词、主题分类规则、情感词典），关键词配置变更后随之重建
+- 词典外的连续单字合并为一个候选词（人名、新词等），超过 4 字的按 2 字切开
+- 标题 → 词元 的有界 LRU 缓存，分析器、词云、跨平台对比共用
+"""
+
+import functools
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+from app.config import settings
+from app.keywords import keyword_engine
+
+BASE_DICT = Path(__file__).parent / "data" / "dict.txt"
+TOKEN_RE = re.compile(r"[一-鿿]+|[A-Za-z0-9]+(?:\.[0-9]+)?")
+MAX_UNKNOWN_RUN = 4
+_END = ""
+
+# 词云等统计场景过滤的停用词
+STOPWORDS = {"什么", "怎么", "为什么", "如何", "可以", "就是", "这个", "那个", "一个", "不是"}
+
+
+@functools.lru_cache(maxsize=None)
+def load_dictionary_words() -> tuple[str, ...]:
+    """读取基础词典与 SEGMENT_DICT_PATH；每行第一列为词，# 开头为注释"""
+    paths = [BASE_DICT]
+    if settings.SEGMENT_DICT_PATH:
+        paths.append(Path(settings.SEGMENT_DICT_PATH))
+    words: list[str] = []
+    for path in paths:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            parts = line.split()
+            if parts and not parts[0].startswith("#"):
+                words.append(parts[0])
+    return tuple(words)
+
+
+class Trie:
+    """字典前缀树；按最长匹配查词"""
+
+    def __init__(self, words=()):
+        self.root: dict = {}
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        if _END not in node:
+            node[_END] = True
+            self.size += 1
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return False
+        return _END in node
+
+    def longest(self, chars, start: int) -> int:
+        """从 start 开始能匹配的最长词长度，没有匹配返回 0"""
+        node = self.root
+        best = 0
+        for i in range(start, len(chars)):
+            node = node.get(chars[i])
+            if node is None:
+                break
+            if _END in node:
+                best = i - start + 1
+        return best
+
+
+class Segmenter:
+    def __init__(self, cache_size: int):
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+        self._forward: Trie | None = None
+        self._backward: Trie | None = None  # 倒序词的前缀树，用于逆向最大匹配
+        self._version: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _ensure_dictionary(self) -> None:
+        compiled = keyword_engine.compiled()
+        if self._version == keyword_engine.version:
+            return
+        words = [w for w in (*load_dictionary_words(), *compiled.matcher.keywords) if w]
+        self._forward = Trie(words)
+        self._backward = Trie(w[::-1] for w in words)
+        self._version = keyword_engine.version
+        self._cache.clear()
+
+    def _forward_match(self, run: str) -> list[str]:
+        tokens, i = [], 0
+        while i < len(run):
+            size = self._forward.longest(run, i) or 1
+            tokens.append(run[i:i + size])
+            i += size
+        return tokens
+
+    def _backward_match(self, run: str) -> list[str]:
+        reversed_run = run[::-1]
+        tokens, i = [], 0
+        while i < len(reversed_run):
+            size = self._backward.longest(reversed_run, i) or 1
+            tokens.append(reversed_run[i:i + size][::-1])
+            i += size
+        return tokens[::-1]
+
+    def _merge_unknown(self, tokens: list[str]) -> list[str]:
+        """词典外的连续单字合并为候选词"""
+        merged: list[str] = []
+        run: list[str] = []
+
+        def flush():
+            if len(run) == 1:
+                merged.append(run[0])
+            elif run:
+                text = "".join(run)
+                if len(text) <= MAX_UNKNOWN_RUN:
+                    merged.append(text)
+                else:
+                    merged.extend(text[i:i + 2] for i in range(0, len(text), 2))
+            run.clear()
+
+        for token in tokens:
+            if len(token) == 1 and token not in self._forward:
+                run.append(token)
+            else:
+                flush()
+                merged.append(token)
+        flush()
+        return merged
+
+    def _segment_run(self, run: str) -> list[str]:
+        forward = self._forward_match(run)
+        backward = self._backward_match(run)
+
+        def cost(tokens):
+            return len(tokens), sum(1 for t in tokens if len(t) == 1)
+
+        best = forward if cost(forward) < cost(backward) else backward
+        return self._merge_unknown(best)
+
+    def cut(self, title: str) -> tuple[str, ...]:
+        """标题分词（中文词、英文单词与数字），结果缓存"""
+        self._ensure_dictionary()
+        tokens = self._cache.get(title)
+        if tokens is not None:
+            self.hits += 1
+            self._cache.move_to_end(title)
+            return tokens
+        self.misses += 1
+        result: list[str] = []
+        for piece in TOKEN_RE.findall(title):
+            if "一" <= piece[0] <= "鿿":
+                result.extend(self._segment_run(piece))
+            else:
+                result.append(piece)
+        tokens = tuple(result)
+        self._cache[title] = tokens
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "dictionary_words": self._forward.size if self._forward else 0,
+            "cached_titles": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+segmenter = Segmenter(settings.SEGMENT_CACHE_SIZE)
+
+
+def content_words(title: str) -> list[str]:
+    """标题中的实词：至少 2 个字符，去掉纯数字与停用词"""
+    return [w for w in segmenter.cut(title) if len(w) >= 2 and not w.isdigit() and w not in STOPWORDS]
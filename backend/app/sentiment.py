@@ -1,7 +1,25 @@
 """
-情感分析模块 — 基于关键词规则的中文情感判断
+情感分析模块 — 中文标题情感判断
+- 后端接口：一次给一批标题打分，返回 (sentiment_label, sentiment_score)
+- lexicon：情感词典 + 否定词、程度副词、转折/让步结构
+- bayes：基于库中词典或人工给出的情感标签训练的朴素贝叶斯，在进程池中打分，未训练或样本不足时回退到 lexicon
+- SentimentService：按 dedup_key 记忆打分结果，入库时整批调用，不阻塞事件循环
 """
 
+import abc
+import asyncio
+import datetime
+import logging
+import math
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from app.config import settings
+from app.keywords import CompiledKeywords, KeywordMatcher, keyword_engine
+
+logger = logging.getLogger(__name__)
+
 # 积极词汇
 POSITIVE_WORDS = [
     "冠军", "成功", "突破", "创新", "暖心", "点赞", "夺冠", "感动", "团圆", "幸福",
@@ -21,25 +39,374 @@ NEGATIVE_WORDS = [
     "塌方", "崩塌", "侵权", "违规", "违法", "恶性",
 ]
 
+# 否定词：作用于其后同一分句内紧邻的情感词
+NEGATION_WORDS = ["不", "没", "没有", "未", "无", "非", "别", "并非", "不是", "毫无", "绝非", "难以"]
 
-def analyze_sentiment(title: str) -> tuple[str, float]:
-    """
-    分析标题情感
-    返回: (sentiment_label, sentiment_score)
-    - sentiment_label: "positive" / "neutral" / "negative"
-    - sentiment_score: -1.0 ~ 1.0
-    """
-    pos_count = sum(1 for w in POSITIVE_WORDS if w in title)
-    neg_count = sum(1 for w in NEGATIVE_WORDS if w in title)
+# 程度副词及其权重
+DEGREE_WORDS = {
+    "非常": 2.0, "极其": 2.0, "极度": 2.0, "超级": 1.8, "特别": 1.8, "十分": 1.8, "最": 1.8,
+    "格外": 1.6, "太": 1.6, "很": 1.5, "更": 1.3, "较": 0.8, "比较": 0.8, "有点": 0.6,
+    "有些": 0.6, "略": 0.6, "稍微": 0.5,
+}
+
+# 转折词之后的分句是重点，之前的分句减弱；让步词所在分句减弱
+ADVERSATIVE_WORDS = ["但", "但是", "却", "然而", "不过", "可是"]
+CONCESSIVE_WORDS = ["虽然", "虽说", "尽管"]
+# 含修饰字但不是修饰词的常见词，匹配时占位，避免 "最终" 被当作 "最"、"未来" 被当作否定
+PLAIN_WORDS = ["最终", "最后", "最近", "最新", "最高", "最低", "未来", "无人", "无论", "不断", "不少", "别人", "太空", "更新", "非遗"]
+CLAUSE_BREAKS = set("，,。！!？?；;、 \t|")
 
-    total = pos_count + neg_count
-    if total == 0:
-        return "neutral", 0.0
+NEGATION_WEIGHT = -0.8
+MODIFIER_WINDOW = 2  # 修饰词与情感词之间最多隔几个字
+EMPHASIS_WEIGHT = 1.5
+WEAKENED_WEIGHT = 0.5
+LABEL_THRESHOLD = 0.2
+SEGMENT_CHUNK = 200  # bayes 分词每段标题数
+# 可作为训练样本的标签来源（hot_topics.sentiment_source）；bayes 自己的预测不参与，避免重训时自我强化
+TRAINING_SOURCES = ("lexicon", "manual")
 
-    score = (pos_count - neg_count) / total
-    if score > 0.2:
+_POSITIVE_SET = frozenset(POSITIVE_WORDS)
+
+_NEGATION, _DEGREE, _ADVERSATIVE, _CONCESSIVE, _PLAIN, _POLAR = (
+    "negation", "degree", "adversative", "concessive", "plain", "polar")
+
+
+def _label(score: float) -> tuple[str, float]:
+    if score > LABEL_THRESHOLD:
         return "positive", round(min(score, 1.0), 2)
-    elif score < -0.2:
+    elif score < -LABEL_THRESHOLD:
         return "negative", round(max(score, -1.0), 2)
     else:
         return "neutral", round(score, 2)
+
+
+class SentimentBackend(abc.ABC):
+    """情感打分后端：一次给一批标题打分"""
+
+    name: str = ""
+
+    @property
+    def tag(self) -> tuple:
+        """打分结果的版本标识，变化后记忆的结果失效"""
+        return (self.name,)
+
+    @abc.abstractmethod
+    def score_batch(self, titles: list[str]) -> list[tuple[str, float]]:
+        ...
+
+    async def score_batch_async(self, titles: list[str]) -> list[tuple[str, float]]:
+        """在线程中打分，不占用事件循环"""
+        return await asyncio.to_thread(self.score_batch, titles)
+
+
+class LexiconBackend(SentimentBackend):
+    """情感词典打分：否定词翻转、程度副词加权，转折后分句加重、转折前与让步分句减弱"""
+
+    name = "lexicon"
+
+    def __init__(self):
+        modifiers: dict[str, str] = {}
+        for word in NEGATION_WORDS:
+            modifiers[word] = _NEGATION
+        for word in DEGREE_WORDS:
+            modifiers[word] = _DEGREE
+        for word in ADVERSATIVE_WORDS:
+            modifiers[word] = _ADVERSATIVE
+        for word in CONCESSIVE_WORDS:
+            modifiers[word] = _CONCESSIVE
+        for word in PLAIN_WORDS:
+            modifiers[word] = _PLAIN
+        self._modifier_kinds = modifiers
+        self._modifiers = KeywordMatcher(modifiers)
+
+    def _spans(self, title: str, compiled: CompiledKeywords) -> list[tuple[int, int, str, str]]:
+        """情感词与修饰词命中 (start, end, kind, word)；重叠时保留较长的词（"太棒" 不拆成 "太" + 情感词）"""
+        match = compiled.match(title)
+        positive, negative = set(match.positive), set(match.negative)
+        candidates = [
+            (h.start, h.end, _POLAR, h.keyword) for h in match.hits if h.keyword in positive or h.keyword in negative
+        ]
+        candidates += [(h.start, h.end, self._modifier_kinds[h.keyword], h.keyword) for h in self._modifiers.find(title)]
+        candidates.sort(key=lambda s: (s[0] - s[1], s[0]))
+        taken = [False] * len(title)
+        spans = []
+        for span in candidates:
+            if not any(taken[span[0]:span[1]]):
+                taken[span[0]:span[1]] = [True] * (span[1] - span[0])
+                spans.append(span)
+        spans.sort()
+        return spans
+
+    def score_title(self, title: str, compiled: CompiledKeywords | None = None) -> tuple[str, float]:
+        """compiled 为关键词自动机快照；在线程或进程中打分时由调用方传入，不触碰共享的 keyword_engine"""
+        spans = self._spans(title, compiled or keyword_engine.compiled())
+        if not any(kind == _POLAR for _, _, kind, _ in spans):
+            return "neutral", 0.0
+
+        # 分句编号：标点与转折词处断开
+        adversatives = {start for start, _, kind, _ in spans if kind == _ADVERSATIVE}
+        clause, clause_of = 0, []
+        for i, ch in enumerate(title):
+            if ch in CLAUSE_BREAKS or i in adversatives:
+                clause += 1
+            clause_of.append(clause)
+        last_turn = max(adversatives, default=None)
+        concessive_clauses = {clause_of[start] for start, _, kind, _ in spans if kind == _CONCESSIVE}
+
+        total = weight_sum = 0.0
+        pending: list[tuple[int, int, str, str]] = []  # 尚未被情感词消费的修饰词
+        for start, end, kind, word in spans:
+            if kind in (_NEGATION, _DEGREE):
+                pending.append((start, end, kind, word))
+                continue
+            if kind != _POLAR:
+                continue
+            weight = 1.0 if word in _POSITIVE_SET else -1.0
+            for m_start, m_end, m_kind, m_word in pending:
+                if start - m_end > MODIFIER_WINDOW or clause_of[m_start] != clause_of[start]:
+                    continue
+                weight *= NEGATION_WEIGHT if m_kind == _NEGATION else DEGREE_WORDS[m_word]
+            pending = []
+            if last_turn is not None:
+                weight *= EMPHASIS_WEIGHT if start > last_turn else WEAKENED_WEIGHT
+            elif clause_of[start] in concessive_clauses:
+                weight *= WEAKENED_WEIGHT
+            total += weight
+            weight_sum += abs(weight)
+        return _label(total / max(weight_sum, 1.0))
+
+    def score_batch(self, titles: list[str], compiled: CompiledKeywords | None = None) -> list[tuple[str, float]]:
+        compiled = compiled or keyword_engine.compiled()
+        return [self.score_title(t, compiled) for t in titles]
+
+    async def score_batch_async(self, titles: list[str]) -> list[tuple[str, float]]:
+        """自动机在事件循环中取出（配置变化时在此重建），线程内只读这份快照"""
+        return await asyncio.to_thread(self.score_batch, titles, keyword_engine.compiled())
+
+
+@dataclass
+class NaiveBayesModel:
+    """多项式朴素贝叶斯模型（纯数据，可序列化到打分进程）"""
+    labels: tuple[str, ...]
+    log_prior: dict[str, float]
+    log_likelihood: dict[str, dict[str, float]]
+    log_unseen: dict[str, float]  # 训练集中未出现的词
+    vocabulary: frozenset
+    samples: int
+
+
+def fit_naive_bayes(documents: list[tuple[str, ...]], labels: list[str], alpha: float = 1.0) -> NaiveBayesModel:
+    """用分好词的标题和情感标签训练，拉普拉斯平滑"""
+    label_counts = Counter(labels)
+    token_counts: dict[str, Counter] = {label: Counter() for label in label_counts}
+    for tokens, label in zip(documents, labels):
+        token_counts[label].update(tokens)
+    vocabulary = frozenset(t for counts in token_counts.values() for t in counts)
+    size = len(vocabulary)
+    log_prior, log_likelihood, log_unseen = {}, {}, {}
+    for label, counts in token_counts.items():
+        log_prior[label] = math.log(label_counts[label] / len(labels))
+        denominator = sum(counts.values()) + alpha * size
+        log_likelihood[label] = {t: math.log((c + alpha) / denominator) for t, c in counts.items()}
+        log_unseen[label] = math.log(alpha / denominator)
+    return NaiveBayesModel(tuple(sorted(label_counts)), log_prior, log_likelihood, log_unseen, vocabulary, len(labels))
+
+
+def predict_naive_bayes(model: NaiveBayesModel, documents: list[tuple[str, ...]]) -> list[tuple[str, float]]:
+    """返回 (标签, 分数)；分数为 P(positive) - P(negative)，词表外的词不参与"""
+    results = []
+    for tokens in documents:
+        known = [t for t in tokens if t in model.vocabulary]
+        logits = {
+            label: model.log_prior[label] + sum(
+                model.log_likelihood[label].get(t, model.log_unseen[label]) for t in known)
+            for label in model.labels
+        }
+        peak = max(logits.values())
+        weights = {label: math.exp(v - peak) for label, v in logits.items()}
+        norm = sum(weights.values())
+        score = (weights.get("positive", 0.0) - weights.get("negative", 0.0)) / norm
+        results.append((max(logits, key=logits.get), round(score, 2)))
+    return results
+
+
+# 打分进程内的模型：随进程池创建时安装，之后每批只传分词结果
+_worker_model: NaiveBayesModel | None = None
+
+
+def _install_worker_model(model: NaiveBayesModel) -> None:
+    global _worker_model
+    _worker_model = model
+
+
+def _predict_in_worker(documents: list[tuple[str, ...]]) -> list[tuple[str, float]]:
+    return predict_naive_bayes(_worker_model, documents)
+
+
+class NaiveBayesBackend(SentimentBackend):
+    """朴素贝叶斯打分：分词在主进程（复用分词缓存），打分在进程池中进行"""
+
+    name = "bayes"
+
+    def __init__(self, workers: int, fallback: SentimentBackend):
+        self.workers = workers
+        self.fallback = fallback
+        self.model: NaiveBayesModel | None = None
+        self.version = 0
+        self.trained_at: datetime.datetime | None = None
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def tag(self) -> tuple:
+        if self.model is None:
+            return self.fallback.tag
+        return (self.name, self.version)
+
+    def _documents(self, titles: list[str]) -> list[tuple[str, ...]]:
+        from app.segmenter import segmenter
+
+        return [segmenter.cut(t) for t in titles]
+
+    def install(self, model: NaiveBayesModel) -> None:
+        """替换模型；打分进程池随之重建"""
+        self.close()
+        self.model = model
+        self.version += 1
+        self.trained_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def score_batch(self, titles: list[str]) -> list[tuple[str, float]]:
+        if self.model is None:
+            return self.fallback.score_batch(titles)
+        return predict_naive_bayes(self.model, self._documents(titles))
+
+    async def _documents_async(self, titles: list[str]) -> list[tuple[str, ...]]:
+        """分词缓存不是线程安全的，在事件循环中分段分词，段间让出"""
+        documents: list[tuple[str, ...]] = []
+        for i in range(0, len(titles), SEGMENT_CHUNK):
+            documents += self._documents(titles[i:i + SEGMENT_CHUNK])
+            await asyncio.sleep(0)
+        return documents
+
+    async def score_batch_async(self, titles: list[str]) -> list[tuple[str, float]]:
+        if self.model is None:
+            return await self.fallback.score_batch_async(titles)
+        documents = await self._documents_async(titles)
+        if self.workers <= 0:
+            return await asyncio.to_thread(predict_naive_bayes, self.model, documents)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_install_worker_model, initargs=(self.model,))
+        return await asyncio.get_running_loop().run_in_executor(self._pool, _predict_in_worker, documents)
+
+    async def train(self, session) -> int:
+        """用库中最近由词典或人工标注的标题训练；样本或类别不足时保持现状，返回使用的样本数"""
+        from sqlalchemy import select
+
+        from app.models import HotTopic
+
+        result = await session.execute(
+            select(HotTopic.title, HotTopic.sentiment)
+            .where(HotTopic.sentiment.isnot(None), HotTopic.sentiment_source.in_(TRAINING_SOURCES))
+            .order_by(HotTopic.fetched_at.desc())
+            .limit(settings.SENTIMENT_TRAINING_LIMIT)
+        )
+        labelled: dict[str, str] = {}
+        for title, label in result:
+            labelled.setdefault(title, label)  # 按时间倒序，同一标题只取最近一次的标签
+        if len(labelled) < settings.SENTIMENT_MIN_TRAINING or len(set(labelled.values())) < 2:
+            logger.info("Sentiment model not trained: %d labelled titles", len(labelled))
+            return 0
+        titles = list(labelled)
+        documents = await self._documents_async(titles)
+        model = await asyncio.to_thread(fit_naive_bayes, documents, [labelled[t] for t in titles])
+        self.install(model)
+        logger.info("Sentiment model trained on %d titles (%d tokens)", model.samples, len(model.vocabulary))
+        return model.samples
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+lexicon_backend = LexiconBackend()
+bayes_backend = NaiveBayesBackend(settings.SENTIMENT_WORKERS, fallback=lexicon_backend)
+BACKENDS = {b.name: b for b in (lexicon_backend, bayes_backend)}
+
+
+class SentimentService:
+    """按配置选择后端，按 dedup_key 记忆打分结果（后端或模型版本变化后失效）"""
+
+    def __init__(self, cache_size: int):
+        self.cache_size = cache_size
+        self._memo: OrderedDict[str, tuple[tuple, tuple[str, float]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> SentimentBackend:
+        backend = BACKENDS.get(settings.SENTIMENT_BACKEND)
+        if backend is None:
+            logger.warning("Unknown SENTIMENT_BACKEND %r, using lexicon", settings.SENTIMENT_BACKEND)
+            return lexicon_backend
+        return backend
+
+    async def score(self, items: list[tuple[str, str]]) -> list[tuple[str, float]]:
+        """给一批 (dedup_key, 标题) 打分，结果与输入顺序一致；未记忆的标题一次交给后端"""
+        results, _ = await self.score_with_source(items)
+        return results
+
+    async def score_with_source(self, items: list[tuple[str, str]]) -> tuple[list[tuple[str, float]], str]:
+        """同 score，另返回实际打分的后端名（写入 sentiment_source）；同一批结果都来自同一后端版本"""
+        backend = self.backend
+        tag = backend.tag
+        results: dict[str, tuple[str, float]] = {}
+        pending: dict[str, str] = {}
+        for key, title in items:
+            cached = self._memo.get(key)
+            if cached is not None and cached[0] == tag:
+                self.hits += 1
+                self._memo.move_to_end(key)
+                results[key] = cached[1]
+            elif key not in pending:
+                self.misses += 1
+                pending[key] = title
+        if pending:
+            scored = await backend.score_batch_async(list(pending.values()))
+            for key, value in zip(pending, scored):
+                results[key] = value
+                self._memo[key] = (tag, value)
+                self._memo.move_to_end(key)
+            while len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return [results[key] for key, _ in items], tag[0]
+
+    def clear(self) -> None:
+        self._memo.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "effective": self.backend.tag[0],
+            "model_samples": bayes_backend.model.samples if bayes_backend.model else 0,
+            "model_trained_at": bayes_backend.trained_at.isoformat() if bayes_backend.trained_at else None,
+            "memoized": len(self._memo),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+sentiment_service = SentimentService(settings.SENTIMENT_CACHE_SIZE)
+
+
+def analyze_sentiment(title: str) -> tuple[str, float]:
+    """
+    分析单个标题情感（词典后端）
+    返回: (sentiment_label, sentiment_score)
+    - sentiment_label: "positive" / "neutral" / "negative"
+    - sentiment_score: -1.0 ~ 1.0
+    """
+    return lexicon_backend.score_title(title)
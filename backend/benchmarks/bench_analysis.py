@@ -0,0 +1,141 @@
+"""
+分析报告耗时基准：5 个平台 × 100 条的一批数据上 generate_analysis（不调用 LLM）
+
+- before : 改造前的实现（逐条规则分类、正则取词、跨平台与平台洞察中对每对标题重复取词）
+- cold   : 当前实现，分词缓存为空（每个标题分词、匹配一次，批次内共用）
+- warm   : 当前实现，标题已在之前的批次中分过词（常态：榜单在批次间大部分不变）
+
+    cd backend
+    python benchmarks/bench_analysis.py
+    python benchmarks/bench_analysis.py --top-n 50 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analyzer import CATEGORY_RULES, _build_cny_summary, generate_analysis  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.schemas import HotTopicOut  # noqa: E402
+from app.segmenter import load_dictionary_words, segmenter  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+PLATFORMS = ["weibo", "zhihu", "baidu", "douyin", "xiaohongshu"]
+
+
+def make_batch(top_n: int) -> list[HotTopicOut]:
+    """录制的微博标题（各平台错位排列，形成跨平台共同话题），不足部分用词典词组合补齐"""
+    with open(os.path.join(FIXTURES, "weibo", "hotSearch.json"), encoding="utf-8") as f:
+        base = [item["word"] for item in json.load(f)["data"]["realtime"] if item.get("word")]
+    words = [w for w in load_dictionary_words() if len(w) >= 2]
+    topics = []
+    for p_index, platform in enumerate(PLATFORMS):
+        for rank in range(1, top_n + 1):
+            if rank <= len(base) // 2:
+                title = base[(rank + p_index * 3) % len(base)]
+            else:
+                n = rank * 5 + p_index * 101
+                title = words[n % len(words)] + words[(n * 7) % len(words)] + words[(n * 13) % len(words)]
+            topics.append(HotTopicOut(id=len(topics) + 1, platform=platform, title=title, rank=rank,
+                                      fetched_at="2026-02-16T00:00:00Z", is_cny_related=rank % 4 == 0))
+    return topics
+
+
+# ---- 改造前的实现 ----
+
+def legacy_classify(title: str) -> str:
+    for category, keywords in CATEGORY_RULES.items():
+        if any(kw in title for kw in keywords):
+            return category
+    return "📌 其他"
+
+
+def legacy_cross_platform(topics) -> list[dict]:
+    platform_topics: dict[str, list[tuple[str, set[str]]]] = {}
+    for t in topics:
+        platform_topics.setdefault(t.platform, []).append((t.title, set(re.findall(r"[一-鿿]{2,4}", t.title))))
+    cross_hot, seen = [], set()
+    platforms = list(platform_topics)
+    for i, p1 in enumerate(platforms):
+        for t1_title, t1_kws in platform_topics[p1]:
+            if t1_title in seen or len(t1_kws) < 2:
+                continue
+            matched = {p1: t1_title}
+            for p2 in platforms[i + 1:]:
+                for t2_title, t2_kws in platform_topics[p2]:
+                    if len(t1_kws & t2_kws) >= 2:
+                        matched[p2] = t2_title
+                        break
+            if len(matched) >= 2:
+                seen.add(t1_title)
+                cross_hot.append({"platforms": list(matched), "titles": matched, "platform_count": len(matched)})
+    cross_hot.sort(key=lambda x: x["platform_count"], reverse=True)
+    return cross_hot[:10]
+
+
+def legacy_platform_insights(topics) -> dict:
+    by_platform: dict[str, list] = {}
+    for t in topics:
+        by_platform.setdefault(t.platform, []).append(t)
+    insights = {}
+    for platform, ptopics in by_platform.items():
+        other_titles = {t.title for t in topics if t.platform != platform}
+        unique = []
+        for t in ptopics[:20]:
+            kws = set(re.findall(r"[一-鿿]{2,4}", t.title))
+            if all(len(kws & set(re.findall(r"[一-鿿]{2,4}", ot))) < 2 for ot in other_titles):
+                unique.append(t.title)
+        insights[platform] = unique[:5]
+    return insights
+
+
+def legacy_analysis(topics) -> None:
+    categories: dict[str, list[str]] = {}
+    for t in topics:
+        categories.setdefault(legacy_classify(t.title), []).append(t.title)
+    legacy_cross_platform(topics)
+    legacy_platform_insights(topics)
+    _build_cny_summary(topics)
+
+
+def measure(fn, repeat: int, before=None) -> float:
+    runs = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-n", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    settings.OPENAI_API_KEY = None
+    topics = make_batch(args.top_n)
+    asyncio.run(generate_analysis(topics[:5]))  # 编译关键词自动机、构建分词词典，不计入
+
+    rows = [
+        ("before", measure(lambda: legacy_analysis(topics), args.repeat)),
+        ("cold", measure(lambda: asyncio.run(generate_analysis(topics)), args.repeat, before=segmenter.clear_cache)),
+        ("warm", measure(lambda: asyncio.run(generate_analysis(topics)), args.repeat)),
+    ]
+    print(f"{len(PLATFORMS)} platforms x {args.top_n} topics")
+    print(f"{'mode':<8}{'median ms':>10}")
+    for name, seconds in rows:
+        print(f"{name:<8}{seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+跨平台聚类基准：倒排索引 + 并查集 与 改造前的逐平台两两比较
+
+合成数据：由基础词典中的词组成标题，每批 5 个平台 × --top-n 条，约三分之一是跨平台共同话题；
+--batches 表示分析窗口内的批次数（每批约四分之一的话题更替，留在榜上的话题排名变化）。
+分词结果预先缓存，只比较匹配/聚类本身的耗时。
+
+    cd backend
+    python benchmarks/bench_clustering.py
+    python benchmarks/bench_clustering.py --top-n 100 --batches 12
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.clustering import cluster_topics  # noqa: E402
+from app.segmenter import content_words, load_dictionary_words, segmenter  # noqa: E402
+
+PLATFORMS = ["weibo", "zhihu", "baidu", "douyin", "xiaohongshu"]
+SUFFIXES = ["一二", "三四", "五六", "七八", "九十"]
+
+
+def make_batches(top_n: int, batches: int, seed: int = 7) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    vocabulary = [w for w in load_dictionary_words() if len(w) >= 2]
+    stories = [rng.sample(vocabulary, 3) for _ in range(top_n * 3)]
+    topics = []
+    for batch in range(batches):
+        offset = batch * top_n // 4  # 每批约四分之一的话题更替
+        for p_index, platform in enumerate(PLATFORMS):
+            for rank in range(1, top_n + 1):
+                if rank % 3 == 0:
+                    words = stories[(offset + rank) % len(stories)]  # 跨平台共同话题
+                else:
+                    words = stories[(offset + rank * 7 + p_index * 131) % len(stories)]
+                # 各平台对同一话题的措辞不同；同一平台的同一话题在不同批次中标题相同
+                suffix = SUFFIXES[p_index]
+                topics.append(SimpleNamespace(platform=platform, title="".join(words) + suffix, rank=rank))
+    return topics
+
+
+def nested_loop(topics) -> list[dict]:
+    """改造前的 _find_cross_platform（不截断到 10 条）"""
+    platform_topics: dict[str, list[tuple[str, set[str]]]] = {}
+    for t in topics:
+        platform_topics.setdefault(t.platform, []).append((t.title, set(content_words(t.title))))
+    cross_hot, seen = [], set()
+    platforms = list(platform_topics)
+    for i, p1 in enumerate(platforms):
+        for t1_title, t1_kws in platform_topics[p1]:
+            if t1_title in seen or len(t1_kws) < 2:
+                continue
+            matched = {p1: t1_title}
+            for p2 in platforms[i + 1:]:
+                for t2_title, t2_kws in platform_topics[p2]:
+                    if len(t1_kws & t2_kws) >= 2:
+                        matched[p2] = t2_title
+                        break
+            if len(matched) >= 2:
+                seen.add(t1_title)
+                cross_hot.append(matched)
+    return cross_hot
+
+
+def timed(fn, topics, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(topics)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-n", type=int, default=100)
+    parser.add_argument("--batches", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    segmenter.cache_size = 10 ** 6
+    print(f"{'top_n':>6}{'batches':>8}{'topics':>8}{'nested ms':>11}{'index ms':>10}{'stories':>9}")
+    for batches in sorted({1, args.batches}):
+        topics = make_batches(args.top_n, batches)
+        for t in topics:
+            content_words(t.title)  # 预热分词缓存
+        nested, _ = timed(nested_loop, topics, args.repeat)
+        indexed, clustering = timed(cluster_topics, topics, args.repeat)
+        print(f"{args.top_n:>6}{batches:>8}{len(topics):>8}{nested * 1000:>11.1f}{indexed * 1000:>10.1f}"
+              f"{len(clustering.cross_platform()):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+对比「每轮新建客户端」与「长连接池」的抓取耗时、请求数和连接复用
+
+离线回放录制的响应（同 bench_scrapers.py），--latency 为每个请求附加的往返延迟，
+--handshake 为每个新客户端首个请求附加的建连延迟（DNS/TCP/TLS），用来模拟连接复用的收益。
+reuse 为每个客户端平均承载的请求数。
+
+用法：
+    cd backend
+    python benchmarks/bench_http_pool.py --cycles 10 --platform weibo
+    python benchmarks/bench_http_pool.py --latency 0.03 --handshake 0.12
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.config import update_runtime_config  # noqa: E402
+from app.scrapers.http_pool import client_pool  # noqa: E402
+from app.scrapers.replay import ReplayTransport  # noqa: E402
+from app.scrapers.baidu import BaiduScraper  # noqa: E402
+from app.scrapers.douyin import DouyinScraper  # noqa: E402
+from app.scrapers.weibo import WeiboScraper  # noqa: E402
+from app.scrapers.xiaohongshu import XiaohongshuScraper  # noqa: E402
+from app.scrapers.zhihu import ZhihuScraper  # noqa: E402
+
+SCRAPERS = {
+    "weibo": WeiboScraper,
+    "zhihu": ZhihuScraper,
+    "baidu": BaiduScraper,
+    "douyin": DouyinScraper,
+    "xiaohongshu": XiaohongshuScraper,
+}
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+
+
+class _ColdStartTransport(httpx.AsyncBaseTransport):
+    """首个请求附加建连延迟，之后的请求视为复用已有连接"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, handshake: float):
+        self._inner = inner
+        self._handshake = handshake
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._handshake:
+            await asyncio.sleep(self._handshake)
+            self._handshake = 0.0
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def use_cold_start_replay(directory: str, latency: float, handshake: float) -> None:
+    def factory(platform: str) -> _ColdStartTransport:
+        return _ColdStartTransport(ReplayTransport(Path(directory) / platform, latency=latency), handshake)
+
+    client_pool.set_transport_factory(factory)
+
+
+async def run_cycles(platform: str, cycles: int, pooled: bool) -> dict:
+    scraper = SCRAPERS[platform]()
+    before = dict(client_pool.stats()["platforms"].get(platform, {}))
+
+    durations = []
+    for _ in range(cycles):
+        scraper.forget_payloads()  # 每轮完整下载，不走条件请求
+        start = time.perf_counter()
+        await scraper.fetch()
+        durations.append(time.perf_counter() - start)
+        if not pooled:
+            # 模拟旧行为：每轮丢弃客户端，重新 DNS/TCP/TLS 握手并重新获取 Cookie
+            await client_pool.reset(platform)
+    await client_pool.close()
+
+    after = client_pool.stats()["platforms"].get(platform, {})
+    stats = {k: after.get(k, 0) - before.get(k, 0) for k in ("requests", "bytes_downloaded", "clients_opened")}
+    durations.sort()
+    return {
+        "mode": "pooled" if pooled else "fresh",
+        "cycles": cycles,
+        "mean_ms": round(sum(durations) / len(durations) * 1000, 1),
+        "p50_ms": round(durations[len(durations) // 2] * 1000, 1),
+        **stats,
+        "reuse": round(stats["requests"] / max(stats["clients_opened"], 1), 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--platform", default="baidu", choices=sorted(SCRAPERS))
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="录制目录（<目录>/<平台>/index.json）")
+    parser.add_argument("--latency", type=float, default=0.03, help="每个请求附加的往返延迟（秒）")
+    parser.add_argument("--handshake", type=float, default=0.12, help="新客户端首个请求附加的建连延迟（秒）")
+    args = parser.parse_args()
+
+    update_runtime_config({"host_rate_limit_enabled": False})
+    use_cold_start_replay(args.dir, args.latency, args.handshake)
+    print(f"httpx {httpx.__version__}, platform={args.platform}, latency={args.latency}s, handshake={args.handshake}s")
+    for pooled in (False, True):
+        result = await run_cycles(args.platform, args.cycles, pooled)
+        print("  ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
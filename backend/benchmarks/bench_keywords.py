@@ -0,0 +1,72 @@
+"""
+关键词匹配基准：逐词 `in` 循环与 Aho-Corasick 自动机随关键词数量的耗时变化
+
+对每个关键词规模，扫描同一批标题（录制的热榜标题，重复扩充到 --titles 条）：
+- loop  : 改造前的写法，每个标题对每个关键词做一次 `kw in title`
+- engine: 自动机单次扫描返回全部命中
+另输出编译自动机的耗时（配置变更时才需要重建）。
+
+    cd backend
+    python benchmarks/bench_keywords.py
+    python benchmarks/bench_keywords.py --sizes 30,300,3000,30000 --titles 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.keywords import KeywordMatcher  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+
+
+def load_titles(count: int) -> list[str]:
+    with open(os.path.join(FIXTURES, "weibo", "hotSearch.json"), encoding="utf-8") as f:
+        titles = [item["word"] for item in json.load(f)["data"]["realtime"] if item.get("word")]
+    return [titles[i % len(titles)] + str(i // len(titles)) for i in range(count)]
+
+
+def make_keywords(size: int, rng: random.Random) -> list[str]:
+    """春节关键词 + 随机生成的二到四字中文词，模拟大量自定义关键词"""
+    words = list(settings.CNY_KEYWORDS)
+    while len(words) < size:
+        words.append("".join(chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(rng.randint(2, 4))))
+    return words[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="30,300,3000")
+    parser.add_argument("--titles", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    titles = load_titles(args.titles)
+    print(f"{'keywords':>9}{'loop ms':>10}{'engine ms':>11}{'speedup':>9}{'compile ms':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        keywords = make_keywords(size, rng)
+
+        start = time.perf_counter()
+        loop_hits = sum(1 for title in titles for kw in keywords if kw in title)
+        loop_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        engine_hits = sum(len(matcher.found(title)) for title in titles)
+        engine_ms = (time.perf_counter() - start) * 1000
+
+        assert loop_hits == engine_hits, (loop_hits, engine_hits)
+        print(f"{size:>9}{loop_ms:>10.1f}{engine_ms:>11.1f}{loop_ms / engine_ms:>8.1f}x{compile_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+近似重复查找基准：LSH 索引与逐条比较（title_similarity 式两两比较）的单次查找耗时随窗口大小的变化
+
+    cd backend
+    python benchmarks/bench_neardup.py
+    python benchmarks/bench_neardup.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dedup import NearDuplicateIndex, jaccard, shingles  # noqa: E402
+from app.segmenter import load_dictionary_words  # noqa: E402
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def make_titles(count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    words = [w for w in load_dictionary_words() if len(w) >= 2]
+    return ["".join(rng.sample(words, 4)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'indexed':>8}{'scan us':>10}{'lsh us':>9}{'candidates':>12}{'recall':>8}")
+    for size in args.sizes:
+        titles = make_titles(size)
+        index = NearDuplicateIndex(0.7, datetime.timedelta(hours=6))
+        for i, title in enumerate(titles):
+            index.add("weibo", str(i), title, NOW)
+        grams = [shingles(t) for t in titles]
+        # 查询：一半是已有标题的措辞变体，一半是新标题
+        queries = [titles[i * 7 % size] + "了" for i in range(args.queries // 2)]
+        queries += make_titles(args.queries - len(queries), seed=size)
+
+        start = time.perf_counter()
+        expected = []
+        for q in queries:
+            qg = shingles(q)
+            best = max(range(size), key=lambda i: jaccard(qg, grams[i]))
+            expected.append(str(best) if jaccard(qg, grams[best]) >= 0.7 else None)
+        scan = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        found = [index.find("weibo", q) for q in queries]
+        lsh = (time.perf_counter() - start) / len(queries)
+
+        hits = [e for e in expected if e is not None]
+        recall = sum(f == e for f, e in zip(found, expected) if e is not None) / max(len(hits), 1)
+        print(f"{size:>8}{scan * 1e6:>10.0f}{lsh * 1e6:>9.0f}{index.stats()['avg_candidates']:>12}{recall:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
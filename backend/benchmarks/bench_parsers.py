@@ -0,0 +1,101 @@
+"""
+HTML 解析后端基准：解析耗时与峰值内存
+
+对比三种方式：
+- legacy : resp.text 解码 + BeautifulSoup(html.parser) + CSS select（改造前的写法）
+- bs4    : 解析层 bs4 后端（从字节解析）
+- lxml   : 解析层 lxml 后端（XPath，只抽取目标节点）
+
+峰值内存为 tracemalloc 统计的 Python 堆，不含 libxml2 在 C 侧的分配。
+
+用法：
+    cd backend
+    python benchmarks/bench_parsers.py                       # 使用合成页面
+    python benchmarks/bench_parsers.py --page saved.html:tophub --page board.html:baidu
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scrapers.baidu import BOARD_TITLES  # noqa: E402
+from app.scrapers.parsing import TOPHUB_LINKS, get_extractor  # noqa: E402
+from app.scrapers.xiaohongshu import EXPLORE_HOT_ITEMS  # noqa: E402
+
+QUERIES = {"tophub": TOPHUB_LINKS, "baidu": BOARD_TITLES, "xiaohongshu": EXPLORE_HOT_ITEMS}
+
+
+def synthetic_page(kind: str, rows: int = 50, filler: int = 2000) -> bytes:
+    """生成与真实页面结构相近、带大量无关节点的页面"""
+    noise = "".join(f'<div class="nav-{i}"><span>导航{i}</span><p>无关内容{i}</p></div>' for i in range(filler))
+    if kind == "baidu":
+        body = "".join(
+            f'<div class="category-wrap_iQLoo"><div class="c-single-text-ellipsis">百度热搜标题{i}</div>'
+            f'<div class="hot-index_1Bl1a">{i * 1000}</div></div>'
+            for i in range(rows)
+        )
+    elif kind == "xiaohongshu":
+        body = "".join(f'<div class="hot-item">小红书热点{i}</div>' for i in range(rows))
+    else:
+        body = "<table>" + "".join(
+            f'<tr><td>{i}.</td><td class="al"><a href="/l?e={i}">聚合热榜标题{i}</a></td><td>{i}万</td></tr>'
+            for i in range(rows)
+        ) + "</table>"
+    return f'<html><head><meta charset="utf-8"></head><body>{noise}{body}{noise}</body></html>'.encode()
+
+
+def legacy(content: bytes, kind: str) -> int:
+    from bs4 import BeautifulSoup
+
+    text = content.decode("utf-8")
+    soup = BeautifulSoup(text, "html.parser")
+    return len([el.get_text(strip=True) for el in soup.select(QUERIES[kind].css)])
+
+
+def backend(name: str):
+    extractor = get_extractor(name)
+    return lambda content, kind: len(extractor.extract(content, QUERIES[kind]))
+
+
+def measure(fn, content: bytes, kind: str, repeat: int) -> tuple[float, float, int]:
+    fn(content, kind)  # 预热（导入模块等）
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = fn(content, kind)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    fn(content, kind)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024, found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", action="append", default=[], help="path:kind，kind 取 tophub/baidu/xiaohongshu")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages: list[tuple[str, str, bytes]] = []
+    for spec in args.page:
+        path, _, kind = spec.rpartition(":")
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), kind, f.read()))
+    if not pages:
+        pages = [(f"synthetic-{k}", k, synthetic_page(k)) for k in QUERIES]
+
+    runners = {"legacy": legacy, "bs4": backend("bs4"), "lxml": backend("lxml")}
+    print(f"{'page':<24}{'size_kb':>9}{'parser':>8}{'ms/page':>10}{'peak_kb':>10}{'nodes':>7}")
+    for name, kind, content in pages:
+        for runner_name, fn in runners.items():
+            ms, peak_kb, found = measure(fn, content, kind, args.repeat)
+            print(f"{name:<24}{len(content) / 1024:>9.1f}{runner_name:>8}{ms:>10.2f}{peak_kb:>10.0f}{found:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+批量关键词打分基准：逐条调用 _classify_topic / _is_cny_related / analyze_sentiment 与 score_titles 向量化打分
+
+标题取自录制的微博热搜（末尾加序号区分，重复扩充到各规模），两种方式的结果逐条核对一致。
+
+    cd backend
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analyzer import _classify_topic  # noqa: E402
+from app.keywords import keyword_engine  # noqa: E402
+from app.scoring import score_titles, scoring_lexicon  # noqa: E402
+from app.sentiment import analyze_sentiment  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+
+
+def load_titles(count: int) -> list[str]:
+    with open(os.path.join(FIXTURES, "weibo", "hotSearch.json"), encoding="utf-8") as f:
+        titles = [item["word"] for item in json.load(f)["data"]["realtime"] if item.get("word")]
+    return [titles[i % len(titles)] + str(i // len(titles)) for i in range(count)]
+
+
+def per_title(titles: list[str]) -> list[tuple]:
+    return [(_classify_topic(t), keyword_engine.match(t).cny, analyze_sentiment(t)) for t in titles]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scoring_lexicon()
+    print(f"lexicon build: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"{'titles':>9}{'per-title s':>13}{'batch s':>10}{'speedup':>9}{'fallback':>10}  match")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        titles = load_titles(size)
+        start = time.perf_counter()
+        expected = per_title(titles)
+        loop = time.perf_counter() - start
+        start = time.perf_counter()
+        scores = score_titles(titles)
+        batch = time.perf_counter() - start
+        same = expected == list(zip(scores.categories, scores.cny.tolist(), scores.sentiments))
+        print(f"{size:>9}{loop:>13.2f}{batch:>10.2f}{loop / batch:>8.1f}x{scores.fallback:>10}  {same}")
+
+
+if __name__ == "__main__":
+    main()
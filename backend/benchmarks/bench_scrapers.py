@@ -0,0 +1,122 @@
+"""
+爬虫回放基准：离线回放录制的响应，测量每个平台完整抓取路径的吞吐
+
+每轮调用 scraper.fetch()（连接池客户端 → 回放传输 → 解析 → HotTopicCreate），
+并清空条件请求状态，保证每轮都完整解析一次。输出：
+- pages/s、topics/s：单平台串行回放的吞吐
+- alloc_kb / blocks：单轮抓取的 tracemalloc 峰值，以及结束时仍存活的分配块数
+
+--latency / --fault 注入延迟和故障，观察超时、对冲与熔断的耗时，例如：
+    cd backend
+    python benchmarks/bench_scrapers.py
+    python benchmarks/bench_scrapers.py --dir recordings/ --repeat 200
+    python benchmarks/bench_scrapers.py --latency 0.05 --fault douyin.com:delay=2 --fault tophub.today:status=503
+    python benchmarks/bench_scrapers.py --rate-limit --repeat 10   # 观察按主机限速下的等待
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import update_runtime_config  # noqa: E402
+from app.scrapers.baidu import BaiduScraper  # noqa: E402
+from app.scrapers.breaker import CircuitBreaker  # noqa: E402
+from app.scrapers.douyin import DouyinScraper  # noqa: E402
+from app.scrapers.http_pool import client_pool  # noqa: E402
+from app.scrapers.ratelimit import host_limiter  # noqa: E402
+from app.scrapers.replay import Fault, use_replay  # noqa: E402
+from app.scrapers.weibo import WeiboScraper  # noqa: E402
+from app.scrapers.xiaohongshu import XiaohongshuScraper  # noqa: E402
+from app.scrapers.zhihu import ZhihuScraper  # noqa: E402
+
+SCRAPERS = [WeiboScraper, ZhihuScraper, BaiduScraper, DouyinScraper, XiaohongshuScraper]
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+
+
+def parse_fault(spec: str) -> tuple[str, Fault]:
+    """url片段:delay=秒,status=码,times=次数"""
+    fragment, _, options = spec.partition(":")
+    fault = Fault()
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        setattr(fault, key, float(value) if key == "delay" else int(value))
+    return fragment, fault
+
+
+async def fetch_once(scraper) -> int:
+    scraper.forget_payloads()
+    try:
+        return len(await scraper.fetch())
+    except Exception:
+        return -1
+
+
+async def bench(scraper, repeat: int) -> dict:
+    # 熔断阈值放大，故障注入时也完整跑满每一轮
+    scraper.breaker = CircuitBreaker(failure_threshold=repeat + 1, recovery_seconds=0)
+    await fetch_once(scraper)  # 预热：建客户端、导入解析后端
+
+    topics = failures = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = await fetch_once(scraper)
+        if found < 0:
+            failures += 1
+        else:
+            topics += found
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await fetch_once(scraper)
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return {
+        "pages_s": repeat / elapsed,
+        "topics_s": topics / elapsed,
+        "ms": elapsed / repeat * 1000,
+        "alloc_kb": peak / 1024,
+        "blocks": blocks,
+        "failures": failures,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="录制目录（<目录>/<平台>/index.json）")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求附加的延迟（秒）")
+    parser.add_argument("--fault", action="append", default=[], help="url片段:delay=秒,status=码,times=次数")
+    parser.add_argument("--platform", action="append", default=[])
+    parser.add_argument("--rate-limit", action="store_true", help="保留按主机限速（默认关闭以测量解析吞吐）")
+    args = parser.parse_args()
+
+    update_runtime_config({"host_rate_limit_enabled": args.rate_limit})
+
+    faults = dict(parse_fault(spec) for spec in args.fault)
+    use_replay(args.dir, latency=args.latency, faults=faults)
+    scrapers = [cls() for cls in SCRAPERS if not args.platform or cls.platform in args.platform]
+
+    print(f"{'platform':<13}{'pages/s':>9}{'topics/s':>10}{'ms/page':>9}{'alloc_kb':>10}{'blocks':>8}{'failed':>8}")
+    try:
+        for scraper in scrapers:
+            r = await bench(scraper, args.repeat)
+            print(f"{scraper.platform:<13}{r['pages_s']:>9.1f}{r['topics_s']:>10.0f}{r['ms']:>9.2f}"
+                  f"{r['alloc_kb']:>10.0f}{r['blocks']:>8}{r['failures']:>8}")
+    finally:
+        await client_pool.close()
+
+    if args.rate_limit:
+        print(f"\n{'host':<24}{'requests':>9}{'waited':>8}{'total_ms':>10}{'max_ms':>9}{'p95_ms':>9}")
+        for host, st in host_limiter.stats()["hosts"].items():
+            print(f"{host:<24}{st['requests']:>9}{st['waited']:>8}{st['total_wait_ms']:>10.0f}"
+                  f"{st['max_wait_ms']:>9.0f}{st['p95_wait_ms']:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
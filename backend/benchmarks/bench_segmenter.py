@@ -0,0 +1,63 @@
+"""
+分词基准：标题分词吞吐与缓存收益
+
+- regex : 改造前的写法 re.findall(r"[一-鿿]{2,4}")（只作耗时参照，切分结果不可用）
+- cold  : 每个标题首次分词（双向最大匹配，缓存未命中）
+- warm  : 同一批标题再次分词（命中 LRU 缓存，模拟跨请求、跨周期重复出现的标题）
+
+    cd backend
+    python benchmarks/bench_segmenter.py
+    python benchmarks/bench_segmenter.py --titles 50000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.segmenter import Segmenter  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+
+
+def load_titles(count: int) -> list[str]:
+    """录制的热榜标题，加上序号后缀扩充为互不相同的标题"""
+    with open(os.path.join(FIXTURES, "weibo", "hotSearch.json"), encoding="utf-8") as f:
+        base = [item["word"] for item in json.load(f)["data"]["realtime"] if item.get("word")]
+    return [f"{base[i % len(base)]}第{i // len(base)}期" for i in range(count)]
+
+
+def timed(fn, titles: list[str]) -> float:
+    start = time.perf_counter()
+    for title in titles:
+        fn(title)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--titles", type=int, default=20000)
+    args = parser.parse_args()
+
+    titles = load_titles(args.titles)
+    segmenter = Segmenter(cache_size=len(titles))
+    segmenter.cut("预热")  # 构建词典前缀树，不计入
+
+    pattern = re.compile(r"[一-鿿]{2,4}")
+    rows = [
+        ("regex", timed(pattern.findall, titles)),
+        ("cold", timed(segmenter.cut, titles)),
+        ("warm", timed(segmenter.cut, titles)),
+    ]
+    print(f"{'mode':<8}{'titles/s':>12}{'us/title':>10}")
+    for name, elapsed in rows:
+        print(f"{name:<8}{len(titles) / elapsed:>12.0f}{elapsed / len(titles) * 1e6:>10.1f}")
+    print(f"\n{segmenter.stats()}")
+
+
+if __name__ == "__main__":
+    main()
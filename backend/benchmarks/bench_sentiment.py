@@ -0,0 +1,110 @@
+"""
+情感打分基准：整批打分吞吐、记忆收益与事件循环阻塞
+
+- inline  : 改造前的写法，在事件循环中逐条调用 analyze_sentiment
+- lexicon : SentimentService 整批交给词典后端（线程中打分）
+- bayes   : 朴素贝叶斯后端（用词典标签训练），--workers 个打分进程；0 为线程
+- memo    : 同一批 dedup_key 再次打分（命中记忆）
+
+同时记录打分期间事件循环的最大延迟（每 1ms 一次心跳），代表 API 请求被阻塞的最长时间。
+
+    cd backend
+    python benchmarks/bench_sentiment.py
+    python benchmarks/bench_sentiment.py --titles 50000 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.segmenter import segmenter  # noqa: E402
+from app.sentiment import (  # noqa: E402
+    NaiveBayesBackend,
+    SentimentService,
+    analyze_sentiment,
+    fit_naive_bayes,
+    lexicon_backend,
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "responses")
+
+
+def load_titles(count: int) -> list[str]:
+    """录制的热榜标题，加上序号后缀扩充为互不相同的标题"""
+    with open(os.path.join(FIXTURES, "weibo", "hotSearch.json"), encoding="utf-8") as f:
+        base = [item["word"] for item in json.load(f)["data"]["realtime"] if item.get("word")]
+    return [f"{base[i % len(base)]}第{i // len(base)}期" for i in range(count)]
+
+
+async def with_heartbeat(job) -> tuple[float, float]:
+    """运行 job，返回 (耗时, 期间事件循环最大延迟)"""
+    lag = 0.0
+    done = False
+
+    async def heartbeat():
+        nonlocal lag
+        while not done:
+            tick = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - tick - 0.001)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await job()
+    elapsed = time.perf_counter() - start
+    done = True
+    await beat
+    return elapsed, lag
+
+
+async def run(titles: list[str], workers: int) -> list[tuple[str, float, float]]:
+    items = [(f"k{i}", t) for i, t in enumerate(titles)]
+    rows = []
+
+    async def inline():
+        for title in titles:
+            analyze_sentiment(title)
+
+    rows.append(("inline", *await with_heartbeat(inline)))
+
+    settings.SENTIMENT_BACKEND = "lexicon"
+    service = SentimentService(cache_size=len(items))
+    rows.append(("lexicon", *await with_heartbeat(lambda: service.score(items))))
+    rows.append(("memo", *await with_heartbeat(lambda: service.score(items))))
+
+    # 用词典标签训练，模拟库中积累的已标注标题
+    labels = [label for label, _ in lexicon_backend.score_batch(titles)]
+    bayes = NaiveBayesBackend(workers, fallback=lexicon_backend)
+    bayes.install(fit_naive_bayes([segmenter.cut(t) for t in titles], labels))
+    segmenter.clear_cache()
+    try:
+        await bayes.score_batch_async(titles[:10])  # 启动打分进程，不计入
+        rows.append((f"bayes/{workers}", *await with_heartbeat(lambda: bayes.score_batch_async(titles))))
+    finally:
+        bayes.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--titles", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    titles = load_titles(args.titles)
+    analyze_sentiment("预热")  # 编译关键词自动机，不计入
+    rows = asyncio.run(run(titles, args.workers))
+    print(f"{'mode':<10}{'titles/s':>12}{'us/title':>10}{'max loop lag ms':>17}")
+    for name, elapsed, lag in rows:
+        print(f"{name:<10}{len(titles) / elapsed:>12.0f}{elapsed / len(titles) * 1e6:>10.1f}{lag * 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
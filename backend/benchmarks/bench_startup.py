@@ -0,0 +1,108 @@
+"""
+启动耗时基准：确认仅提供 API 的进程与测试不再为用不到的爬虫和解析器付出导入成本
+
+每项在全新子进程中测量（避免模块缓存），输出中位数：
+- import app.main：应用导入耗时，以及导入后已加载的爬虫模块 / HTML 解析库
+- load <平台>：首次取用某个平台爬虫的耗时（导入模块 + 实例化 + 首次解析所需的解析库）
+- lifespan：服务可以响应请求的耗时，与首轮抓取（回放录制响应，带 --latency 延迟）完成的耗时
+
+    cd backend
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --latency 0.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(BACKEND, "tests", "fixtures", "responses")
+WATCHED = ("app.scrapers.weibo", "app.scrapers.zhihu", "app.scrapers.baidu", "app.scrapers.douyin",
+           "app.scrapers.xiaohongshu", "bs4", "lxml")
+
+IMPORT_APP = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+loaded = sorted({{m.split(".")[-1] if m.startswith("app.") else m.split(".")[0]
+                 for m in sys.modules if m.startswith({WATCHED!r})}})
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+LOAD_SCRAPER = """
+import json, sys, time
+import app.scrapers.base  # 公共依赖（httpx 等）所有平台共用，不计入单个平台
+from app.scrapers.registry import scraper_registry
+start = time.perf_counter()
+scraper = scraper_registry.get(sys.argv[1])
+# 首次解析时才导入解析库，这里解析一个空片段把这部分成本计入
+from app.scrapers.parsing import NodeQuery, get_extractor
+get_extractor(scraper.html_parser).extract(b"<p></p>", NodeQuery(css="p", xpath="//p"))
+print(json.dumps({"seconds": time.perf_counter() - start, "loaded": []}))
+"""
+
+LIFESPAN = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main as main
+from app.scrapers import replay
+
+replay.install_from_settings = lambda: replay.use_replay(sys.argv[1], latency=float(sys.argv[2]))
+
+async def run():
+    async with main.lifespan(main.app):
+        ready = time.perf_counter() - start
+        while main._scrape_count == 0:
+            await asyncio.sleep(0.01)
+        scraped = time.perf_counter() - start
+    return ready, scraped
+
+ready, scraped = asyncio.run(run())
+print(json.dumps({"seconds": ready, "scraped": scraped, "loaded": []}))
+"""
+
+
+def run_child(code: str, *args: str, env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", code, *args], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(label: str, code: str, *args: str, repeat: int, env: dict) -> None:
+    runs = [run_child(code, *args, env=env) for _ in range(repeat)]
+    seconds = statistics.median(r["seconds"] for r in runs) * 1000
+    extra = ""
+    if "scraped" in runs[0]:
+        extra = f"first scrape {statistics.median(r['scraped'] for r in runs) * 1000:.0f} ms"
+    elif runs[0]["loaded"] or label.startswith("import"):
+        extra = "loaded: " + (", ".join(runs[0]["loaded"]) or "-")
+    print(f"{label:<22}{seconds:>10.1f}  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="回放每个请求附加的延迟（秒）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+            "SCRAPE_REPLAY_DIR": FIXTURES,
+            "HOST_RATE_LIMIT_ENABLED": "false",
+        }
+        print(f"{'step':<22}{'median ms':>10}")
+        measure("import app.main", IMPORT_APP, repeat=args.repeat, env=env)
+        for platform in ("weibo", "zhihu", "baidu", "douyin", "xiaohongshu"):
+            measure(f"load {platform}", LOAD_SCRAPER, platform, repeat=args.repeat, env=env)
+        measure("lifespan ready", LIFESPAN, FIXTURES, str(args.latency), repeat=args.repeat, env=env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import pytest
+
+from app.dedup import near_dup_index
+from app.events import event_tracker
+from app.fastlane import fast_lane
+from app.network import cooccurrence_graph
+from app.scrapers.ratelimit import host_limiter
+from app.scrapers.tophub import tophub_source
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_state():
+    """Tophub 共享缓存、主机限速令牌桶、快速通道快照、近似重复索引、活跃事件与共现网络写入状态是进程级的，每个用例从初始状态开始"""
+    tophub_source.clear()
+    host_limiter.reset()
+    fast_lane.clear()
+    near_dup_index.clear()
+    event_tracker.reset()
+    cooccurrence_graph.reset()
+    yield
+    tophub_source.clear()
+    host_limiter.reset()
+    fast_lane.clear()
+    near_dup_index.clear()
+    event_tracker.reset()
+    cooccurrence_graph.reset()
@@ -62,3 +62,35 @@ class TestCrossPlatform:
         topics = [make_topic("独一无二的话题", "weibo")]
         result = detect_cross_platform(topics)
         assert len(result) == 0
+
+
+class TestBatchFeatures:
+    def test_each_title_tokenized_once(self, monkeypatch):
+        import asyncio
+
+        import app.features
+        from app.analyzer import generate_analysis
+        from app.config import settings
+
+        calls = []
+        real = app.features.content_words
+        monkeypatch.setattr(app.features, "content_words", lambda title: calls.append(title) or real(title))
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", None)
+        topics = [
+            make_topic("春晚节目单曝光", "weibo"),
+            make_topic("春晚节目单公布", "zhihu"),
+            make_topic("高铁抢票攻略", "weibo", rank=2),
+            make_topic("高铁抢票攻略", "baidu"),
+        ]
+        report = asyncio.run(generate_analysis(topics))
+        assert sorted(calls) == sorted({t.title for t in topics})
+        assert len(report.cross_platform_hot) == 2
+        assert {i.platform: i.unique_topics for i in report.platform_insights} == {
+            "weibo": [], "zhihu": [], "baidu": []}
+
+    def test_category_matches_classifier(self):
+        from app.features import BatchFeatures
+
+        features = BatchFeatures([])
+        for title in ("2025春晚节目单公布", "一个很奇怪的标题", "春运高铁抢票"):
+            assert features.category(title) == classify_topic(title)
@@ -0,0 +1,92 @@
+"""测试按平台熔断"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.scrapers.baidu import BaiduScraper
+from app.scrapers.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from app.scrapers.http_pool import client_pool
+
+BAIDU_HTML = '<div class="c-single-text-ellipsis">春晚节目单曝光</div>'
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=60)
+        breaker.record_failure(RuntimeError("boom"))
+        assert breaker.state == CLOSED and breaker.allow()
+        breaker.record_failure(RuntimeError("boom"))
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.to_dict()["recent_failures"][-1]["error"] == "boom"
+
+    def test_half_open_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0)
+        breaker.record_failure(RuntimeError())
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # 同一时间只放行一次探测
+
+    def test_probe_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0)
+        breaker.record_failure(RuntimeError())
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.consecutive_failures == 0
+
+    def test_probe_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_seconds=0)
+        for _ in range(3):
+            breaker.record_failure(RuntimeError())
+        breaker.allow()
+        breaker.record_failure(RuntimeError())
+        assert breaker.state == OPEN
+
+
+class TestScraperBreaker:
+    def test_failing_platform_is_skipped_without_requests(self):
+        calls = []
+
+        def handler(req):
+            calls.append(req.url)
+            return httpx.Response(503)
+
+        scraper = BaiduScraper()
+        scraper.breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=60)
+        client_pool.set_transport_factory(lambda platform: httpx.MockTransport(handler))
+
+        async def cycles():
+            try:
+                for _ in range(2):
+                    with pytest.raises(httpx.HTTPStatusError):
+                        await scraper.fetch()
+                with pytest.raises(CircuitOpen):
+                    await scraper.fetch()
+            finally:
+                await client_pool.close()
+                client_pool.set_transport_factory(None)
+
+        asyncio.run(cycles())
+        assert len(calls) == 2  # 不再在周期内重试，也不再请求已熔断的平台
+
+    def test_recovers_after_probe(self):
+        pages = iter([httpx.Response(503), httpx.Response(200, text=BAIDU_HTML)])
+        scraper = BaiduScraper()
+        scraper.breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0)
+        client_pool.set_transport_factory(lambda platform: httpx.MockTransport(lambda req: next(pages)))
+
+        async def cycles():
+            try:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await scraper.fetch()
+                return await scraper.fetch()
+            finally:
+                await client_pool.close()
+                client_pool.set_transport_factory(None)
+
+        topics = asyncio.run(cycles())
+        assert topics[0].title == "春晚节目单曝光"
+        assert scraper.breaker.state == CLOSED
@@ -0,0 +1,74 @@
+"""测试跨平台话题聚类"""
+
+from app.analyzer import _build_platform_insights, _find_cross_platform
+from app.clustering import UnionFind, candidate_pairs, cluster_topics
+from app.schemas import HotTopicOut
+
+
+def topic(title: str, platform: str, rank: int = 1) -> HotTopicOut:
+    return HotTopicOut(id=1, platform=platform, title=title, rank=rank, fetched_at="2026-02-16T00:00:00Z")
+
+
+class TestUnionFind:
+    def test_union_and_find(self):
+        uf = UnionFind(5)
+        uf.union(0, 1)
+        uf.union(3, 4)
+        uf.union(1, 4)
+        assert len({uf.find(i) for i in range(5)}) == 2
+        assert uf.find(0) == uf.find(3) != uf.find(2)
+
+
+class TestCandidatePairs:
+    def test_pairs_share_two_words(self):
+        docs = [frozenset({"春晚", "节目单"}), frozenset({"春晚", "节目单", "曝光"}), frozenset({"春晚", "彩排"})]
+        assert list(candidate_pairs(docs)) == [(0, 1)]
+
+    def test_frequent_words_still_count(self, monkeypatch):
+        monkeypatch.setattr("app.clustering.MAX_POSTINGS", 2)
+        monkeypatch.setattr("app.clustering.MAX_DF_RATIO", 0)
+        # "春节" 出现在 3 个文档中，成为泛词：只共享泛词的对不产生，稀有词 + 泛词的对仍保留
+        docs = [frozenset({"春节", "红包"}), frozenset({"春节", "红包"}), frozenset({"春节", "回家"})]
+        assert list(candidate_pairs(docs)) == [(0, 1)]
+
+
+class TestClusterTopics:
+    def test_transitive_story_keeps_all_members(self):
+        clustering = cluster_topics([
+            topic("春晚节目单曝光", "weibo", 3),
+            topic("2025春晚节目单", "zhihu", 1),
+            topic("春晚节目单彩排", "baidu", 8),
+            topic("春晚节目单曝光", "weibo", 1),  # 同一平台同一标题的另一批次
+            topic("高铁抢票攻略", "douyin", 2),
+        ])
+        story = clustering.cross_platform()[0]
+        assert story.platforms == ["weibo", "zhihu", "baidu"]
+        assert [m.title for m in story.members] == ["春晚节目单曝光", "2025春晚节目单", "春晚节目单彩排"]
+        assert story.members[0].rank == 1
+        assert story.keywords == ["春晚", "节目单"]
+        assert len(clustering.stories) == 2
+
+    def test_ranked_by_platforms_then_score(self):
+        result = _find_cross_platform([
+            topic("高铁抢票攻略", "weibo", 9),
+            topic("高铁抢票难", "zhihu", 9),
+            topic("春晚节目单曝光", "weibo", 1),
+            topic("春晚节目单公布", "zhihu", 2),
+            topic("除夕年夜饭预订", "weibo", 5),
+            topic("年夜饭预订火爆", "zhihu", 5),
+            topic("年夜饭预订火爆了", "baidu", 5),
+        ])
+        assert [r["keyword"] for r in result] == ["年夜饭、预订、火爆", "春晚、节目单", "高铁、抢票"]
+        assert result[0]["platform_count"] == 3 and result[0]["topic_count"] == 3
+        assert result[1]["titles"] == {"weibo": "春晚节目单曝光", "zhihu": "春晚节目单公布"}
+        assert result[1]["score"] > result[2]["score"]
+
+    def test_unique_topics_use_direct_links(self):
+        topics = [
+            topic("春晚节目单曝光", "weibo"),
+            topic("春晚节目单公布", "zhihu"),
+            topic("高铁抢票攻略", "weibo", 2),
+        ]
+        insights = {i.platform: i for i in _build_platform_insights(topics)}
+        assert insights["weibo"].unique_topics == ["高铁抢票攻略"]
+        assert insights["zhihu"].unique_topics == []
@@ -0,0 +1,87 @@
+"""测试条件请求与榜单未变化短路"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.scrapers.base import PayloadUnchanged
+from app.scrapers.baidu import BaiduScraper
+from app.scrapers.http_pool import client_pool
+
+BAIDU_HTML = """<html><body>
+<div class="c-single-text-ellipsis">春晚节目单曝光</div>
+<div class="c-single-text-ellipsis">今天天气不错</div>
+</body></html>"""
+
+
+def run_with(handler, coro_fn):
+    client_pool.set_transport_factory(lambda platform: httpx.MockTransport(handler))
+
+    async def run():
+        try:
+            return await coro_fn()
+        finally:
+            await client_pool.close()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        client_pool.set_transport_factory(None)
+
+
+class TestConditionalFetch:
+    def test_unchanged_fingerprint_short_circuits(self):
+        scraper = BaiduScraper()
+        handler = lambda req: httpx.Response(200, text=BAIDU_HTML)  # noqa: E731
+
+        async def cycles():
+            first = await scraper.fetch()
+            with pytest.raises(PayloadUnchanged):
+                await scraper.fetch()
+            return first
+
+        topics = run_with(handler, cycles)
+        assert [t.title for t in topics] == ["春晚节目单曝光", "今天天气不错"]
+        assert topics[0].is_cny_related
+
+    def test_etag_not_modified(self):
+        scraper = BaiduScraper()
+        seen_headers = []
+
+        def handler(req: httpx.Request) -> httpx.Response:
+            seen_headers.append(req.headers.get("If-None-Match"))
+            if req.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=BAIDU_HTML, headers={"ETag": '"v1"'})
+
+        async def cycles():
+            await scraper.fetch()
+            with pytest.raises(PayloadUnchanged):
+                await scraper.fetch()
+
+        run_with(handler, cycles)
+        assert seen_headers == [None, '"v1"']
+
+    def test_changed_payload_is_parsed(self):
+        scraper = BaiduScraper()
+        pages = iter([BAIDU_HTML, BAIDU_HTML.replace("今天天气不错", "新话题上榜")])
+        handler = lambda req: httpx.Response(200, text=next(pages))  # noqa: E731
+
+        async def cycles():
+            await scraper.fetch()
+            return await scraper.fetch()
+
+        topics = run_with(handler, cycles)
+        assert topics[1].title == "新话题上榜"
+
+    def test_forget_payloads_forces_full_fetch(self):
+        scraper = BaiduScraper()
+        handler = lambda req: httpx.Response(200, text=BAIDU_HTML)  # noqa: E731
+
+        async def cycles():
+            await scraper.fetch()
+            scraper.forget_payloads()
+            return await scraper.fetch()
+
+        assert len(run_with(handler, cycles)) == 2
@@ -1,6 +1,8 @@
 """测试去重工具"""
 
-from app.dedup import make_dedup_key, title_similarity
+import datetime
+
+from app.dedup import NearDuplicateIndex, jaccard, make_dedup_key, minhash, shingles, title_similarity
 
 
 class TestDedup:
@@ -29,3 +31,46 @@ class TestDedup:
     def test_similarity_unrelated(self):
         sim = title_similarity("人工智能芯片", "春晚节目单曝光")
         assert sim < 0.3
+
+
+NOW = datetime.datetime(2026, 2, 16, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+class TestMinHash:
+    def test_shingles_ignore_punctuation_and_case(self):
+        assert shingles("AI 大模型！") == shingles("ai大模型")
+        assert shingles("春") == frozenset({"春"})
+
+    def test_signature_agreement_estimates_jaccard(self):
+        a, b = shingles("春晚节目单正式曝光引发热议"), shingles("春晚节目单正式曝光")
+        sig_a, sig_b = minhash(a), minhash(b)
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+        assert abs(estimate - jaccard(a, b)) < 0.2
+        assert minhash(a) == sig_a  # 确定性：跨进程一致
+
+
+class TestNearDuplicateIndex:
+    def test_variant_attaches_to_canonical(self):
+        index = NearDuplicateIndex(0.7, datetime.timedelta(hours=6))
+        index.add("weibo", "k1", "王一博工作室回应", NOW)
+        index.add("weibo", "k2", "春晚节目单曝光", NOW)
+        assert index.find("weibo", "王一博工作室回应了") == "k1"
+        assert index.find("weibo", "春晚节目单公布") is None
+        # 只在同一平台内归并
+        assert index.find("zhihu", "王一博工作室回应了") is None
+
+    def test_prune_drops_topics_outside_window(self):
+        index = NearDuplicateIndex(0.7, datetime.timedelta(hours=6))
+        # 库中读出的时间不带时区
+        index.add("weibo", "old", "王一博工作室回应", datetime.datetime(2026, 2, 16, 5, 0))
+        index.add("weibo", "new", "春晚节目单曝光", NOW)
+        index.prune(NOW)
+        assert index.find("weibo", "王一博工作室回应了") is None
+        assert index.stats()["indexed"] == {"weibo": 1}
+
+    def test_lookup_compares_only_bucket_candidates(self):
+        index = NearDuplicateIndex(0.7, datetime.timedelta(hours=6))
+        for i in range(2000):
+            index.add("weibo", f"k{i}", f"第{i}号话题标题{i * 7919}", NOW)
+        assert index.find("weibo", "春晚节目单曝光") is None
+        assert index.stats()["avg_candidates"] < 50
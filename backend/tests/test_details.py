@@ -0,0 +1,190 @@
+"""测试话题详情二级抓取"""
+
+import asyncio
+import datetime
+import time
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.config import _runtime_overrides, settings, update_runtime_config
+from app.database import async_session, init_db
+from app.dedup import make_dedup_key
+from app.models import HotTopic, TopicDetail
+from app.schemas import HotTopicOut, TopicDetailData
+from app.scrapers.baidu import BaiduScraper
+from app.scrapers.details import DetailCrawler, enriched_topics, extract_counts, parse_count
+from app.scrapers.http_pool import client_pool
+from app.scrapers.ratelimit import HostLimiter
+
+NOW = datetime.datetime(2026, 2, 16, 20, 0, tzinfo=datetime.timezone.utc)
+
+
+def topic(title: str, rank: int, hot_value: int | None = None, id: int = 0) -> HotTopicOut:
+    return HotTopicOut(
+        id=id, platform="zhihu", title=title, rank=rank, hot_value=hot_value,
+        url=f"https://www.zhihu.com/question/{rank}", fetched_at=NOW,
+        dedup_key=make_dedup_key("zhihu", title),
+    )
+
+
+class FakeScraper:
+    platform = "zhihu"
+
+    def __init__(self, delay: float = 0.0, hot_value: int | None = None):
+        self.delay = delay
+        self.hot_value = hot_value
+        self.seen: list[str] = []
+
+    async def fetch_detail(self, t: HotTopicOut) -> TopicDetailData | None:
+        self.seen.append(t.title)
+        await asyncio.sleep(self.delay)
+        if self.hot_value is None:
+            return None
+        return TopicDetailData(hot_value=self.hot_value, summary=f"{t.title}摘要")
+
+
+@pytest.fixture(autouse=True)
+def detail_config(monkeypatch):
+    monkeypatch.setattr(settings, "DETAIL_CONCURRENCY", 1)
+    _runtime_overrides.clear()
+    update_runtime_config({"detail_enabled": True, "detail_top_n": 3})
+    yield
+    _runtime_overrides.clear()
+
+
+def run_batches(crawler: DetailCrawler, *submissions):
+    async def main():
+        batches = [crawler.submit(*args) for args in submissions]
+        await crawler.join()
+        await crawler.stop()
+        return batches
+
+    return asyncio.run(main())
+
+
+class TestCountExtraction:
+    def test_parse_count_units(self):
+        assert parse_count("2.1", "亿") == 210_000_000
+        assert parse_count("12,345") == 12345
+        assert parse_count("3.5", "万") == 35000
+
+    def test_extract_counts_from_page_text(self):
+        text = "春晚节目单 热度 356万 · 1.2亿次浏览 · 2,031 个回答"
+        assert extract_counts(text) == {"hot_value": 3_560_000, "read_count": 120_000_000, "answer_count": 2031}
+        assert extract_counts("没有任何数字") == {}
+
+
+class TestDetailCrawler:
+    def test_disabled_is_noop(self):
+        update_runtime_config({"detail_enabled": False})
+        crawler = DetailCrawler()
+        assert crawler.submit(FakeScraper(), [topic("春晚", 1)], []) is None
+        assert crawler.stats()["workers"] == 0
+
+    def test_top_n_by_priority(self):
+        scraper = FakeScraper()
+        previous = [topic("年夜饭", 2), topic("春运", 5), topic("烟花", 1)]
+        current = [topic("烟花", 1), topic("年夜饭", 2), topic("春运", 3), topic("春晚", 4), topic("红包", 9)]
+        update_runtime_config({"detail_top_n": 4})
+        run_batches(DetailCrawler(), (scraper, current, previous))
+        # 新上榜 > 排名上升 > 其他，同级按排名；第 5 名超出 Top N 不抓
+        assert scraper.seen == ["春晚", "春运", "烟花", "年夜饭"]
+
+    def test_recent_details_are_reused(self):
+        scraper = FakeScraper(hot_value=100)
+        crawler = DetailCrawler()
+        crawler._finish = lambda batch: asyncio.sleep(0)  # 不落库
+        topics = [topic("春晚", 1), topic("红包", 2)]
+        (first,) = run_batches(crawler, (scraper, topics, []))
+        (second,) = run_batches(crawler, (scraper, topics, topics))
+        assert scraper.seen == ["春晚", "红包"]
+        assert set(second.results) == set(first.results)
+        assert second.pending == 0 and not second.fresh
+        assert crawler.stats()["reused"] == 2
+
+    def test_budget_expires_remaining_jobs(self, monkeypatch):
+        monkeypatch.setattr(settings, "DETAIL_BUDGET_SECONDS", 0.1)
+        scraper = FakeScraper(delay=0.3, hot_value=1)
+        crawler = DetailCrawler()
+        crawler._finish = lambda batch: asyncio.sleep(0)
+        start = time.perf_counter()
+        (batch,) = run_batches(crawler, (scraper, [topic("春晚", 1), topic("红包", 2)], []))
+        assert time.perf_counter() - start < 0.3
+        assert batch.results == {}
+        assert crawler.stats()["expired"] == 2
+        assert scraper.seen == ["春晚"]  # 第二个任务出队时预算已耗尽，不再发起请求
+
+    def test_enrichment_backfills_and_calls_back(self):
+        scraper = FakeScraper(hot_value=3_000_000_000)
+        crawler = DetailCrawler()
+        done: list = []
+
+        async def on_done(batch):
+            done.append(enriched_topics(batch))
+
+        crawler.on_batch_done = on_done
+        title = f"详情回填测试{time.time_ns()}"
+
+        async def main():
+            await init_db()
+            async with async_session() as session:
+                row = HotTopic(platform="zhihu", title=title, rank=1, fetched_at=NOW,
+                               dedup_key=make_dedup_key("zhihu", title))
+                session.add(row)
+                await session.commit()
+                current = [topic(title, 1, id=row.id)]
+            batch = crawler.submit(scraper, current, [])
+            await crawler.join()
+            await crawler.stop()
+            async with async_session() as session:
+                saved = await session.get(HotTopic, row.id)
+                detail = (await session.execute(
+                    select(TopicDetail).where(TopicDetail.dedup_key == row.dedup_key))).scalar_one()
+                return batch, saved.hot_value, detail
+
+        batch, hot_value, detail = asyncio.run(main())
+        assert batch.defer_spikes
+        assert hot_value == 2**31 - 1  # 超出 hot_topics 整数范围时截断
+        assert detail.hot_value == 3_000_000_000
+        assert detail.summary == f"{title}摘要"
+        assert done[0][0].hot_value == 2**31 - 1
+
+
+class TestFetchDetail:
+    def test_generic_page_extraction(self):
+        page = ('<html><head><meta name="description" content="春晚节目单正式公布"></head>'
+                '<body><span>阅读 12.5万</span><span>讨论 3,210</span></body></html>')
+        client_pool.set_transport_factory(lambda platform: httpx.MockTransport(lambda req: httpx.Response(200, text=page)))
+        scraper = BaiduScraper()
+
+        async def main():
+            try:
+                return await scraper.fetch_detail(topic("春晚节目单", 1))
+            finally:
+                await client_pool.close()
+                client_pool.set_transport_factory(None)
+
+        data = asyncio.run(main())
+        assert data.summary == "春晚节目单正式公布"
+        assert data.read_count == 125_000
+        assert data.answer_count == 3210
+        assert data.hot_value is None
+
+    def test_background_requests_leave_tokens_for_list_fetches(self):
+        update_runtime_config({"host_rate_per_second": 10, "host_burst": 2, "host_max_concurrency": 5})
+        limiter = HostLimiter("www.zhihu.com")
+
+        async def main():
+            await limiter.acquire()  # 列表请求消耗一个令牌，桶内剩 1
+            start = time.perf_counter()
+            await limiter.acquire(reserve=1)  # 详情请求须等到桶内余 2 个才取
+            background_wait = time.perf_counter() - start
+            start = time.perf_counter()
+            await limiter.acquire()  # 预留的令牌留给列表请求，立即放行
+            return background_wait, time.perf_counter() - start
+
+        background_wait, foreground_wait = asyncio.run(main())
+        assert background_wait >= 0.08
+        assert foreground_wait < 0.02
@@ -0,0 +1,157 @@
+"""测试跨平台、跨周期事件追踪"""
+
+import asyncio
+import datetime
+import itertools
+
+import pytest
+from sqlalchemy import delete
+
+from app.api.routes import get_event, get_events
+from app.database import async_session, init_db
+from app.events import EventTracker
+from app.models import Event, EventMember
+from app.schemas import HotTopicOut
+
+NOW = datetime.datetime(2026, 2, 16, 12, 0, tzinfo=datetime.timezone.utc)
+_ids = itertools.count(1)
+
+
+def topic(title: str, platform: str, rank: int = 1) -> HotTopicOut:
+    return HotTopicOut(id=next(_ids), platform=platform, title=title, rank=rank, fetched_at=NOW)
+
+
+def new_tracker() -> EventTracker:
+    return EventTracker(0.5, datetime.timedelta(hours=24), max_active=100)
+
+
+def event_of(tracker: EventTracker, word: str) -> int:
+    (event_id,) = [i for i, e in tracker._events.items() if word in e.centroid]
+    return event_id
+
+
+@pytest.fixture(autouse=True)
+def empty_event_tables():
+    """事件会从库中恢复，每个用例从空表开始"""
+    async def clear():
+        await init_db()
+        async with async_session() as session:
+            await session.execute(delete(EventMember))
+            await session.execute(delete(Event))
+            await session.commit()
+
+    asyncio.run(clear())
+
+
+def run(coro_factory):
+    async def wrapper():
+        await init_db()
+        async with async_session() as session:
+            return await coro_factory(session)
+
+    return asyncio.run(wrapper())
+
+
+class TestEventTracker:
+    def test_story_followed_across_platforms_and_cycles(self):
+        tracker = new_tracker()
+
+        async def scenario(session):
+            first = await tracker.ingest(session, [topic("春晚节目单曝光", "weibo", 3)], NOW)
+            second = await tracker.ingest(session, [
+                topic("2025春晚节目单", "zhihu", 1),
+                topic("高铁抢票攻略", "douyin", 2),
+            ], NOW + datetime.timedelta(hours=2))
+            event_id = event_of(tracker, "节目单")
+            return first, second, await get_event(event_id, db=session)
+
+        first, second, event = run(scenario)
+        assert first == {"opened": 1, "assigned": 0, "closed": 0}
+        assert second == {"opened": 1, "assigned": 1, "closed": 0}
+        assert event["platforms"] == ["weibo", "zhihu"] and event["platform_count"] == 2
+        assert event["title"] == "2025春晚节目单"  # 排名最好的成员
+        assert event["peak_rank"] == 1 and event["topic_count"] == 2
+        assert [m.platform for m in event["timeline"]] == ["weibo", "zhihu"]
+        assert event["timeline"][1].similarity >= 0.5
+
+    def test_idle_events_are_closed(self):
+        tracker = new_tracker()
+
+        async def scenario(session):
+            await tracker.ingest(session, [topic("元宵灯会开幕", "baidu")], NOW)
+            event_id = event_of(tracker, "元宵灯会")
+            later = await tracker.ingest(session, [topic("元宵灯会开幕", "baidu")], NOW + datetime.timedelta(hours=30))
+            return later, await session.get(Event, event_id, populate_existing=True)
+
+        later, closed = run(scenario)
+        assert later == {"opened": 1, "assigned": 0, "closed": 1}
+        assert closed.status == "closed"
+
+    def test_active_events_restored_from_database(self):
+        tracker = new_tracker()
+
+        async def scenario(session):
+            await tracker.ingest(session, [topic("冰雪大世界开园", "weibo")], NOW)
+            tracker.reset()
+            return await tracker.ingest(
+                session, [topic("冰雪大世界开园首日", "xiaohongshu")], NOW + datetime.timedelta(hours=1))
+
+        assert run(scenario) == {"opened": 0, "assigned": 1, "closed": 0}
+
+    def test_active_event_cap(self):
+        tracker = EventTracker(0.5, datetime.timedelta(hours=24), max_active=2)
+
+        async def scenario(session):
+            for i, title in enumerate(["甲乙丙丁话题", "戊己庚辛话题", "壬癸子丑话题"]):
+                await tracker.ingest(session, [topic(title, "weibo")], NOW + datetime.timedelta(minutes=i))
+            return await tracker.ingest(session, [], NOW + datetime.timedelta(minutes=5))
+
+        assert run(scenario)["closed"] == 1
+        assert tracker.stats()["active"] == 2
+
+    def test_failed_ingest_resets_state_under_lock(self, monkeypatch):
+        tracker = new_tracker()
+        lock = tracker._lock
+
+        async def broken(session, arrivals, now):
+            if arrivals:
+                raise RuntimeError("write failed")
+            return 0
+
+        async def ingest(topics, at):
+            async with async_session() as session:
+                return await tracker.ingest(session, topics, at)
+
+        async def scenario(session):
+            await tracker.ingest(session, [topic("冰雪大世界开园", "weibo")], NOW)
+            monkeypatch.setattr("app.events.record_arrivals", broken)
+            later = NOW + datetime.timedelta(minutes=10)
+            return await asyncio.gather(
+                ingest([topic("冰雪大世界开园首日", "zhihu")], later),
+                ingest([], later),  # 在锁上等待的入库
+                return_exceptions=True,
+            )
+
+        failed, waited = run(scenario)
+        assert isinstance(failed, RuntimeError)
+        assert waited == {"opened": 0, "assigned": 0, "closed": 0}
+        assert tracker._lock is lock
+        assert tracker.stats()["active"] == 1  # 持锁清空后由等待的入库从库中恢复
+
+
+class TestEventsApi:
+    def test_filter_cross_platform_events(self):
+        tracker = new_tracker()
+
+        async def scenario(session):
+            await tracker.ingest(session, [
+                topic("年夜饭预订火爆", "weibo"),
+                topic("年夜饭预订火爆了", "zhihu"),
+                topic("单平台独有话题", "baidu"),
+            ], NOW)
+            return await get_events(status="active", min_platforms=2, limit=200, db=session)
+
+        events = run(scenario)
+        titles = {e["title"] for e in events}
+        assert "年夜饭预订火爆" in titles
+        assert "单平台独有话题" not in titles
@@ -0,0 +1,191 @@
+"""测试突发热点快速通道"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+import app.main as main
+from app.config import _runtime_overrides, update_runtime_config
+from app.database import async_session, init_db
+from app.fastlane import FastLane, diff_top, fast_lane
+from app.models import HotTopic
+from app.schemas import HotTopicCreate
+from app.scrapers.http_pool import client_pool
+from app.scrapers.registry import scraper_registry
+from app.scrapers.weibo import WeiboScraper
+
+WEIBO_JSON = Path(__file__).parent / "fixtures" / "responses" / "weibo" / "hotSearch.json"
+
+
+def item(title: str, rank: int) -> HotTopicCreate:
+    return HotTopicCreate(platform="weibo", title=title, rank=rank)
+
+
+def weibo_payload(words: list[str]) -> dict:
+    return {"data": {"realtime": [{"word": w, "raw_hot": 1000 - i} for i, w in enumerate(words)]}}
+
+
+class ScriptedScraper:
+    platform = "weibo"
+
+    def __init__(self, *rounds):
+        self.rounds = list(rounds)
+
+    async def fetch_top(self, limit: int) -> list[HotTopicCreate]:
+        result = self.rounds.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return [item(t, i) for i, t in enumerate(result[:limit], start=1)]
+
+
+class TestDiff:
+    def test_new_entries_and_large_jumps(self):
+        previous = {"春晚": 1, "烟花": 2, "春运": 8, "年夜饭": 4}
+        current = [item("春运", 1), item("春晚", 2), item("红包", 3), item("年夜饭", 3)]
+        new, jumps = diff_top(previous, current, min_jump=5)
+        assert [t.title for t in new] == ["红包"]
+        assert jumps == [{"title": "春运", "from": 8, "to": 1}]
+
+
+class TestFastLane:
+    def test_first_poll_builds_snapshot_only(self):
+        lane = FastLane()
+        scraper = ScriptedScraper(["春晚", "烟花"], ["春晚", "烟花"], ["红包", "春晚", "烟花"])
+
+        async def run():
+            return [await lane.poll(scraper) for _ in range(3)]
+
+        first, unchanged, changed = asyncio.run(run())
+        assert first is None and unchanged is None
+        assert [t.title for t in changed.new] == ["红包"]
+        assert [t.title for t in changed.changed] == ["红包"]
+        stats = lane.snapshot()["weibo"]
+        assert stats["polls"] == 3 and stats["changes"] == 1
+
+    def test_seeded_from_full_cycle(self):
+        lane = FastLane()
+        lane.seed("weibo", [item(f"话题{i}", i) for i in range(1, 31)])
+        scraper = ScriptedScraper(["话题20", "话题1", "话题2"])
+        change = asyncio.run(lane.poll(scraper))
+        # 常规抓取已见过的条目不算新上榜，只算跃升
+        assert change.new == []
+        assert change.jumps == [{"title": "话题20", "from": 20, "to": 1}]
+
+    def test_errors_are_counted_not_raised(self):
+        lane = FastLane()
+        scraper = ScriptedScraper(httpx.ConnectError("refused"))
+        assert asyncio.run(lane.poll(scraper)) is None
+        assert lane.snapshot()["weibo"]["errors"] == 1
+        assert lane.snapshot()["weibo"]["last_error"] == "refused"
+
+
+class TestWeiboFastLane:
+    def test_fetch_top_leaves_conditional_state_alone(self):
+        body = WEIBO_JSON.read_text(encoding="utf-8")
+        client_pool.set_transport_factory(lambda platform: httpx.MockTransport(
+            lambda req: httpx.Response(200, text=body, headers={"etag": '"weibo-hot-1"'})))
+        scraper = WeiboScraper()
+
+        async def run():
+            try:
+                return await scraper.fetch_top(5)
+            finally:
+                await client_pool.close()
+                client_pool.set_transport_factory(None)
+
+        topics = asyncio.run(run())
+        assert [t.title for t in topics][:2] == ["春晚节目单正式公布", "除夕夜烟花管控新规"]
+        assert len(topics) == 4  # 前 5 条中有 1 条空标题
+        assert scraper._validators == {}  # 不影响常规抓取的条件请求
+
+
+@pytest.fixture
+def lane_env(monkeypatch):
+    events: list[dict] = []
+    payloads: list[dict] = []
+
+    async def record(data: dict):
+        events.append(data)
+
+    monkeypatch.setattr(main, "ws_broadcast", record)
+    monkeypatch.setattr(main, "get_enabled_platforms", lambda: ["weibo", "baidu"])
+    scraper = scraper_registry.get("weibo")
+    monkeypatch.setattr(scraper, "breaker", type(scraper.breaker)())
+    client_pool.set_transport_factory(lambda platform: httpx.MockTransport(
+        lambda req: httpx.Response(200, text=json.dumps(payloads[0]))))
+    _runtime_overrides.clear()
+    update_runtime_config({"fast_lane_enabled": True})
+    yield events, payloads
+    _runtime_overrides.clear()
+    client_pool.set_transport_factory(None)
+
+
+class TestRunFastLane:
+    def test_writes_and_pushes_only_on_change(self, lane_env):
+        events, payloads = lane_env
+        breaking = f"突发快讯{time.time_ns()}"
+
+        async def count(title: str) -> int:
+            async with async_session() as session:
+                return (await session.execute(
+                    select(func.count()).select_from(HotTopic).where(HotTopic.title == title))).scalar()
+
+        async def run():
+            await init_db()
+            try:
+                payloads[:] = [weibo_payload(["春晚", "烟花", "春运"])]
+                await main.run_fast_lane()  # 建立快照
+                await main.run_fast_lane()  # 无变化
+                quiet = list(events)
+                payloads[:] = [weibo_payload([breaking, "春晚", "烟花", "春运"])]
+                await main.run_fast_lane()
+                return quiet, await count(breaking)
+            finally:
+                await client_pool.close()
+
+        quiet, saved = asyncio.run(run())
+        assert quiet == []
+        assert saved == 1
+        assert [(e["type"], e["platform"], e["total"]) for e in events] == [("fast_lane", "weibo", 1)]
+        assert events[0]["new"] == [{"title": breaking, "rank": 1}]
+        # 百度没有廉价 JSON 接口，不参与快速通道
+        assert set(fast_lane.snapshot()) == {"weibo"}
+
+    def test_disabled_does_nothing(self, lane_env):
+        update_runtime_config({"fast_lane_enabled": False})
+        asyncio.run(main.run_fast_lane())
+        assert fast_lane.snapshot() == {}
+
+    def test_rank_jump_only_refreshes_lifecycle(self, lane_env):
+        import datetime
+
+        from app.dedup import make_dedup_key
+        from app.fastlane import FastLaneChange
+        from app.models import TopicLifecycle
+
+        title = f"快速通道跃升{time.time_ns()}"
+        key = make_dedup_key("weibo", title)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        earlier = now - datetime.timedelta(hours=1)
+
+        async def run():
+            await init_db()
+            async with async_session() as session:
+                session.add(TopicLifecycle(platform="weibo", title=title, dedup_key=key, first_seen=earlier,
+                                           last_seen=earlier, peak_rank=9, peak_time=earlier, appearances=3,
+                                           status="falling"))
+                await session.commit()
+            change = FastLaneChange("weibo", [item(title, 1)], [], [{"title": title, "from": 9, "to": 1}])
+            await main._ingest_fast_lane(change, now)
+            async with async_session() as session:
+                return (await session.execute(
+                    select(TopicLifecycle).where(TopicLifecycle.dedup_key == key))).scalar_one()
+
+        lifecycle = asyncio.run(run())
+        assert lifecycle.peak_rank == 1 and lifecycle.last_seen.replace(tzinfo=None) == now.replace(tzinfo=None)
+        assert (lifecycle.appearances, lifecycle.status) == (3, "falling")  # 出现次数与状态留给常规抓取
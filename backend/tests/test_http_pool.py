@@ -0,0 +1,63 @@
+"""测试爬虫 HTTP 连接池"""
+
+import asyncio
+
+import httpx
+
+from app.scrapers.http_pool import ScraperClientPool
+
+
+def make_pool(handler) -> ScraperClientPool:
+    pool = ScraperClientPool()
+    pool.set_transport_factory(lambda platform: httpx.MockTransport(handler))
+    return pool
+
+
+class TestClientPool:
+    def test_client_reused_across_cycles(self):
+        pool = make_pool(lambda req: httpx.Response(200, text="ok"))
+
+        async def run():
+            c1 = pool.get("weibo")
+            await c1.get("https://weibo.com/ajax/side/hotSearch")
+            c2 = pool.get("weibo")
+            await c2.get("https://weibo.com/ajax/side/hotSearch")
+            assert c1 is c2
+            assert pool.get("zhihu") is not c1
+            await pool.close()
+
+        asyncio.run(run())
+        stats = pool.stats()["platforms"]["weibo"]
+        assert stats["clients_opened"] == 1
+        assert stats["requests"] == 2
+        assert stats["bytes_downloaded"] == 4
+
+    def test_cookies_persist(self):
+        def handler(req: httpx.Request) -> httpx.Response:
+            if req.url.path == "/":
+                return httpx.Response(200, headers={"Set-Cookie": "SUB=abc; Path=/"})
+            return httpx.Response(200, text=req.headers.get("Cookie", ""))
+
+        pool = make_pool(handler)
+
+        async def run():
+            await pool.get("weibo").get("https://weibo.com/")
+            resp = await pool.get("weibo").get("https://weibo.com/ajax/side/hotSearch")
+            await pool.close()
+            return resp.text
+
+        assert asyncio.run(run()) == "SUB=abc"
+
+    def test_close_and_reset(self):
+        pool = make_pool(lambda req: httpx.Response(200))
+
+        async def run():
+            client = pool.get("baidu")
+            await pool.reset("baidu")
+            assert client.is_closed
+            assert pool.get("baidu") is not client
+            await pool.close()
+
+        asyncio.run(run())
+        assert pool.stats()["open_clients"] == []
+        assert pool.stats()["platforms"]["baidu"]["clients_opened"] == 2
@@ -0,0 +1,170 @@
+"""测试按平台流式入库"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import app.main as main
+from app.config import settings
+from app.database import init_db
+from app.scrapers.http_pool import client_pool
+from app.scrapers.registry import scraper_registry
+
+BAIDU_HTML = '<div class="c-single-text-ellipsis">春晚节目单曝光</div>'
+
+
+async def handler(req: httpx.Request) -> httpx.Response:
+    if req.url.host == "top.baidu.com":
+        return httpx.Response(200, text=BAIDU_HTML)
+    await asyncio.sleep(5)
+    return httpx.Response(200, text="{}")
+
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    events: list[dict] = []
+
+    async def record(data: dict):
+        events.append(data)
+
+    monkeypatch.setattr(settings, "SCRAPE_PLATFORM_DEADLINE_SECONDS", 0.2)
+    monkeypatch.setattr(main, "ws_broadcast", record)
+    for name in ("baidu", "weibo"):
+        scraper = scraper_registry.get(name)
+        monkeypatch.setattr(scraper, "breaker", type(scraper.breaker)())
+        scraper.forget_payloads()
+    client_pool.set_transport_factory(lambda platform: httpx.MockTransport(handler))
+    yield events
+    client_pool.set_transport_factory(None)
+
+
+class TestStreamedIngestion:
+    def test_fast_platform_lands_before_slow_one(self, stream_env):
+        async def cycle():
+            await init_db()
+            try:
+                await main.run_scrapers(["baidu", "weibo"])
+            finally:
+                await client_pool.close()
+
+        asyncio.run(cycle())
+        types = [(e["type"], e.get("platform")) for e in stream_env]
+        assert types == [("platform_update", "baidu"), ("scrape_complete", None)]
+        status = main._last_scrape_status
+        assert status["platforms"]["baidu"]["status"] == "ok"
+        assert status["platforms"]["weibo"]["status"] == "late"
+        assert status["late"] == ["weibo"]
+        assert status["platforms"]["baidu"]["count"] + status["platforms"]["baidu"]["deduped"] == 1
+
+    def test_cancelled_fetch_releases_probe(self, stream_env):
+        scraper = scraper_registry.get("weibo")
+
+        async def cycle():
+            try:
+                await main._fetch_with_deadline(scraper, 0.05)
+            finally:
+                await client_pool.close()
+
+        asyncio.run(cycle())
+        assert scraper.breaker.consecutive_failures == 1
+        assert "deadline" in scraper.breaker.recent_failures[-1]["error"]
+
+
+class TestNearDuplicateIngestion:
+    def test_variant_title_attaches_to_canonical_topic(self, monkeypatch):
+        import datetime
+
+        from sqlalchemy import select
+
+        from app.database import async_session
+        from app.models import HotTopic, TopicLifecycle
+        from app.schemas import HotTopicCreate
+
+        async def record(data: dict):
+            pass
+
+        monkeypatch.setattr(main, "ws_broadcast", record)
+        base = "近似去重测试某明星工作室深夜回应"
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        async def cycle():
+            await init_db()
+            first = await main._ingest_platform("douyin", [HotTopicCreate(platform="douyin", title=base, rank=3)], now)
+            second = await main._ingest_platform(
+                "douyin", [HotTopicCreate(platform="douyin", title=base + "了", rank=1)],
+                now + datetime.timedelta(minutes=10))
+            async with async_session() as session:
+                rows = (await session.execute(
+                    select(HotTopic.title).where(HotTopic.title.like("近似去重测试%")))).scalars().all()
+                lifecycles = (await session.execute(
+                    select(TopicLifecycle).where(TopicLifecycle.title.like("近似去重测试%")))).scalars().all()
+            return first, second, rows, lifecycles
+
+        first, second, rows, lifecycles = asyncio.run(cycle())
+        assert first["count"] == 1
+        assert second == {"status": "ok", "count": 0, "deduped": 1, "near_duplicates": 1}
+        assert rows == [base] and len(lifecycles) == 1
+
+
+class TestNetworkIngestion:
+    def test_new_topics_counted_in_current_bucket(self, monkeypatch):
+        import datetime
+
+        from sqlalchemy import select
+
+        from app.database import async_session
+        from app.models import TermCooccurrence
+        from app.network import bucket_of, cooccurrence_graph
+        from app.schemas import HotTopicCreate
+
+        async def record(data: dict):
+            pass
+
+        monkeypatch.setattr(main, "ws_broadcast", record)
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        async def cycle():
+            await init_db()
+            await main._ingest_platform(
+                "zhihu", [HotTopicCreate(platform="zhihu", title="网络入库测试春晚节目单彩排", rank=2)], now)
+            async with async_session() as session:
+                result = await session.execute(select(TermCooccurrence.count).where(
+                    TermCooccurrence.bucket == bucket_of(now, cooccurrence_graph.bucket_minutes),
+                    TermCooccurrence.term_a == "入库测试", TermCooccurrence.term_b == "彩排"))
+                return result.scalar()
+
+        assert asyncio.run(cycle()) == 1
+
+
+class TestUnchangedPayload:
+    def test_unchanged_list_keeps_lifecycles_alive(self, monkeypatch):
+        import datetime
+
+        from sqlalchemy import select
+
+        from app.database import async_session
+        from app.models import TopicLifecycle
+        from app.schemas import HotTopicCreate
+
+        async def record(data: dict):
+            pass
+
+        monkeypatch.setattr(main, "ws_broadcast", record)
+        title = "榜单未变化测试春晚彩排"
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        async def cycle():
+            await init_db()
+            await main._ingest_platform(
+                "baidu", [HotTopicCreate(platform="baidu", title=title, rank=1)], now - datetime.timedelta(hours=3))
+            # 之后几轮榜单都未变化，其他平台入库时触发 2 小时未出现的清理
+            await main._touch_lifecycles("baidu", now)
+            async with async_session() as session:
+                await main._update_lifecycles(session, [], now)
+                return (await session.execute(
+                    select(TopicLifecycle).where(TopicLifecycle.title == title))).scalar_one()
+
+        lifecycle = asyncio.run(cycle())
+        assert lifecycle.status != "off"
+        assert lifecycle.appearances == 1
@@ -0,0 +1,70 @@
+"""测试统一关键词匹配引擎"""
+
+import random
+
+from app.alerts import check_keyword_alerts
+from app.analyzer import _classify_topic
+from app.config import _runtime_overrides, settings, update_runtime_config
+from app.keywords import Hit, KeywordMatcher, keyword_engine
+from app.schemas import HotTopicOut
+from app.sentiment import analyze_sentiment
+
+
+class TestKeywordMatcher:
+    def test_overlapping_hits_with_positions(self):
+        matcher = KeywordMatcher(["春节", "春节快乐", "快乐", "节"])
+        assert matcher.find("祝大家春节快乐") == [
+            Hit("春节", 3, 5), Hit("节", 4, 5), Hit("春节快乐", 3, 7), Hit("快乐", 5, 7),
+        ]
+
+    def test_same_result_as_substring_checks(self):
+        rng = random.Random(7)
+        alphabet = "春节晚会年夜饭红包烟花回家AIai"
+        keywords = {"".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(3000)}
+        matcher = KeywordMatcher(keywords)
+        for _ in range(200):
+            title = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+            assert set(matcher.found(title)) == {kw for kw in keywords if kw in title}
+
+    def test_case_sensitive_like_in(self):
+        assert KeywordMatcher(["AI"]).found("ai 大模型") == []
+
+
+class TestKeywordEngine:
+    def setup_method(self):
+        _runtime_overrides.clear()
+
+    def teardown_method(self):
+        _runtime_overrides.clear()
+
+    def test_rebuilt_when_keywords_change(self):
+        assert not keyword_engine.match("冰雪大世界开园").cny
+        version = keyword_engine.version
+        keyword_engine.match("再次匹配不重建")
+        assert keyword_engine.version == version
+        update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+        assert keyword_engine.match("冰雪大世界开园").cny
+        assert keyword_engine.version == version + 1
+
+    def test_single_pass_serves_every_consumer(self):
+        match = keyword_engine.match("春晚节目单曝光 网友点赞")
+        assert match.cny
+        assert match.categories[0] == "🎬 影视娱乐"
+        assert "点赞" in match.positive and not match.negative
+        assert _classify_topic("春晚节目单曝光") == "🎬 影视娱乐"
+        assert _classify_topic("今天天气不错") == "📌 其他"
+        assert analyze_sentiment("中国队夺冠 全网点赞")[0] == "positive"
+
+    def test_thousands_of_custom_keywords(self):
+        update_runtime_config({"custom_keywords": [f"自定义词{i}" for i in range(5000)]})
+        assert keyword_engine.match("出现自定义词4321").cny
+        assert settings.CNY_KEYWORDS[0] in keyword_engine.compiled().matcher.keywords
+
+
+class TestKeywordAlerts:
+    def test_matches_keep_rule_keyword_order(self):
+        topic = HotTopicOut(id=1, platform="weibo", title="春运返程高峰 高铁加开", rank=3,
+                            fetched_at="2026-02-20T08:00:00Z")
+        matches = check_keyword_alerts([topic], ["高铁", "春运", "航班"])
+        assert [m["keyword"] for m in matches] == ["高铁", "春运"]
+        assert matches[0]["rank"] == 3
@@ -0,0 +1,134 @@
+"""测试多数据源对冲请求"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.scrapers.base import PayloadUnchanged
+from app.scrapers import multisource
+from app.scrapers.douyin import DouyinScraper
+from app.scrapers.http_pool import client_pool
+
+OFFICIAL = json.dumps({"data": {"word_list": [{"word": "官方热搜", "hot_value": 100}]}})
+TOPHUB = '<table><tr><td><a href="/l?e=1">聚合热搜</a></td></tr></table>'
+
+
+def make_handler(official_delay: float = 0.0, official_status: int = 200, calls: list | None = None):
+    async def handler(req: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(req.url.host)
+        if req.url.host == "tophub.today":
+            return httpx.Response(200, text=TOPHUB)
+        await asyncio.sleep(official_delay)
+        return httpx.Response(official_status, text=OFFICIAL)
+    return handler
+
+
+def run(scraper, handler):
+    client_pool.set_transport_factory(lambda platform: httpx.MockTransport(handler))
+
+    async def main():
+        try:
+            topics = await scraper._parse(client_pool.get(scraper.platform))
+            scraper._commit_pending()
+            return topics
+        finally:
+            await client_pool.close()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        client_pool.set_transport_factory(None)
+
+
+@pytest.fixture(autouse=True)
+def short_hedge(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_HEDGE_DELAY_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "HOST_RATE_LIMIT_ENABLED", False)  # 连续多轮请求同一主机，不受令牌桶影响
+
+
+def demote_official(scraper) -> None:
+    for _ in range(multisource.DEMOTE_STREAK):
+        scraper._source_stats["official"].record(False, 0.1)
+
+
+class TestHedgedSources:
+    def test_fast_primary_wins_without_hedging(self):
+        calls: list[str] = []
+        scraper = DouyinScraper()
+        topics = run(scraper, make_handler(calls=calls))
+        assert [t.title for t in topics] == ["官方热搜"]
+        assert calls == ["www.douyin.com"]
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        scraper = DouyinScraper()
+        start = time.perf_counter()
+        topics = run(scraper, make_handler(official_delay=5))
+        assert time.perf_counter() - start < 1
+        assert [t.title for t in topics] == ["聚合热搜"]
+        stats = scraper.source_stats()
+        assert stats["official"]["attempts"] == 0  # 被对冲取消不算失败
+        assert stats["tophub"]["success_rate"] == 1.0
+        assert scraper.source_order() == ["official", "tophub"]
+
+    def test_failed_primary_falls_back_immediately(self):
+        scraper = DouyinScraper()
+        topics = run(scraper, make_handler(official_status=503))
+        assert topics[0].title == "聚合热搜"
+
+    def test_single_failure_keeps_declared_order(self):
+        scraper = DouyinScraper()
+        run(scraper, make_handler(official_status=503))
+        assert scraper.source_order() == ["official", "tophub"]
+
+    def test_recent_primary_failure_hedges_immediately(self, monkeypatch):
+        monkeypatch.setattr(settings, "SCRAPE_HEDGE_DELAY_SECONDS", 2.0)
+        scraper = DouyinScraper()
+        run(scraper, make_handler(official_status=503))
+        scraper.forget_payloads()
+        assert scraper.source_stats()["official"]["failure_streak"] == 1
+
+        start = time.perf_counter()
+        topics = run(scraper, make_handler(official_delay=5))
+        assert time.perf_counter() - start < 1  # 不等 2 秒的延迟预算
+        assert topics[0].title == "聚合热搜"
+        assert scraper.source_order() == ["official", "tophub"]  # 仍未降级
+
+    def test_failure_streak_demotes_until_probe(self):
+        scraper = DouyinScraper()
+        demote_official(scraper)
+        assert scraper.source_stats()["official"]["demoted"] is True
+        assert scraper.source_order() == ["tophub", "official"]
+
+        calls: list[str] = []
+        run(scraper, make_handler(calls=calls))
+        assert "www.douyin.com" not in calls  # 降级期间备用源在延迟预算内返回，不再请求官方接口
+
+        probe_at = scraper._source_stats["official"].last_probe + multisource.PROBE_INTERVAL
+        assert scraper.source_order(now=probe_at) == ["official", "tophub"]
+
+    def test_probe_success_restores_primary(self, monkeypatch):
+        monkeypatch.setattr(multisource, "PROBE_INTERVAL", 0.0)
+        scraper = DouyinScraper()
+        demote_official(scraper)
+        topics = run(scraper, make_handler())
+        assert [t.title for t in topics] == ["官方热搜"]
+        assert scraper.source_stats()["official"]["demoted"] is False
+
+    def test_all_sources_fail(self):
+        async def handler(req):
+            return httpx.Response(500)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            run(DouyinScraper(), handler)
+
+    def test_only_winner_fingerprint_committed(self):
+        scraper = DouyinScraper()
+        run(scraper, make_handler(official_delay=5))
+        assert list(scraper._fingerprints) == ["https://tophub.today/n/DpQvNABoNE"]
+        with pytest.raises(PayloadUnchanged):
+            run(scraper, make_handler(official_delay=5))
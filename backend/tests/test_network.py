@@ -0,0 +1,136 @@
+"""测试关键词共现网络"""
+
+import asyncio
+import datetime
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.api.routes import get_network
+from app.database import async_session, init_db
+from app.models import TermCooccurrence
+from app.network import CooccurrenceGraph, bucket_of, count_pairs, label_propagation
+
+NOW = datetime.datetime(2026, 2, 16, 12, 30, tzinfo=datetime.timezone.utc)
+HOUR = datetime.timedelta(hours=1)
+WORDS = {
+    "春晚节目单公布": ["春晚", "节目单", "公布"],
+    "春晚节目单曝光": ["春晚", "节目单", "曝光"],
+    "春晚彩排": ["春晚", "彩排"],
+    "春运高铁抢票": ["春运", "高铁", "抢票"],
+    "春运高铁加开": ["春运", "高铁", "加开"],
+}
+
+
+def words_of(title: str) -> list[str]:
+    return WORDS[title]
+
+
+@pytest.fixture(autouse=True)
+def empty_table():
+    async def clear():
+        await init_db()
+        async with async_session() as session:
+            await session.execute(delete(TermCooccurrence))
+            await session.commit()
+
+    asyncio.run(clear())
+
+
+def new_graph() -> CooccurrenceGraph:
+    return CooccurrenceGraph(60, datetime.timedelta(days=2))
+
+
+def run(coro_factory):
+    async def wrapper():
+        async with async_session() as session:
+            return await coro_factory(session)
+
+    return asyncio.run(wrapper())
+
+
+class TestCounting:
+    def test_pairs_and_diagonal(self):
+        counts = count_pairs(["春晚节目单公布", "春晚节目单曝光"], words_of)
+        assert counts[("春晚", "节目单")] == 2
+        assert counts[("公布", "春晚")] == 1  # 词对按字典序
+        assert counts[("春晚", "春晚")] == 2
+        assert ("曝光", "公布") not in counts and ("公布", "曝光") not in counts
+
+    def test_bucket_alignment(self):
+        assert bucket_of(NOW, 60) == datetime.datetime(2026, 2, 16, 12, 0, tzinfo=datetime.timezone.utc)
+        assert bucket_of(NOW.replace(tzinfo=None), 15) == datetime.datetime(
+            2026, 2, 16, 12, 30, tzinfo=datetime.timezone.utc)
+
+    def test_label_propagation_separates_weakly_linked_groups(self):
+        edges = [("春晚", "节目单", 5), ("春晚", "彩排", 4), ("节目单", "彩排", 3),
+                 ("春运", "高铁", 6), ("高铁", "抢票", 4), ("春运", "抢票", 3),
+                 ("彩排", "春运", 1)]
+        labels = label_propagation(edges)
+        assert labels["春晚"] == labels["节目单"] == labels["彩排"]
+        assert labels["春运"] == labels["高铁"] == labels["抢票"]
+        assert labels["春晚"] != labels["春运"]
+
+
+class TestCooccurrenceGraph:
+    def test_buckets_merge_over_window(self, monkeypatch):
+        monkeypatch.setattr("app.segmenter.content_words", words_of)
+        graph = new_graph()
+
+        async def scenario(session):
+            await graph.record(session, ["春晚节目单公布", "春运高铁抢票"], NOW - HOUR)
+            await graph.record(session, ["春晚节目单曝光", "春运高铁加开"], NOW)
+            await graph.record(session, ["春晚彩排"], NOW + datetime.timedelta(minutes=10))  # 与上一轮同一个桶
+            both = await graph.window(session, NOW - 2 * HOUR, NOW + HOUR, min_count=1)
+            latest = await graph.window(session, NOW, NOW + HOUR, min_count=1)
+            rows = (await session.execute(select(func.count(TermCooccurrence.id)))).scalar()
+            return both, latest, rows
+
+        both, latest, rows = run(scenario)
+        weights = {(e["source"], e["target"]): e["weight"] for e in both["edges"]}
+        assert weights[("春晚", "节目单")] == 2 and weights[("春运", "高铁")] == 2
+        assert both["edges"][0]["weight"] == 2
+        assert {(e["source"], e["target"]): e["weight"] for e in latest["edges"]}[("春晚", "节目单")] == 1
+        assert rows < 2 * len(count_pairs(list(WORDS), words_of))  # 同一桶内的词对合并为一行
+
+        nodes = {n["term"]: n for n in both["nodes"]}
+        assert nodes["春晚"]["count"] == 3
+        assert nodes["春晚"]["community"] == nodes["节目单"]["community"] != nodes["高铁"]["community"]
+        assert len(both["communities"]) == 2
+
+    def test_top_k_and_min_count(self, monkeypatch):
+        monkeypatch.setattr("app.segmenter.content_words", words_of)
+        graph = new_graph()
+
+        async def scenario(session):
+            await graph.record(session, list(WORDS), NOW)
+            return await graph.window(session, NOW - HOUR, NOW + HOUR, limit=1, min_count=2)
+
+        data = run(scenario)
+        assert [(e["source"], e["target"], e["weight"]) for e in data["edges"]] == [("春晚", "节目单", 2)]
+
+    def test_old_buckets_pruned(self, monkeypatch):
+        monkeypatch.setattr("app.segmenter.content_words", words_of)
+        graph = new_graph()
+
+        async def scenario(session):
+            await graph.record(session, ["春晚彩排"], NOW - datetime.timedelta(days=3))
+            await graph.record(session, ["春运高铁抢票"], NOW)
+            result = await session.execute(select(TermCooccurrence.term_a).distinct())
+            return {t for (t,) in result}
+
+        assert "彩排" not in run(scenario)
+
+    def test_network_endpoint(self, monkeypatch):
+        monkeypatch.setattr("app.segmenter.content_words", words_of)
+        monkeypatch.setattr("app.api.routes.cooccurrence_graph", new_graph())
+
+        async def scenario(session):
+            from app.api import routes
+
+            await routes.cooccurrence_graph.record(session, list(WORDS), NOW)
+            return await get_network(hours=24, since=NOW - HOUR, until=NOW + HOUR, limit=10, min_count=2, db=session)
+
+        data = run(scenario)
+        assert {(e["source"], e["target"]) for e in data["edges"]} == {("春晚", "节目单"), ("春运", "高铁")}
+        assert data["since"] == bucket_of(NOW - HOUR, 60)
@@ -0,0 +1,51 @@
+"""测试 HTML 解析后端"""
+
+import pytest
+
+from app.scrapers.baidu import BOARD_TITLES
+from app.scrapers.parsing import TOPHUB_LINKS, get_extractor
+from app.scrapers.xiaohongshu import EXPLORE_HOT_ITEMS
+
+TOPHUB_HTML = """<html><head><meta charset="utf-8"></head><body>
+<table><tbody>
+<tr><td>1.</td><td class="al"><a href="/l?e=1" target="_blank">春晚 <b>节目单</b> 曝光</a></td><td>120万</td></tr>
+<tr><td>2.</td><td class="al"><a href="https://example.com/2">年夜饭怎么做</a></td><td>98万</td></tr>
+</tbody></table>
+<a href="/outside">表格外链接</a>
+</body></html>""".encode()
+
+BAIDU_HTML = """<div class="content_1YWBm">
+<div class="c-single-text-ellipsis"> 除夕烟花 </div>
+<div class="c-single-text-ellipsis-more">不应匹配</div>
+<div class="title c-single-text-ellipsis">龙年春运</div>
+</div>""".encode()
+
+XHS_HTML = """<div class="hot-item">穿搭分享</div>
+<ul class="hotlist"><li><a href="/a">年货清单</a></li></ul>
+<div class="trending-item">拜年文案</div>""".encode()
+
+
+@pytest.mark.parametrize("backend", ["lxml", "bs4"])
+class TestExtractors:
+    def test_tophub_links(self, backend):
+        nodes = get_extractor(backend).extract(TOPHUB_HTML, TOPHUB_LINKS)
+        assert [n.text for n in nodes] == ["春晚节目单曝光", "年夜饭怎么做"]
+        assert nodes[0].href == "/l?e=1"
+
+    def test_class_selector(self, backend):
+        nodes = get_extractor(backend).extract(BAIDU_HTML, BOARD_TITLES)
+        assert [n.text for n in nodes] == ["除夕烟花", "龙年春运"]
+
+    def test_union_selector_document_order(self, backend):
+        nodes = get_extractor(backend).extract(XHS_HTML, EXPLORE_HOT_ITEMS)
+        assert [n.text for n in nodes] == ["穿搭分享", "年货清单", "拜年文案"]
+
+    def test_gbk_bytes(self, backend):
+        html = '<table><tr><td><a href="/x">压岁钱</a></td></tr></table>'.encode("gbk")
+        nodes = get_extractor(backend).extract(html, TOPHUB_LINKS, encoding="gbk")
+        assert nodes[0].text == "压岁钱"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="未知 HTML 解析后端"):
+        get_extractor("regex")
@@ -0,0 +1,121 @@
+"""测试跨平台传播时差统计"""
+
+import asyncio
+import datetime
+import itertools
+import json
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.api.routes import get_propagation
+from app.database import async_session, init_db
+from app.events import EventTracker
+from app.models import Event, EventMember, EventPlatform, PropagationStat
+from app.propagation import _percentile, record_arrivals, summarize
+from app.schemas import HotTopicOut
+
+NOW = datetime.datetime(2026, 2, 16, 12, 0, tzinfo=datetime.timezone.utc)
+MINUTE = datetime.timedelta(minutes=1)
+_ids = itertools.count(1)
+
+
+@pytest.fixture(autouse=True)
+def empty_tables():
+    async def clear():
+        await init_db()
+        async with async_session() as session:
+            for model in (EventPlatform, PropagationStat, EventMember, Event):
+                await session.execute(delete(model))
+            await session.commit()
+
+    asyncio.run(clear())
+
+
+def run(coro_factory):
+    async def wrapper():
+        async with async_session() as session:
+            return await coro_factory(session)
+
+    return asyncio.run(wrapper())
+
+
+async def arrive(session, event_id: int, platform: str, at: datetime.datetime) -> int:
+    recorded = await record_arrivals(session, [(event_id, platform, 1)], at)
+    await session.commit()
+    return recorded
+
+
+async def load_stats(session) -> dict[tuple[str, str], PropagationStat]:
+    return {(s.leader, s.follower): s for s in (await session.execute(select(PropagationStat))).scalars()}
+
+
+class TestRecordArrivals:
+    def test_lags_against_every_earlier_platform(self):
+        async def scenario(session):
+            await arrive(session, 1, "weibo", NOW)
+            await arrive(session, 1, "zhihu", NOW + 30 * MINUTE)
+            recorded = await arrive(session, 1, "douyin", NOW + 180 * MINUTE)
+            again = await arrive(session, 1, "zhihu", NOW + 300 * MINUTE)  # 已出现过的平台不再计入
+            return recorded, again, await load_stats(session)
+
+        recorded, again, stats = run(scenario)
+        assert (recorded, again) == (2, 0)
+        assert {k: round(s.total_minutes) for k, s in stats.items()} == {
+            ("weibo", "zhihu"): 30, ("weibo", "douyin"): 180, ("zhihu", "douyin"): 150}
+        assert json.loads(stats[("weibo", "zhihu")].histogram)[3] == 1  # 区间左闭右开：30 分钟落在 30-60m
+
+    def test_simultaneous_arrivals_are_ties(self):
+        async def scenario(session):
+            await arrive(session, 2, "zhihu", NOW)
+            await arrive(session, 2, "baidu", NOW)
+            return await load_stats(session)
+
+        stat = run(scenario)[("baidu", "zhihu")]
+        assert (stat.ties, stat.count) == (1, 0)
+
+    def test_aggregates_accumulate_across_events(self):
+        async def scenario(session):
+            for event_id, lag in ((10, 10), (11, 20), (12, 600)):
+                await arrive(session, event_id, "weibo", NOW)
+                await arrive(session, event_id, "douyin", NOW + lag * MINUTE)
+            await arrive(session, 13, "douyin", NOW)
+            await arrive(session, 13, "weibo", NOW + 5 * MINUTE)
+            return summarize(list((await load_stats(session)).values()))
+
+        data = run(scenario)
+        (pair,) = data["pairs"]
+        assert pair["platforms"] == ["douyin", "weibo"] and pair["stories"] == 4
+        weibo_first = pair["lead_times"]["weibo"]
+        assert weibo_first["count"] == 3 and weibo_first["mean_minutes"] == 210.0
+        assert weibo_first["max_minutes"] == 600.0
+        assert pair["lead_times"]["douyin"]["count"] == 1
+        assert data["platforms"]["weibo"] == {"leads": 3, "follows": 1, "ties": 0, "lead_ratio": 0.75}
+
+
+class TestPercentile:
+    def test_interpolates_within_bins(self):
+        histogram = [0, 2, 2, 0, 0, 0, 0, 0, 0, 0, 0]  # 两个在 5-15 分钟，两个在 15-30 分钟
+        assert _percentile(histogram, 25, 0.5) == 15.0
+        assert _percentile(histogram, 25, 1.0) == 25.0
+        assert _percentile([0] * 11, 0, 0.5) is None
+
+
+class TestPropagationFromEvents:
+    def test_event_tracking_feeds_propagation(self):
+        tracker = EventTracker(0.5, datetime.timedelta(hours=24), max_active=100)
+
+        def topic(title, platform):
+            return HotTopicOut(id=next(_ids), platform=platform, title=title, rank=1, fetched_at=NOW)
+
+        async def scenario(session):
+            await tracker.ingest(session, [topic("春晚节目单曝光", "weibo")], NOW)
+            await tracker.ingest(session, [topic("2025春晚节目单", "zhihu")], NOW + 45 * MINUTE)
+            await tracker.ingest(session, [topic("春晚节目单来了", "weibo")], NOW + 60 * MINUTE)
+            return await get_propagation(platform="zhihu", db=session)
+
+        data = run(scenario)
+        (pair,) = data["pairs"]
+        assert pair["platforms"] == ["weibo", "zhihu"]
+        assert pair["lead_times"]["weibo"]["count"] == 1
+        assert pair["lead_times"]["weibo"]["mean_minutes"] == 45.0
@@ -0,0 +1,100 @@
+"""测试按主机限速"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.config import _runtime_overrides, update_runtime_config
+from app.scrapers.http_pool import ScraperClientPool
+from app.scrapers.ratelimit import HostRateLimiter, RateLimitedTransport
+
+
+@pytest.fixture(autouse=True)
+def runtime_config():
+    _runtime_overrides.clear()
+    update_runtime_config({"host_rate_per_second": 20, "host_burst": 2, "host_max_concurrency": 5})
+    yield
+    _runtime_overrides.clear()
+
+
+def run_requests(registry, urls, handler=None):
+    transport = RateLimitedTransport(httpx.MockTransport(handler or (lambda req: httpx.Response(200))), registry)
+
+    async def main():
+        async with httpx.AsyncClient(transport=transport) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(client.get(u) for u in urls))
+            return time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+class TestHostRateLimiter:
+    def test_burst_then_rate(self):
+        registry = HostRateLimiter()
+        elapsed = run_requests(registry, ["https://weibo.com/"] * 4)
+        # 突发 2 个立即放行，其余按 20/s 间隔 50ms
+        assert 0.08 <= elapsed < 0.5
+        stats = registry.stats()["hosts"]["weibo.com"]
+        assert stats["requests"] == 4
+        assert stats["waited"] == 2
+        assert stats["max_wait_ms"] >= 80
+
+    def test_hosts_are_independent(self):
+        registry = HostRateLimiter()
+        elapsed = run_requests(registry, ["https://weibo.com/", "https://weibo.com/",
+                                          "https://www.zhihu.com/", "https://www.zhihu.com/"])
+        assert elapsed < 0.05
+        assert registry.stats()["hosts"]["www.zhihu.com"]["waited"] == 0
+
+    def test_concurrency_cap(self):
+        update_runtime_config({"host_burst": 10, "host_max_concurrency": 1})
+        active = []
+        peak = []
+
+        async def handler(req):
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.pop()
+            return httpx.Response(200)
+
+        registry = HostRateLimiter()
+        run_requests(registry, ["https://weibo.com/"] * 3, handler)
+        assert max(peak) == 1
+        assert registry.stats()["hosts"]["weibo.com"]["in_flight"] == 0
+
+    def test_host_override_and_runtime_update(self):
+        update_runtime_config({"host_overrides": {"tophub.today": {"burst": 1, "rate_per_second": 10}}})
+        registry = HostRateLimiter()
+        limits = registry.for_host("tophub.today").limits()
+        assert limits == {"rate_per_second": 10, "burst": 1, "max_concurrency": 5}
+        update_runtime_config({"host_max_concurrency": 3})
+        assert registry.for_host("tophub.today").limits()["max_concurrency"] == 3
+
+    def test_disabled_passes_through(self):
+        update_runtime_config({"host_rate_limit_enabled": False, "host_burst": 1, "host_rate_per_second": 0.1})
+        registry = HostRateLimiter()
+        assert run_requests(registry, ["https://weibo.com/"] * 3) < 0.5
+        assert registry.stats()["hosts"] == {}
+
+    def test_invalid_config_rejected(self):
+        with pytest.raises(ValueError):
+            update_runtime_config({"host_rate_per_second": 0})
+
+    def test_shared_across_pooled_clients(self):
+        update_runtime_config({"host_burst": 1, "host_rate_per_second": 10, "host_overrides": {}})
+        pool = ScraperClientPool()
+        pool.set_transport_factory(lambda platform: httpx.MockTransport(lambda req: httpx.Response(200)))
+
+        async def main():
+            start = time.perf_counter()
+            # 两个平台客户端请求同一主机，共用该主机的令牌桶
+            await asyncio.gather(pool.get("zhihu").get("https://tophub.today/n/a"),
+                                 pool.get("douyin").get("https://tophub.today/n/b"))
+            await pool.close()
+            return time.perf_counter() - start
+
+        assert asyncio.run(main()) >= 0.08
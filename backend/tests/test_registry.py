@@ -0,0 +1,84 @@
+"""测试爬虫注册表与按需加载"""
+
+import json
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import httpx
+import pytest
+
+import app.scrapers.registry as registry_module
+from app.config import _runtime_overrides, update_runtime_config
+from app.schemas import HotTopicCreate
+from app.scrapers.base import BaseScraper
+from app.scrapers.registry import ENTRY_POINT_GROUP, ScraperRegistry, UnknownPlatform, scraper_registry
+
+BACKEND = Path(__file__).parent.parent
+
+
+class DemoScraper(BaseScraper):
+    platform = "demo"
+
+    async def _parse(self, client: httpx.AsyncClient) -> list[HotTopicCreate]:
+        return []
+
+
+class MislabelledScraper(DemoScraper):
+    platform = "other"
+
+
+def plugin(name: str, value: str) -> EntryPoint:
+    return EntryPoint(name=name, value=value, group=ENTRY_POINT_GROUP)
+
+
+class TestScraperRegistry:
+    def test_import_does_not_load_scrapers(self):
+        # 子进程中导入应用，确认未导入任何平台爬虫、HTML 解析库与向量化打分依赖
+        code = ("import sys, app.main; print(__import__('json').dumps(sorted(m for m in sys.modules "
+                "if m.startswith(('app.scrapers.weibo', 'app.scrapers.zhihu', 'app.scrapers.baidu', "
+                "'app.scrapers.douyin', 'app.scrapers.xiaohongshu', 'bs4', 'lxml', 'numpy', 'scipy')))))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True)
+        assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+    def test_loads_on_first_use_once(self):
+        registry = ScraperRegistry(group=None)
+        assert registry.loaded() == {}
+        baidu = registry.get("baidu")
+        assert baidu.platform == "baidu"
+        assert registry.get("baidu") is baidu
+        assert list(registry.loaded()) == ["baidu"]
+
+    def test_enabled_skips_unknown_platforms(self):
+        registry = ScraperRegistry(group=None)
+        assert [s.platform for s in registry.enabled(["weibo", "missing"])] == ["weibo"]
+        with pytest.raises(UnknownPlatform):
+            registry.get("missing")
+
+    def test_entry_point_plugins(self, monkeypatch):
+        monkeypatch.setattr(registry_module, "entry_points", lambda group: [
+            plugin("demo", "tests.test_registry:DemoScraper"),
+            plugin("weibo", "tests.test_registry:DemoScraper"),  # 与内置重名，忽略
+        ])
+        registry = ScraperRegistry()
+        assert registry.names()[-1] == "demo"
+        assert registry.is_plugin("demo") and not registry.is_plugin("weibo")
+        assert isinstance(registry.get("demo"), DemoScraper)
+        assert type(registry.get("weibo")).__name__ == "WeiboScraper"
+
+    def test_rejects_mismatched_platform(self):
+        registry = ScraperRegistry(group=None)
+        registry.register("demo", "tests.test_registry:MislabelledScraper")
+        with pytest.raises(TypeError, match="declares platform"):
+            registry.get("demo")
+        assert registry.enabled(["demo"]) == []
+
+    def test_plugin_platform_can_be_enabled(self, monkeypatch):
+        monkeypatch.setitem(scraper_registry._specs, "demo", "tests.test_registry:DemoScraper")
+        _runtime_overrides.clear()
+        try:
+            assert update_runtime_config({"enabled_platforms": ["weibo", "demo"]})["enabled_platforms"] == [
+                "weibo", "demo"]
+        finally:
+            _runtime_overrides.clear()
@@ -0,0 +1,127 @@
+"""离线回放录制的上游响应，覆盖每个爬虫及其备用数据源"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.scrapers.baidu import BaiduScraper
+from app.scrapers.base import PayloadUnchanged
+from app.scrapers.breaker import CircuitBreaker
+from app.scrapers.douyin import DouyinScraper
+from app.scrapers.http_pool import client_pool
+from app.scrapers.replay import Fault, RecordingTransport, ReplayMiss, ReplayTransport, use_replay
+from app.scrapers.weibo import WeiboScraper
+from app.scrapers.xiaohongshu import XiaohongshuScraper
+from app.scrapers.zhihu import ZhihuScraper
+
+FIXTURES = Path(__file__).parent / "fixtures" / "responses"
+
+# 平台爬虫, 强制使用的数据源, 需要屏蔽的其他源 URL 片段, 期望条数, 期望第一条标题
+CASES = [
+    (BaiduScraper, None, None, 30, "春晚节目单正式公布"),
+    (WeiboScraper, None, None, 25, "春晚节目单正式公布"),
+    (ZhihuScraper, "official", "tophub.today", 30, "春晚节目单正式公布"),
+    (ZhihuScraper, "tophub", "zhihu.com", 30, "年货节物流提速"),
+    (DouyinScraper, "official", "tophub.today", 30, "春晚节目单正式公布"),
+    (DouyinScraper, "tophub", "douyin.com", 30, "年货节物流提速"),
+    (XiaohongshuScraper, "explore", "tophub.today", 20, "春晚节目单正式公布"),
+    (XiaohongshuScraper, "tophub", "xiaohongshu.com", 30, "年货节物流提速"),
+]
+
+
+def fetch(scraper, cycles: int = 1, **replay_kwargs):
+    transports = use_replay(FIXTURES, **replay_kwargs)
+
+    async def main():
+        try:
+            results = []
+            for _ in range(cycles):
+                try:
+                    results.append(await scraper.fetch())
+                except Exception as e:
+                    results.append(e)
+            return results
+        finally:
+            await client_pool.close()
+
+    try:
+        return asyncio.run(main()), transports
+    finally:
+        client_pool.set_transport_factory(None)
+
+
+@pytest.fixture(autouse=True)
+def short_hedge(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_HEDGE_DELAY_SECONDS", 0.05)
+
+
+class TestReplayParsing:
+    @pytest.mark.parametrize("cls,source,blocked,count,first", CASES)
+    def test_every_scraper_and_source(self, cls, source, blocked, count, first):
+        faults = {blocked: Fault(status=503)} if blocked else None
+        (topics,), _ = fetch(cls(), faults=faults)
+        assert len(topics) == count
+        assert topics[0].title == first
+        ranks = [t.rank for t in topics]
+        assert ranks == sorted(set(ranks))
+        assert all(t.platform == cls.platform for t in topics)
+
+    def test_deterministic_across_runs(self):
+        (first,), _ = fetch(ZhihuScraper())
+        (second,), _ = fetch(ZhihuScraper())
+        assert [t.model_dump() for t in first] == [t.model_dump() for t in second]
+
+    def test_etag_replays_not_modified(self):
+        (topics, unchanged), transports = fetch(BaiduScraper(), cycles=2)
+        assert len(topics) == 30
+        assert isinstance(unchanged, PayloadUnchanged)
+        assert len(transports["baidu"].requests) == 2
+
+
+class TestReplayFaults:
+    def test_injected_latency_triggers_hedge(self):
+        start = time.perf_counter()
+        (topics,), transports = fetch(DouyinScraper(), faults={"douyin.com": Fault(delay=5)})
+        assert time.perf_counter() - start < 1
+        assert topics[0].url.startswith("https://www.douyin.com/search/")
+        assert transports["tophub"].requests == ["https://tophub.today/n/DpQvNABoNE"]
+
+    def test_injected_errors_open_breaker_then_recover(self):
+        scraper = BaiduScraper()
+        scraper.breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=0)
+        fault = Fault(error=httpx.ConnectTimeout, times=2)
+        results, _ = fetch(scraper, cycles=3, faults={"top.baidu.com": fault})
+        assert [type(r) for r in results[:2]] == [httpx.ConnectTimeout] * 2
+        assert len(results[2]) == 30
+
+    def test_unrecorded_request_is_a_miss(self):
+        transport = ReplayTransport(FIXTURES / "baidu")
+
+        async def main():
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get("https://top.baidu.com/board?tab=novel")
+
+        with pytest.raises(ReplayMiss):
+            asyncio.run(main())
+
+
+class TestRecording:
+    def test_recorded_responses_replay_identically(self, tmp_path):
+        upstream = httpx.MockTransport(lambda req: httpx.Response(
+            200, headers={"etag": '"v1"', "set-cookie": "a=b"}, text=f"page {req.url.params['p']}"))
+
+        async def main():
+            async with httpx.AsyncClient(transport=RecordingTransport(upstream, tmp_path)) as client:
+                live = [(await client.get("https://example.com/", params={"p": p})).text for p in "12"]
+            async with httpx.AsyncClient(transport=ReplayTransport(tmp_path)) as client:
+                replayed = [(await client.get("https://example.com/", params={"p": p})).text for p in "12"]
+                not_modified = await client.get("https://example.com/?p=1", headers={"If-None-Match": '"v1"'})
+            return live, replayed, not_modified.status_code
+
+        live, replayed, status = asyncio.run(main())
+        assert replayed == live == ["page 1", "page 2"]
+        assert status == 304
@@ -0,0 +1,174 @@
+"""测试历史数据重新打分任务"""
+
+import asyncio
+import datetime
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.config import _runtime_overrides, update_runtime_config
+from app.database import async_session, init_db
+from app.models import HotTopic, RescoreJob
+from app.rescore import RescoreManager, scoring_fingerprint
+from app.sentiment import analyze_sentiment
+
+NOW = datetime.datetime(2026, 2, 16, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def empty_tables():
+    """任务扫描整张 hot_topics，每个用例从空表开始"""
+    _runtime_overrides.clear()
+
+    async def clear():
+        await init_db()
+        async with async_session() as session:
+            await session.execute(delete(HotTopic))
+            await session.execute(delete(RescoreJob))
+            await session.commit()
+
+    asyncio.run(clear())
+    yield
+    _runtime_overrides.clear()
+
+
+def stale_row(title: str, is_cny: bool = False, sentiment: tuple[str, float] | None = None,
+              source: str = "lexicon") -> HotTopic:
+    label, score = sentiment or analyze_sentiment(title)
+    return HotTopic(platform="weibo", title=title, rank=1, fetched_at=NOW, is_cny_related=is_cny,
+                    sentiment=label, sentiment_score=score, sentiment_source=source)
+
+
+async def insert(rows: list[HotTopic]) -> list[int]:
+    async with async_session() as session:
+        session.add_all(rows)
+        await session.commit()
+        return [r.id for r in rows]
+
+
+async def values() -> dict[str, tuple]:
+    async with async_session() as session:
+        result = await session.execute(
+            select(HotTopic.title, HotTopic.is_cny_related, HotTopic.sentiment, HotTopic.sentiment_score))
+        return {title: (cny, label, score) for title, cny, label, score in result}
+
+
+def manager(workers: int = 0) -> RescoreManager:
+    return RescoreManager(chunk=2, workers=workers, pause=0)
+
+
+class TestRescore:
+    def test_only_changed_rows_are_updated(self):
+        async def scenario():
+            await insert([
+                stale_row("冰雪大世界开园"),  # 新增自定义关键词后应标为春节相关
+                stale_row("春晚节目单公布", is_cny=True),
+                stale_row("重大事故通报", sentiment=("neutral", 0.0)),  # 情感过期
+                stale_row("天气预报"),
+                stale_row("年夜饭预订火爆", is_cny=True),
+            ])
+            update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+            rescore = manager()
+            job = await rescore.start("config")
+            await rescore.wait()
+            return job, await rescore.latest(), await values()
+
+        job, done, rows = asyncio.run(scenario())
+        assert job.status == "running" and job.total == 5
+        assert done.status == "completed" and done.progress == 1.0
+        assert (done.scanned, done.changed) == (5, 2)
+        assert done.last_id == done.max_id
+        assert rows["冰雪大世界开园"][0] is True
+        assert rows["重大事故通报"][1:] == analyze_sentiment("重大事故通报")
+
+    def test_manual_labels_are_kept(self):
+        async def scenario():
+            await insert([
+                stale_row("重大事故通报", sentiment=("neutral", 0.0), source="manual"),
+                stale_row("冠军归来", sentiment=("neutral", 0.0), source="bayes"),
+            ])
+            rescore = manager()
+            await rescore.start("manual")
+            await rescore.wait()
+            async with async_session() as session:
+                result = await session.execute(select(HotTopic.title, HotTopic.sentiment, HotTopic.sentiment_source))
+                return {title: (label, source) for title, label, source in result}
+
+        rows = asyncio.run(scenario())
+        assert rows["重大事故通报"] == ("neutral", "manual")
+        assert rows["冠军归来"] == (analyze_sentiment("冠军归来")[0], "lexicon")
+
+    def test_resume_from_cursor(self):
+        async def scenario():
+            ids = await insert([stale_row("冰雪大世界一"), stale_row("冰雪大世界二"), stale_row("冰雪大世界三")])
+            update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+            async with async_session() as session:
+                # 上次运行在处理完第一行后中断
+                session.add(RescoreJob(reason="config", fingerprint=scoring_fingerprint(True), status="running",
+                                       last_id=ids[0], max_id=ids[-1], total=3, scanned=1, changed=1,
+                                       started_at=NOW, updated_at=NOW))
+                await session.commit()
+            rescore = manager()
+            await rescore.resume()
+            await rescore.wait()
+            return await rescore.latest(), await values()
+
+        done, rows = asyncio.run(scenario())
+        assert (done.reason, done.status, done.scanned, done.changed) == ("config", "completed", 3, 3)
+        assert [rows[t][0] for t in ("冰雪大世界一", "冰雪大世界二", "冰雪大世界三")] == [False, True, True]
+
+    def test_startup_restarts_when_config_differs(self):
+        async def scenario():
+            await insert([stale_row("冰雪大世界开园")])
+            async with async_session() as session:
+                session.add(RescoreJob(reason="config", fingerprint="outdated", status="completed",
+                                       started_at=NOW, updated_at=NOW, finished_at=NOW))
+                await session.commit()
+            update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+            rescore = manager()
+            await rescore.resume()
+            await rescore.wait()
+            return await rescore.latest(), await values()
+
+        done, rows = asyncio.run(scenario())
+        assert (done.reason, done.status, done.changed) == ("startup", "completed", 1)
+        assert rows["冰雪大世界开园"][0] is True
+
+    def test_resume_is_noop_when_up_to_date(self):
+        async def scenario():
+            rescore = manager()
+            await rescore.start("manual")
+            await rescore.wait()
+            await rescore.resume()
+            return rescore.running, await rescore.latest()
+
+        running, done = asyncio.run(scenario())
+        assert running is False and done.reason == "manual"
+
+    def test_new_job_supersedes_running_job(self):
+        async def scenario():
+            await insert([stale_row(f"冰雪大世界{i}") for i in range(6)])
+            rescore = RescoreManager(chunk=1, workers=0, pause=0.05)
+            first = await rescore.start("manual")
+            await asyncio.sleep(0.01)
+            update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+            second = await rescore.start("config")
+            await rescore.wait()
+            async with async_session() as session:
+                return second, await session.get(RescoreJob, first.id), await rescore.latest()
+
+        second, replaced, done = asyncio.run(scenario())
+        assert replaced.status == "superseded"
+        assert done.id == second.id and (done.status, done.changed) == ("completed", 6)
+
+    def test_process_pool_scoring(self):
+        async def scenario():
+            await insert([stale_row("冰雪大世界开园"), stale_row("重大事故通报", sentiment=("neutral", 0.0))])
+            update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+            rescore = manager(workers=1)
+            await rescore.start("config")
+            await rescore.wait()
+            return await rescore.latest()
+
+        done = asyncio.run(scenario())
+        assert (done.status, done.changed) == ("completed", 2)
@@ -0,0 +1,74 @@
+"""测试自适应抓取调度"""
+
+from app.config import _runtime_overrides, update_runtime_config
+from app.scheduling import AdaptiveScheduler, measure_churn
+
+
+def ranks(*titles: str) -> dict[str, int]:
+    return {t: i for i, t in enumerate(titles, start=1)}
+
+
+class TestChurn:
+    def test_identical_lists(self):
+        assert measure_churn(ranks("a", "b", "c"), ranks("a", "b", "c")) == 0.0
+
+    def test_new_titles_and_moves(self):
+        # d 新上榜，a/b 互换排名，c 不变
+        assert measure_churn(ranks("a", "b", "c"), ranks("b", "a", "c", "d")) == 0.75
+
+    def test_empty_current(self):
+        assert measure_churn(ranks("a"), {}) == 0.0
+
+
+class TestAdaptiveScheduler:
+    def setup_method(self):
+        _runtime_overrides.clear()
+        update_runtime_config({
+            "scrape_interval_minutes": 30,
+            "scrape_min_interval_minutes": 5,
+            "scrape_max_interval_minutes": 60,
+        })
+
+    def teardown_method(self):
+        _runtime_overrides.clear()
+
+    def test_first_observation_keeps_interval(self):
+        sched = AdaptiveScheduler()
+        assert sched.observe("weibo", ranks("a", "b")) == 30
+
+    def test_volatile_platform_speeds_up_to_min(self):
+        sched = AdaptiveScheduler()
+        sched.observe("weibo", ranks("a", "b"))
+        assert sched.observe("weibo", ranks("c", "d")) == 15
+        assert sched.observe("weibo", ranks("e", "f")) == 7.5
+        assert sched.observe("weibo", ranks("g", "h")) == 5
+
+    def test_quiet_platform_slows_down_to_max(self):
+        sched = AdaptiveScheduler()
+        sched.observe("zhihu", ranks("a", "b"))
+        assert sched.observe("zhihu", ranks("a", "b")) == 45
+        assert sched.observe("zhihu", None) == 60
+
+    def test_platforms_independent(self):
+        sched = AdaptiveScheduler()
+        for _ in range(2):
+            sched.observe("zhihu", ranks("a"))
+        sched.observe("weibo", ranks("a"))
+        sched.observe("weibo", ranks("b"))
+        assert sched.interval("zhihu") == 45
+        assert sched.interval("weibo") == 15
+
+    def test_disabled_keeps_base_interval(self):
+        update_runtime_config({"adaptive_scheduling": False})
+        sched = AdaptiveScheduler()
+        sched.observe("weibo", ranks("a"))
+        assert sched.observe("weibo", ranks("b")) == 30
+        assert sched.snapshot()["weibo"]["last_churn"] == 1.0
+
+    def test_reset(self):
+        sched = AdaptiveScheduler()
+        sched.observe("weibo", ranks("a"))
+        sched.observe("weibo", ranks("b"))
+        update_runtime_config({"scrape_interval_minutes": 20})
+        sched.reset()
+        assert sched.interval("weibo") == 20
@@ -0,0 +1,73 @@
+"""测试批量关键词打分与逐条计算一致"""
+
+import json
+import os
+import random
+
+from app.analyzer import _classify_topic
+from app.config import _runtime_overrides, update_runtime_config
+from app.features import OTHER_CATEGORY
+from app.keywords import keyword_engine
+from app.scoring import ScoringLexicon, score_titles, scoring_lexicon
+from app.sentiment import DEGREE_WORDS, NEGATION_WORDS, NEGATIVE_WORDS, POSITIVE_WORDS, analyze_sentiment
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "responses")
+
+
+def per_title(titles: list[str]) -> list[tuple]:
+    return [(_classify_topic(t), keyword_engine.match(t).cny, analyze_sentiment(t)) for t in titles]
+
+
+def batched(titles: list[str]) -> list[tuple]:
+    scores = score_titles(titles)
+    return list(zip(scores.categories, scores.cny.tolist(), scores.sentiments))
+
+
+def recorded_titles() -> list[str]:
+    with open(os.path.join(FIXTURES, "weibo", "hotSearch.json"), encoding="utf-8") as f:
+        return [item["word"] for item in json.load(f)["data"]["realtime"] if item.get("word")]
+
+
+class TestScoreTitles:
+    def setup_method(self):
+        _runtime_overrides.clear()
+
+    def teardown_method(self):
+        _runtime_overrides.clear()
+
+    def test_matches_per_title_functions_on_recorded_titles(self):
+        titles = recorded_titles()
+        assert batched(titles) == per_title(titles)
+
+    def test_matches_per_title_functions_on_dense_lexicon_titles(self):
+        # 情感词、否定词、程度副词、转折句式随机拼接，覆盖重叠命中与逐条回退
+        rng = random.Random(3)
+        pool = [*POSITIVE_WORDS, *NEGATIVE_WORDS, *NEGATION_WORDS, *DEGREE_WORDS,
+                "但是", "虽然", "，", "DeepSeek", "Deep", "春节快乐", "快乐", "的", "A", "😊"]
+        titles = ["".join(rng.choice(pool) for _ in range(rng.randint(1, 6))) for _ in range(3000)]
+        scores = score_titles(titles)
+        assert list(zip(scores.categories, scores.cny.tolist(), scores.sentiments)) == per_title(titles)
+        assert 0 < scores.fallback < len(titles)
+
+    def test_edge_cases(self):
+        titles = ["", "DeepSeek发布新模型", "DeepSee", "非常成功", "冠军冠军", "春节快乐", "完全无关的标题"]
+        assert batched(titles) == per_title(titles)
+        assert batched(["DeepSeek发布新模型"])[0][0] == "📱 科技数码"
+        assert batched(["完全无关的标题"])[0] == (OTHER_CATEGORY, False, ("neutral", 0.0))
+
+    def test_empty_batch(self):
+        scores = score_titles([])
+        assert len(scores) == 0 and scores.fallback == 0
+
+    def test_lexicon_follows_keyword_config(self):
+        before = scoring_lexicon()
+        assert batched(["冰雪大世界开园"])[0][1] is False
+        update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+        assert scoring_lexicon() is not before
+        assert batched(["冰雪大世界开园"])[0][1] is True
+
+    def test_long_terms_split_into_pieces(self):
+        lexicon = ScoringLexicon(keyword_engine.compiled(), max_gram=2)
+        titles = recorded_titles()[:20] + ["DeepSeek发布新模型", "12306崩了"]
+        scores = lexicon.score(titles)
+        assert list(zip(scores.categories, scores.cny.tolist(), scores.sentiments)) == per_title(titles)
@@ -0,0 +1,64 @@
+"""测试中文分词与分词缓存"""
+
+from app.analyzer import _find_cross_platform
+from app.config import _runtime_overrides, update_runtime_config
+from app.schemas import HotTopicOut
+from app.segmenter import Segmenter, Trie, content_words, segmenter
+
+
+def topic(title: str, platform: str) -> HotTopicOut:
+    return HotTopicOut(id=1, platform=platform, title=title, rank=1, fetched_at="2026-02-16T00:00:00Z")
+
+
+class TestTrie:
+    def test_longest_match(self):
+        trie = Trie(["春节", "春节档", "电影"])
+        assert trie.longest("春节档电影", 0) == 3
+        assert trie.longest("春节档电影", 3) == 2
+        assert trie.longest("春天", 0) == 0
+        assert "春节" in trie and "春" not in trie
+
+
+class TestSegmenter:
+    def setup_method(self):
+        _runtime_overrides.clear()
+
+    def teardown_method(self):
+        _runtime_overrides.clear()
+
+    def test_dictionary_words_instead_of_fixed_chunks(self):
+        assert segmenter.cut("春运返程高峰提前到来") == ("春运", "返程高峰", "提前", "到来")
+        assert segmenter.cut("春节档电影预售破纪录") == ("春节档", "电影", "预售", "破纪录")
+        assert segmenter.cut("AI 大模型新版本发布") == ("AI", "大模型", "新版本", "发布")
+
+    def test_unknown_characters_grouped(self):
+        # 词典外的人名等连续单字合并为一个候选词
+        assert "王一博新" in segmenter.cut("王一博新剧首播")
+        assert segmenter.cut("某明星官宣结婚")[1:] == ("明星", "官宣结婚")
+
+    def test_user_dictionary_follows_custom_keywords(self):
+        assert "冰雪大世界" not in segmenter.cut("冰雪大世界开园")
+        update_runtime_config({"custom_keywords": ["冰雪大世界"]})
+        assert segmenter.cut("冰雪大世界开园")[0] == "冰雪大世界"
+
+    def test_content_words_filter(self):
+        assert content_words("2025春晚节目单是什么") == ["春晚", "节目单"]
+
+    def test_lru_cache_bounded(self):
+        small = Segmenter(cache_size=2)
+        for title in ("春晚节目单", "年夜饭预订", "春晚节目单", "高铁抢票", "年夜饭预订"):
+            small.cut(title)
+        stats = small.stats()
+        assert stats["cached_titles"] == 2
+        assert (stats["hits"], stats["misses"]) == (1, 4)
+
+
+class TestTokenizationSites:
+    def test_cross_platform_uses_real_words(self):
+        result = _find_cross_platform([
+            topic("春晚节目单曝光", "weibo"),
+            topic("2025春晚节目单", "zhihu"),
+            topic("百度热搜不相关", "baidu"),
+        ])
+        assert result[0]["platforms"] == ["weibo", "zhihu"]
+        assert result[0]["keyword"] == "春晚、节目单"
@@ -1,6 +1,22 @@
 """测试情感分析"""
 
-from app.sentiment import analyze_sentiment
+import asyncio
+import datetime
+import threading
+
+from app.config import settings
+from app.database import async_session, init_db
+from app.keywords import keyword_engine
+from app.models import HotTopic
+from app.sentiment import (
+    NaiveBayesBackend,
+    SentimentService,
+    analyze_sentiment,
+    bayes_backend,
+    fit_naive_bayes,
+    lexicon_backend,
+    predict_naive_bayes,
+)
 
 
 class TestSentiment:
@@ -23,3 +39,168 @@ class TestSentiment:
         label, score = analyze_sentiment("虽然有争议但最终成功")
         # Both positive and negative words, but positive wins
         assert label in ("positive", "neutral")
+
+    def test_negation_and_degree(self):
+        assert analyze_sentiment("项目没有成功")[0] == "negative"
+        assert analyze_sentiment("不违法")[0] == "positive"
+        # 程度副词加重一侧的权重
+        assert analyze_sentiment("非常精彩 略有争议")[1] > analyze_sentiment("精彩 争议")[1]
+        # "最终" 不是程度副词，"太棒" 不拆开
+        assert analyze_sentiment("最终成功") == ("positive", 1.0)
+        assert analyze_sentiment("太棒了") == ("positive", 1.0)
+
+    def test_adversative_clause_dominates(self):
+        assert analyze_sentiment("夺冠但遭质疑")[0] == "negative"
+        assert analyze_sentiment("遭质疑但夺冠")[0] == "positive"
+
+    def test_async_batch_reads_keywords_on_event_loop(self, monkeypatch):
+        threads = []
+        real = keyword_engine.compiled
+
+        def compiled():
+            threads.append(threading.get_ident())
+            return real()
+
+        monkeypatch.setattr(keyword_engine, "compiled", compiled)
+        titles = ["中国队夺冠", "重大事故造成死亡"]
+        assert asyncio.run(lexicon_backend.score_batch_async(titles)) == [analyze_sentiment(t) for t in titles]
+        # 只在事件循环线程取一次自动机快照，线程池内不访问共享的 keyword_engine
+        assert set(threads) == {threading.get_ident()}
+
+
+def labelled_model():
+    documents = [("夺冠", "庆祝")] * 5 + [("事故", "伤亡")] * 5 + [("天气", "预报")] * 5
+    labels = ["positive"] * 5 + ["negative"] * 5 + ["neutral"] * 5
+    return fit_naive_bayes(documents, labels)
+
+
+class TestNaiveBayes:
+    def test_fit_and_predict(self):
+        model = labelled_model()
+        results = predict_naive_bayes(model, [("庆祝", "活动"), ("伤亡",), ("未知词",)])
+        assert results[0][0] == "positive" and results[0][1] > 0
+        assert results[1][0] == "negative" and results[1][1] < 0
+        # 全是词表外的词时只剩先验（三类均等）
+        assert results[2][1] == 0.0
+
+    def test_untrained_falls_back_to_lexicon(self):
+        backend = NaiveBayesBackend(workers=0, fallback=lexicon_backend)
+        assert backend.tag == lexicon_backend.tag
+        assert backend.score_batch(["重大事故造成死亡"]) == [analyze_sentiment("重大事故造成死亡")]
+
+    def test_process_pool_matches_inline(self):
+        backend = NaiveBayesBackend(workers=1, fallback=lexicon_backend)
+        backend.install(labelled_model())
+        titles = ["夺冠庆祝", "事故伤亡", "天气预报"]
+        try:
+            pooled = asyncio.run(backend.score_batch_async(titles))
+        finally:
+            backend.close()
+        assert pooled == backend.score_batch(titles)
+        assert backend.tag == ("bayes", 1)
+
+    def test_train_from_stored_labels(self, monkeypatch):
+        monkeypatch.setattr(settings, "SENTIMENT_MIN_TRAINING", 3)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = [("训练样本冠军庆典", "positive"), ("训练样本事故通报", "negative"), ("训练样本天气预报", "neutral")]
+
+        async def train():
+            await init_db()
+            async with async_session() as session:
+                for title, label in rows:
+                    session.add(HotTopic(platform="weibo", title=title, rank=1, fetched_at=now, sentiment=label,
+                                         sentiment_source="lexicon"))
+                await session.commit()
+                backend = NaiveBayesBackend(workers=0, fallback=lexicon_backend)
+                return backend, await backend.train(session)
+
+        backend, samples = asyncio.run(train())
+        assert samples >= 3
+        assert backend.model is not None and backend.version == 1
+
+    def test_train_skips_own_predictions(self, monkeypatch):
+        monkeypatch.setattr(settings, "SENTIMENT_MIN_TRAINING", 1)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = [("来源样本词典正面", "positive", "lexicon"), ("来源样本人工负面", "negative", "manual"),
+                ("来源样本模型预测", "positive", "bayes"), ("来源样本旧数据", "negative", None)]
+        backend = NaiveBayesBackend(workers=0, fallback=lexicon_backend)
+        seen: list[str] = []
+
+        async def documents(titles):
+            seen.extend(titles)
+            return [tuple(t) for t in titles]
+
+        monkeypatch.setattr(backend, "_documents_async", documents)
+
+        async def train():
+            await init_db()
+            async with async_session() as session:
+                for title, label, source in rows:
+                    session.add(HotTopic(platform="weibo", title=title, rank=1, fetched_at=now, sentiment=label,
+                                         sentiment_source=source))
+                await session.commit()
+                return await backend.train(session)
+
+        asyncio.run(train())
+        sampled = {t for t in seen if t.startswith("来源样本")}
+        assert sampled == {"来源样本词典正面", "来源样本人工负面"}
+
+    def test_train_uses_latest_label_per_title(self, monkeypatch):
+        monkeypatch.setattr(settings, "SENTIMENT_MIN_TRAINING", 1)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        backend = NaiveBayesBackend(workers=0, fallback=lexicon_backend)
+        fitted: dict[str, str] = {}
+
+        def fit(documents, labels):
+            fitted.update(zip(("".join(d) for d in documents), labels))
+            return labelled_model()
+
+        async def documents(titles):
+            return [tuple(t) for t in titles]
+
+        monkeypatch.setattr(backend, "_documents_async", documents)
+        monkeypatch.setattr("app.sentiment.fit_naive_bayes", fit)
+
+        async def train():
+            await init_db()
+            async with async_session() as session:
+                for hours_ago, label in ((2, "negative"), (0, "positive")):
+                    session.add(HotTopic(platform="weibo", title="标签更新样本", rank=1,
+                                         fetched_at=now - datetime.timedelta(hours=hours_ago), sentiment=label,
+                                         sentiment_source="manual"))
+                await session.commit()
+                return await backend.train(session)
+
+        asyncio.run(train())
+        assert fitted["标签更新样本"] == "positive"
+
+
+class TestSentimentService:
+    def test_batch_scoring_is_memoized(self, monkeypatch):
+        service = SentimentService(cache_size=10)
+        calls = []
+        real = lexicon_backend.score_batch
+
+        def counting(titles, compiled=None):
+            calls.append(list(titles))
+            return real(titles, compiled)
+
+        monkeypatch.setattr(lexicon_backend, "score_batch", counting)
+        items = [("k1", "中国队夺冠"), ("k2", "重大事故"), ("k1", "中国队夺冠")]
+        first = asyncio.run(service.score(items))
+        assert first == [analyze_sentiment("中国队夺冠"), analyze_sentiment("重大事故"), analyze_sentiment("中国队夺冠")]
+        assert calls == [["中国队夺冠", "重大事故"]]
+
+        second = asyncio.run(service.score([("k2", "重大事故"), ("k3", "今天天气")]))
+        assert second[0] == first[1]
+        assert calls[-1] == ["今天天气"]
+        assert service.stats()["hits"] == 1
+
+    def test_model_change_invalidates_memo(self, monkeypatch):
+        monkeypatch.setattr(settings, "SENTIMENT_BACKEND", "bayes")
+        monkeypatch.setattr(bayes_backend, "workers", 0)
+        service = SentimentService(cache_size=10)
+        assert asyncio.run(service.score([("k", "事故伤亡")])) == [analyze_sentiment("事故伤亡")]
+        monkeypatch.setattr(bayes_backend, "model", labelled_model())
+        monkeypatch.setattr(bayes_backend, "version", 99)
+        assert asyncio.run(service.score([("k", "事故伤亡")])) == predict_naive_bayes(labelled_model(), [("事故", "伤亡")])
@@ -0,0 +1,124 @@
+"""测试 Tophub 共享数据源的请求合并与缓存"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.scrapers.base import PayloadUnchanged
+from app.scrapers.douyin import DouyinScraper
+from app.scrapers.http_pool import client_pool
+from app.scrapers.tophub import TophubSource
+
+URL = "https://tophub.today/n/DpQvNABoNE"
+PAGE = '<table><tr><td><a href="/l?e=1">聚合热搜</a></td></tr></table>'
+
+
+def serve(handler, main):
+    client_pool.set_transport_factory(lambda platform: httpx.MockTransport(handler))
+
+    async def wrapped():
+        try:
+            return await main()
+        finally:
+            await client_pool.close()
+
+    try:
+        return asyncio.run(wrapped())
+    finally:
+        client_pool.set_transport_factory(None)
+
+
+class TestTophubSource:
+    def test_concurrent_requests_are_coalesced(self):
+        calls = []
+
+        async def handler(req):
+            calls.append(req.url)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text=PAGE)
+
+        source = TophubSource()
+        pages = serve(handler, lambda: asyncio.gather(*(source.get(URL) for _ in range(5))))
+        assert len(calls) == 1
+        assert len({p.digest for p in pages}) == 1
+        assert pages[0].nodes[0].text == "聚合热搜"
+        assert source.stats()["coalesced"] == 4
+
+    def test_cache_then_conditional_refresh(self, monkeypatch):
+        calls = []
+
+        def handler(req):
+            calls.append(req.headers.get("If-None-Match"))
+            if req.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"ETag": '"v1"'}, text=PAGE)
+
+        source = TophubSource()
+
+        async def main():
+            first = await source.get(URL)
+            cached = await source.get(URL)
+            monkeypatch.setattr(settings, "TOPHUB_CACHE_SECONDS", 0)
+            refreshed = await source.get(URL)
+            return first, cached, refreshed
+
+        first, cached, refreshed = serve(handler, main)
+        assert calls == [None, '"v1"']
+        assert cached is first
+        assert refreshed.digest == first.digest
+        assert source.stats()["cache_hits"] == 1
+        assert source.stats()["not_modified"] == 1
+
+    def test_cancelled_waiter_does_not_cancel_fetch(self):
+        async def handler(req):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text=PAGE)
+
+        source = TophubSource()
+
+        async def main():
+            loser = asyncio.create_task(source.get(URL))
+            winner = asyncio.create_task(source.get(URL))
+            await asyncio.sleep(0.01)
+            loser.cancel()
+            return await winner
+
+        assert serve(handler, main).nodes[0].text == "聚合热搜"
+
+    def test_errors_are_shared_and_not_cached(self):
+        statuses = iter([503, 200])
+        source = TophubSource()
+
+        async def main():
+            with pytest.raises(httpx.HTTPStatusError):
+                await source.get(URL)
+            return await source.get(URL)
+
+        page = serve(lambda req: httpx.Response(next(statuses), text=PAGE), main)
+        assert page.nodes[0].text == "聚合热搜"
+
+
+class TestScraperUsesSharedSource:
+    def test_cached_page_counts_as_unchanged(self, monkeypatch):
+        monkeypatch.setattr(settings, "SCRAPE_HEDGE_DELAY_SECONDS", 0.01)
+        calls = []
+
+        def handler(req):
+            calls.append(req.url.host)
+            if req.url.host == "tophub.today":
+                return httpx.Response(200, text=PAGE)
+            return httpx.Response(503)
+
+        scraper = DouyinScraper()
+
+        async def main():
+            topics = await scraper.fetch()
+            with pytest.raises(PayloadUnchanged):
+                await scraper.fetch()
+            return topics
+
+        topics = serve(handler, main)
+        assert topics[0].title == "聚合热搜"
+        assert calls.count("tophub.today") == 1
@@ -104,6 +104,9 @@ const AnalysisPanel: React.FC = () => {
                           {item.platforms.map(p => (
                             <Tag key={p} color="blue">{PLATFORM_LABELS[p] || p}</Tag>
                           ))}
+                          {item.topic_count > item.platform_count && (
+                            <Text type="secondary">共 {item.topic_count} 条相关话题</Text>
+                          )}
                         </span>
                       }
                     />
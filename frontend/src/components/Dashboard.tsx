@@ -34,10 +34,17 @@ const Dashboard: React.FC = () => {
   const [newDataBadge, setNewDataBadge] = useState(false);
 
   const { connected } = useWebSocket((msg) => {
-    if (msg.type === 'scrape_complete') {
+    if (msg.type === 'platform_update' && msg.total && (platform === 'all' || platform === msg.platform)) {
+      // 单个平台入库完成即刷新，不必等待整轮抓取结束
+      loadData();
+    } else if (msg.type === 'fast_lane' && (platform === 'all' || platform === msg.platform)) {
+      // 快速通道：榜首出现新上榜或大幅跃升
+      const first = msg.new?.[0]?.title ?? msg.jumps?.[0]?.title;
+      if (first) message.warning(`⚡ ${msg.platform} 榜首变化：${first}`);
+      if (msg.total) loadData();
+    } else if (msg.type === 'scrape_complete' && msg.total) {
       setNewDataBadge(true);
       message.info(`🔔 新数据已到达：${msg.total} 条话题`);
-      loadData();
     }
   });
 
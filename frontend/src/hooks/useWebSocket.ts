@@ -5,7 +5,10 @@ interface WsMessage {
   type: string;
   time?: string;
   total?: number;
+  platform?: string;
   platforms?: string[];
+  new?: { title: string; rank: number }[];
+  jumps?: { title: string; from: number; to: number }[];
 }
 
 export function useWebSocket(onMessage?: (msg: WsMessage) => void) {
@@ -68,6 +68,9 @@ export interface AnalysisReport {
     platforms: string[];
     titles: Record<string, string>;
     platform_count: number;
+    score: number;
+    topic_count: number;
+    members: Array<{ platform: string; title: string; rank: number }>;
   }>;
   platform_insights: PlatformInsight[];
   cny_summary: {